@@ -4,6 +4,9 @@ module.exports = function(eleventyConfig) {
   // copy into public
   eleventyConfig.addPassthroughCopy({ "spiral_hwy/fonts": "fonts" });
   eleventyConfig.addPassthroughCopy({ "spiral_hwy/css/styles.css": "styles.css" });
+  // per-date listing shards and their manifest, fetched by the page
+  eleventyConfig.addPassthroughCopy({ "spiral_hwy/listings": "listings" });
+  eleventyConfig.addPassthroughCopy({ "spiral_hwy/_data/shards.json": "listings/manifest.json" });
 
   // format date string
   // need to replace dashes with slashes for correct evaluation
@@ -16,6 +19,37 @@ module.exports = function(eleventyConfig) {
     });
   });
 
+  // movies.json is either the listings themselves or the compact form
+  // (theater and link-prefix tables, array rows); see movies_json.py
+  eleventyConfig.addFilter("expandMovies", function(data) {
+    if (!data || Array.isArray(data)) {
+      return data;
+    }
+    const pad = (n) => String(n).padStart(2, '0');
+    return data.days.map(([date, movies]) => ({
+      date: date,
+      movies: movies.map(([title, poster, rating, listings]) => ({
+        poster: poster,
+        rating: rating,
+        listings: listings.map(([theaterId, showings]) => {
+          const [theater, map, area, theaterLink] = data.theaters[theaterId];
+          return {
+            showings: showings.map(([minutes, soldOut, linkId, suffix]) => ({
+              available: soldOut ? 'SOLD OUT' : '',
+              link: linkId === undefined ? null : data.links[linkId] + suffix,
+              time: pad(Math.floor(minutes / 60)) + pad(minutes % 60),
+            })),
+            theater: theater,
+            map: map,
+            area: area,
+            theater_link: theaterLink,
+          };
+        }),
+        title: title,
+      })),
+    }));
+  });
+
   // format time
   eleventyConfig.addFilter("formatTime", function(timeString) {
     const hours = parseInt(timeString.substring(0, 2));
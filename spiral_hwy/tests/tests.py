@@ -2,24 +2,69 @@
 Unit tests to ensure that web scraper is properly configured.
 """
 
+import asyncio
+import hashlib
+import http.server
 import json
 import os
+import pickle
 import shutil
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from pathlib import Path
 
+import pytest
 import pytz
 from hydra import compose, initialize
 from omegaconf import DictConfig
+from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 
+from spiral_hwy.tools import date_tools, driver_pool
 from spiral_hwy.tools.alamo_scraper import AlamoScraper
+from spiral_hwy.tools.json_backend import dumps, loads
 from spiral_hwy.tools.landmark_scraper import LandmarkScraper
+from spiral_hwy.tools.layout_plan import compile_layout
+from spiral_hwy.tools.listing_stream import ListingStream
+from spiral_hwy.tools.movies_json import (
+    expand_movies,
+    read_movies,
+    write_movies,
+    write_shards,
+)
+from spiral_hwy.tools.page_cache import PageCache
+from spiral_hwy.tools.poster_gc import collect_posters
+from spiral_hwy.tools.poster_store import PosterQueue, PosterStore
+from spiral_hwy.tools.poster_variants import PosterVariants
+from spiral_hwy.tools.scheduling import HostLimits, TokenBucket, dispatch, host_of
+from spiral_hwy.tools.script_engine import capture_layout, layout_spec
+from spiral_hwy.tools.slug_cache import SlugCache
+from spiral_hwy.tools.sort_tools import merge_runs, sort_runs
+from spiral_hwy.tools.static_html import (
+    fetch_document,
+    fetch_document_async,
+    parse_html,
+)
+from spiral_hwy.tools.waits import (
+    dom_changed,
+    dom_quiescent,
+    mark_dom,
+    wait_until,
+)
 from spiral_hwy.tools.web_scraper import (
+    POSTER_QUEUE,
+    POSTER_STORE,
+    MovieListing,
     MovieShowing,
     WebScraper,
+    _run_tasks_async,
+    _veezi_fingerprint,
     get_driver,
     go_to_website,
+    pack_listings,
+    unpack_listings,
 )
 
 K_TMP_TEST_DIR = Path("/tmp/spiral-hwy-test")
@@ -29,8 +74,17 @@ def read_json(path: Path | str):
     """
     Get JSON contents.
     """
-    with open(path, "r", encoding="utf-8") as file:
-        return json.load(file)
+    return loads(Path(path).read_bytes())
+
+
+@pytest.fixture(autouse=True)
+def poster_store(tmp_path):
+    """
+    Point the scrapers' poster store at a fresh directory, so tests never
+    write to the shared store under .cache.
+    """
+    POSTER_STORE.set_root(tmp_path / "poster_store")
+    yield POSTER_STORE
 
 
 def test_veezi():
@@ -77,6 +131,1096 @@ def test_veezi():
     shutil.rmtree(K_TMP_TEST_DIR)
 
 
+def test_veezi_static():
+    """
+    Test scrape of Veezi format with the browser-free static HTML engine.
+    Must produce the same listings and posters as the Selenium run.
+    """
+    # destroy old assets
+    if K_TMP_TEST_DIR.exists():
+        shutil.rmtree(K_TMP_TEST_DIR)
+
+    # get config
+    with initialize(version_base=None, config_path="../configs"):
+        config = compose(config_name="main", overrides=["veezi=test"])
+
+    poster_dir = K_TMP_TEST_DIR / "posters"
+
+    # scrape websites
+    ws = WebScraper(
+        today=datetime(year=2024, month=12, day=9), year=2024, poster_dir=poster_dir
+    )
+    layout: DictConfig = config.veezi.dates_list
+    for w in config.veezi.websites:
+        document = fetch_document(str(Path(__file__).parent / w.showings))
+        ws.scrape(document, layout, w)
+
+    # save listings
+    json_path = K_TMP_TEST_DIR / "json" / "movies.json"
+    ws.save_json(json_path)
+
+    # check that JSONs are equivalent
+    ground_truth_dir = Path(__file__).parent / "ground_truth" / "veezi"
+    assert read_json(json_path) == read_json(ground_truth_dir / "movies.json")
+
+    # Check posters are save correctly
+    poster_files = sorted(os.listdir(poster_dir))
+    assert poster_files == read_json(ground_truth_dir / "posters.json")
+
+    # destroy assets
+    shutil.rmtree(K_TMP_TEST_DIR)
+
+
+def test_movies_json():
+    """
+    The compact movies.json expands back to the legacy listings, which are
+    also exported alongside it.
+    """
+    if K_TMP_TEST_DIR.exists():
+        shutil.rmtree(K_TMP_TEST_DIR)
+    with initialize(version_base=None, config_path="../configs"):
+        config = compose(config_name="main", overrides=["veezi=test"])
+    ws = WebScraper(
+        today=datetime(year=2024, month=12, day=9),
+        year=2024,
+        poster_dir=K_TMP_TEST_DIR / "posters",
+    )
+    for w in config.veezi.websites:
+        document = fetch_document(str(Path(__file__).parent / w.showings))
+        ws.scrape(document, config.veezi.dates_list, w)
+
+    json_path = K_TMP_TEST_DIR / "json" / "movies.json"
+    legacy_path = K_TMP_TEST_DIR / "public" / "movies.legacy.json"
+    ws.save_json(json_path, "compact", legacy_path)
+
+    ground_truth = read_json(
+        Path(__file__).parent / "ground_truth" / "veezi" / "movies.json"
+    )
+    compact = read_json(json_path)
+    assert expand_movies(compact) == ground_truth
+    assert read_movies(json_path) == ground_truth
+    assert read_json(legacy_path) == ground_truth
+    assert len(compact["theaters"]) == len(config.veezi.websites)
+    assert compact["links"] == ["https://ticketing.uswest.veezi.com/purchase/"]
+    assert "\n" not in json_path.read_text()
+    assert json_path.stat().st_size < legacy_path.stat().st_size / 4
+    shutil.rmtree(K_TMP_TEST_DIR)
+
+
+def test_listing_stream():
+    """
+    Results streamed in as tasks finish, in any order, sort and write out
+    as the listings saved in one piece do.
+    """
+    if K_TMP_TEST_DIR.exists():
+        shutil.rmtree(K_TMP_TEST_DIR)
+    with initialize(version_base=None, config_path="../configs"):
+        config = compose(config_name="main", overrides=["veezi=test"])
+    stream = ListingStream(queue_size=4)
+    for w in reversed(config.veezi.websites):
+        ws = WebScraper(
+            today=datetime(year=2024, month=12, day=9),
+            year=2024,
+            poster_dir=K_TMP_TEST_DIR / "posters",
+        )
+        document = fetch_document(str(Path(__file__).parent / w.showings))
+        ws.scrape(document, config.veezi.dates_list, w)
+        stream.put(ws.listings)
+    stream.close()
+
+    json_path = K_TMP_TEST_DIR / "json" / "movies.json"
+    legacy_path = K_TMP_TEST_DIR / "json" / "movies.legacy.json"
+    write_movies(stream.days(), json_path, "compact", legacy_path)
+
+    ground_truth = read_json(
+        Path(__file__).parent / "ground_truth" / "veezi" / "movies.json"
+    )
+    assert read_movies(json_path) == ground_truth
+    assert legacy_path.read_bytes() == dumps(ground_truth, indent=True)
+    write_movies([], json_path)
+    assert read_json(json_path) == []
+    shutil.rmtree(K_TMP_TEST_DIR)
+
+
+def test_json_backend():
+    """
+    orjson, when installed, writes the same bytes as the stdlib fallback.
+    """
+    pytest.importorskip("orjson")
+    listings = [
+        MovieListing(
+            [
+                MovieShowing("SOLD OUT", None, "1930"),
+                MovieShowing("", "é\u2028", "2100"),
+            ],
+            "roxie_theater",
+            "map",
+            "mission",
+            "link",
+        )
+    ]
+    data = {"days": [{"date": "2024-12-09", "listings": listings}], "empty": []}
+    for indent in (False, True):
+        fast = dumps(data, indent, backend="orjson")
+        assert fast == dumps(data, indent, backend="json")
+        assert loads(fast) == json.loads(fast)
+    assert loads(dumps(data))["days"][0]["listings"] == [
+        {
+            "showings": [
+                {"available": "SOLD OUT", "link": None, "time": "1930"},
+                {"available": "", "link": "é\u2028", "time": "2100"},
+            ],
+            "theater": "roxie_theater",
+            "map": "map",
+            "area": "mission",
+            "theater_link": "link",
+        }
+    ]
+
+
+def test_shards():
+    """
+    Each date is written as its own compact shard with a content-versioned
+    URL in the manifest; shards of dates no longer listed are removed.
+    """
+    if K_TMP_TEST_DIR.exists():
+        shutil.rmtree(K_TMP_TEST_DIR)
+    with initialize(version_base=None, config_path="../configs"):
+        config = compose(config_name="main", overrides=["veezi=test"])
+    ws = WebScraper(
+        today=datetime(year=2024, month=12, day=9),
+        year=2024,
+        poster_dir=K_TMP_TEST_DIR / "posters",
+    )
+    for w in config.veezi.websites:
+        document = fetch_document(str(Path(__file__).parent / w.showings))
+        ws.scrape(document, config.veezi.dates_list, w)
+    ws._sort_showings_by_times()
+
+    shard_dir = K_TMP_TEST_DIR / "listings"
+    manifest_path = K_TMP_TEST_DIR / "json" / "shards.json"
+    shard_dir.mkdir(parents=True)
+    (shard_dir / "2000-01-01.json").write_text("{}")
+    poster = ws.listings[-1]["movies"][0]["poster"]
+    posters = {poster: {"color": "#000000"}, "unlisted": {"color": "#ffffff"}}
+    manifest = write_shards(ws.listings, shard_dir, manifest_path, 2, posters)
+
+    ground_truth = read_json(
+        Path(__file__).parent / "ground_truth" / "veezi" / "movies.json"
+    )
+    dates = [day["date"] for day in ground_truth]
+    assert read_json(manifest_path) == manifest
+    assert manifest["inline"] == 2
+    assert manifest["dates"] == list(manifest["files"]) == dates
+    assert manifest["theaters"] == sorted(
+        {
+            listing["theater"]
+            for day in ground_truth
+            for m in day["movies"]
+            for listing in m["listings"]
+        }
+    )
+    assert sorted(p.name for p in shard_dir.iterdir()) == [f"{d}.json" for d in dates]
+    for day in ground_truth:
+        url = manifest["files"][day["date"]]
+        assert url.startswith(f"listings/{day['date']}.json?v=")
+        shard = read_json(shard_dir / f"{day['date']}.json")
+        assert expand_movies(shard) == [day]
+    last = read_json(shard_dir / f"{dates[-1]}.json")
+    assert last["posters"] == {poster: {"color": "#000000"}}
+
+    # unchanged shards keep their file and URL
+    mtime = (shard_dir / f"{dates[0]}.json").stat().st_mtime_ns
+    assert write_shards(ws.listings, shard_dir, manifest_path, 2, posters) == manifest
+    assert (shard_dir / f"{dates[0]}.json").stat().st_mtime_ns == mtime
+    shutil.rmtree(K_TMP_TEST_DIR)
+
+
+def test_static_html():
+    """
+    Test the static document model against Selenium semantics used by layouts.
+    """
+    doc = parse_html(
+        '<div id="a" class="film "><h3 class="title">Tom &amp; Jerry'
+        '<i class="icon-3d"></i></h3><ul class="session-times"><li>'
+        '<a href="/purchase/1"><time> 7:00 PM </time></a><li><a>x</a></ul></div>',
+        "https://example.com/sessions/",
+    )
+    assert doc.find_element(By.ID, "a").get_attribute("class") == "film "
+    assert len(doc.find_elements(By.CLASS_NAME, "film ")) == 1
+    title = doc.find_element(By.CSS_SELECTOR, "h3.title")
+    assert title.get_attribute("innerHTML") == 'Tom &amp; Jerry<i class="icon-3d"></i>'
+    items = doc.find_elements(By.CSS_SELECTOR, ".session-times li")
+    assert len(items) == 2  # unclosed <li> is implicitly closed
+    link = items[0].find_element(By.TAG_NAME, "a")
+    assert link.get_attribute("href") == "https://example.com/purchase/1"
+    assert items[1].find_element(By.TAG_NAME, "a").get_attribute("href") is None
+    assert items[0].find_element(By.TAG_NAME, "time").text == "7:00 PM"
+    assert doc.find_elements(By.CSS_SELECTOR, "div > ul > li > a")[1].text == "x"
+    assert doc.find_elements(By.CSS_SELECTOR, "[class*='ilm']")[0].tag_name == "div"
+    try:
+        items[0].find_element(By.CLASS_NAME, "tickets-sold-out")
+        assert False, "expected NoSuchElementException"
+    except NoSuchElementException:
+        pass
+
+
+def test_layout_plan():
+    """
+    Test that the Veezi layout compiles to plain nodes with bound actions.
+    """
+    with initialize(version_base=None, config_path="../configs"):
+        config = compose(config_name="main", overrides=["veezi=test"])
+
+    plan = compile_layout(config.veezi.dates_list, WebScraper)
+    tab, date = plan
+    assert (tab.by, tab.field, tab.multiple) == (By.ID, "byDateTab", False)
+    assert date.by == By.CLASS_NAME and date.multiple and not date.optional
+    assert [a.action for a in tab.actions] == ["click"]
+
+    date_title, film = date.actions[0].children
+    assert date_title.optional
+    get_date = date_title.actions[0]
+    assert get_date.name == "date" and get_date.field == "innerHTML"
+    assert get_date.getter is WebScraper._get_element_attribute
+    assert get_date.special.format == "%A %d, %B %Y"
+    assert [a.action for a in film.actions] == ["unpack", "create_listing"]
+
+    # bound converters run against any scraper instance
+    sessions = film.actions[0].children[-1]
+    get_time = sessions.actions[0].children[-1].actions[0]
+    assert get_time.special.method == "convert_time"
+    assert get_time.special.convert(WebScraper(), "7:30 PM", get_time.special) == "1930"
+
+
+def test_script_engine_replay():
+    """
+    Test that the layout walk captured in Chrome by WALK_LAYOUT_JS replays to
+    the Veezi ground truth.
+    """
+    with initialize(version_base=None, config_path="../configs"):
+        config = compose(config_name="main", overrides=["veezi=test"])
+
+    poster_dir = K_TMP_TEST_DIR / "posters"
+    ws = WebScraper(
+        today=datetime(year=2024, month=12, day=9), year=2024, poster_dir=poster_dir
+    )
+    layout: DictConfig = config.veezi.dates_list
+    plan = compile_layout(layout, WebScraper)
+    json.dumps(layout_spec(plan))  # the spec must be JSON-safe
+    driver = get_driver()
+    try:
+        for w in config.veezi.websites:
+            website_path = "file:///" + str(Path(__file__).parent / w.showings)
+            go_to_website(driver, website_path, layout[0])
+            ws.scrape(capture_layout(driver, plan), plan, w)
+    finally:
+        driver.quit()
+
+    json_path = K_TMP_TEST_DIR / "json" / "movies.json"
+    ws.save_json(json_path)
+    ground_truth_dir = Path(__file__).parent / "ground_truth" / "veezi"
+    assert read_json(json_path) == read_json(ground_truth_dir / "movies.json")
+    shutil.rmtree(K_TMP_TEST_DIR)
+
+
+def test_driver_pool(monkeypatch):
+    """
+    Test that pooled drivers are reused, reset between tasks and recycled
+    after `max_pages` page loads.
+    """
+
+    class FakeDriver:
+        def __init__(self, performance_log):
+            self.performance_log = performance_log
+            self.calls = []
+            self.quit_called = False
+
+        def get(self, url):
+            self.calls.append(url)
+
+        def execute_cdp_cmd(self, cmd, _args):
+            self.calls.append(cmd)
+
+        def get_log(self, log_type):
+            assert self.performance_log
+            return []
+
+        def quit(self):
+            self.quit_called = True
+
+    launched = []
+
+    def fake_get_driver(performance_log=False):
+        launched.append(FakeDriver(performance_log))
+        return launched[-1]
+
+    monkeypatch.setattr(driver_pool, "get_driver", fake_get_driver)
+    pool = driver_pool.DriverPool(size=1, max_pages=3)
+    pool.prewarm(1)
+
+    with pool.driver() as d:
+        d.get("https://a")
+        d.get("https://b")
+    assert len(launched) == 1
+    assert launched[0].calls[-2:] == ["Network.clearBrowserCookies", "about:blank"]
+
+    with pool.driver() as d:  # reused, reaches max_pages → recycled
+        d.get("https://c")
+    assert len(launched) == 1 and launched[0].quit_called
+
+    with pool.driver() as d:
+        pass
+    assert len(launched) == 2
+
+    # performance logging is only on for browsers asked for with it, and
+    # those are never lent out without it
+    with pool.driver(performance_log=True) as d:
+        assert d.driver is launched[2] and launched[2].performance_log
+    with pool.driver() as d:
+        assert d.driver is launched[1]
+    with pool.driver(performance_log=True) as d:
+        assert d.driver is launched[2]
+    assert not launched[1].performance_log
+    pool.close()
+    assert launched[1].quit_called and launched[2].quit_called
+
+
+def test_waits():
+    """
+    Test that waits return as soon as the DOM settles and give up at the
+    timeout otherwise.
+    """
+
+    class FakeDriver:
+        """Reports a mutation on each poll until `settle_after` polls."""
+
+        def __init__(self, settle_after: int):
+            self.polls = 0
+            self.settle_after = settle_after
+
+        def execute_script(self, _script, *_args):
+            self.polls += 1
+            if self.polls < self.settle_after:
+                return [self.polls, 0.0]
+            return [self.settle_after, 1000.0]
+
+    driver = FakeDriver(settle_after=3)
+    mark = mark_dom(driver)
+    assert wait_until(driver, dom_changed(mark), timeout=5)
+    assert driver.polls == 3
+
+    # no mutation after the mark → condition never holds, bounded by timeout
+    driver = FakeDriver(settle_after=1)
+    mark = mark_dom(driver)
+    assert not wait_until(driver, dom_changed(mark), timeout=0.2)
+    assert wait_until(driver, dom_quiescent(), timeout=0.2)
+
+
+def test_pack_listings():
+    """
+    Test that listings survive the builtin-only form used between processes.
+    """
+    listings = {
+        "2026-04-01": {
+            "Anora": {
+                "poster": "YW5vcmE=",
+                "rating": "R",
+                "listings": [
+                    MovieListing(
+                        [MovieShowing("SOLD OUT", None, "1930")], "t", "m", "a", "l"
+                    )
+                ],
+            }
+        }
+    }
+    packed = pack_listings(listings)
+    assert packed == {
+        "2026-04-01": {
+            "Anora": (
+                "YW5vcmE=",
+                "R",
+                [("t", "m", "a", "l", [("SOLD OUT", None, "1930")])],
+            )
+        }
+    }
+    assert unpack_listings(packed) == listings
+
+
+def test_listing_records():
+    """
+    Showings hold integer minutes and a sold-out flag, listings a theater
+    id; both serialize to the original JSON shape and pickle the theater by
+    value.
+    """
+    showing = MovieShowing(available="SOLD OUT", link="l", time="0015")
+    assert (showing.minutes, showing.sold_out) == (15, True)
+    assert showing.as_dict() == {"available": "SOLD OUT", "link": "l", "time": "0015"}
+    assert MovieShowing("", "l", "1930").minutes == 19 * 60 + 30
+    assert not hasattr(showing, "__dict__")
+
+    a = MovieListing([showing], "roxie_theater", "map", "mission", "link")
+    b = MovieListing([], "roxie_theater", "map", "mission", "link")
+    c = MovieListing([], "balboa_theater", "map", "richmond", "link")
+    assert a.theater_id == b.theater_id != c.theater_id
+    assert (a.theater, a.map, a.area, a.theater_link) == (
+        "roxie_theater",
+        "map",
+        "mission",
+        "link",
+    )
+    assert json.loads(json.dumps(a, default=lambda o: o.as_dict())) == {
+        "showings": [{"available": "SOLD OUT", "link": "l", "time": "0015"}],
+        "theater": "roxie_theater",
+        "map": "map",
+        "area": "mission",
+        "theater_link": "link",
+    }
+    pickled = pickle.dumps(a)
+    assert b"roxie_theater" in pickled
+    assert pickle.loads(pickled) == a
+
+
+def test_sort_tools():
+    """
+    The k-way merge computes each key once and keeps run order, then
+    in-run order, for equal keys; `sort_runs` splits items into runs first.
+    """
+    calls = []
+
+    def key(item):
+        calls.append(item)
+        return item[0]
+
+    runs = [[(1, "a"), (3, "b")], [(3, "c"), (2, "d"), (1, "e")], []]
+    merged = merge_runs(runs, key)
+    assert merged == [(1, "a"), (1, "e"), (2, "d"), (3, "b"), (3, "c")]
+    assert len(calls) == 5
+
+    calls.clear()
+    items = [(2, "x"), (1, "y"), (2, "y"), (1, "x")]
+    assert sort_runs(items, key, lambda item: item[1]) == [
+        (1, "x"),
+        (1, "y"),
+        (2, "x"),
+        (2, "y"),
+    ]
+    assert len(calls) == len(items)
+
+
+def test_date_tools():
+    """
+    Hand-written date and time parsers, memoized per (text, format, today).
+    """
+    today = date(2026, 4, 1)
+    heading = date_tools.parse_heading_date
+    assert heading("Wednesday 1, April", "%A %d, %B %Y", today) == "2026-04-01"
+    assert heading("Tuesday 31, March", "%A %d, %B %Y", today) == "2026-03-31"
+    assert heading("Monday 30, March", "%A %d, %B %Y", today) == "2027-03-30"
+    assert heading("Friday 9, January", "%A %d, %B %Y", today, 2027) == "2027-01-09"
+    assert heading("Apr 3", "%b %d %Y", today) == "2026-04-03"  # via strptime
+    for bad in ("Someday 1, April", "Wednesday 31, April"):
+        with pytest.raises(ValueError):
+            heading(bad, "%A %d, %B %Y", today)
+
+    assert date_tools.parse_time("7:05 PM", "%I:%M %p") == "1905"
+    assert date_tools.parse_time("12:00 AM", "%I:%M %p") == "0000"
+    assert date_tools.parse_time("19:05", "%H:%M") == "1905"
+    with pytest.raises(ValueError):
+        date_tools.parse_time("13:00 PM", "%I:%M %p")
+    assert date_tools.parse_12h_time("9pm") == "2100"
+    assert date_tools.parse_12h_time("12:30pm") == "1230"
+
+    # past dates roll over, skipping years without that day
+    assert date_tools.parse_month_day("3/30", today) == "2027-03-30"
+    assert date_tools.parse_month_day("2/29", date(2028, 3, 5)) is None
+    # a weekday and a bare day of the month, up to 90 days out
+    label = date_tools.parse_date_label
+    assert label("Mon1", today) == "2026-06-01"
+    assert label("Fri 31", date(2026, 1, 1)) is None  # next is Jul 31
+    assert label("Sat 31", date(2026, 1, 1)) == "2026-01-31"
+    assert label("Tue 31", date(2026, 1, 1)) == "2026-03-31"
+
+    assert date_tools.pacific_today(datetime(2026, 4, 1, 23)) == today
+    assert date_tools.pacific_today() is date_tools.pacific_today()
+    hits = date_tools.parse_date_label.cache_info().hits
+    label("Mon1", today)
+    assert date_tools.parse_date_label.cache_info().hits == hits + 1
+
+
+def test_scheduling(monkeypatch):
+    """
+    Per-host concurrency caps and token-bucket pacing.
+    """
+    limits = HostLimits()
+    limits.configure(
+        {
+            "default": {"concurrency": 1, "rate": 100.0, "burst": 1},
+            "limits": [{"host": "busy.example", "concurrency": 2}],
+        }
+    )
+    assert limits.get("busy.example").concurrency == 2
+    assert limits.get("other.example").concurrency == 1
+    assert host_of("https://Busy.Example/page") == "busy.example"
+    assert host_of("file:///tmp/page.html") == ""
+    # a host no task may run on would stall dispatch forever
+    with pytest.raises(ValueError, match="busy.example concurrency"):
+        limits.configure({"limits": [{"host": "busy.example", "concurrency": 0}]})
+    assert limits.get("busy.example").concurrency == 2
+
+    bucket = TokenBucket(rate=20.0, burst=2)
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    # two tokens were banked, the other two take 1/20 s each
+    assert time.monotonic() - start >= 0.09
+
+    monkeypatch.setattr("spiral_hwy.tools.scheduling.HOST_LIMITS", limits)
+    lock = threading.Lock()
+    running, peak, done = {}, {}, []
+
+    def task(host):
+        with lock:
+            running[host] = running.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), running[host])
+        time.sleep(0.02)
+        with lock:
+            running[host] -= 1
+        return host
+
+    hosts = ["busy.example"] * 4 + ["a.example"] * 3 + ["b.example"]
+    tasks = [(f"t{i}", h, task, (h,)) for i, h in enumerate(hosts)]
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        dispatch(
+            ex,
+            tasks,
+            4,
+            lambda ex, fn, args: ex.submit(fn, *args),
+            lambda name, fut: done.append((name, fut.result())),
+        )
+
+    assert sorted(done) == sorted((name, h) for name, h, _, _ in tasks)
+    assert peak == {"busy.example": 2, "a.example": 1, "b.example": 1}
+
+
+def test_alamo_pipeline(monkeypatch):
+    """
+    Alamo show pages are scraped while slugs are still being discovered and
+    merge back in discovery order.
+    """
+    slugs = ["show-a", "show-b", "show-c", "show-d"]
+    scraped = []
+
+    def get_all_sf_slugs(self, driver, on_slug=None):
+        for slug in slugs:
+            if on_slug is not None:
+                on_slug(slug)
+                # the first show page is scraped before discovery finishes
+                if slug == "show-b":
+                    assert wait_until(None, lambda _: scraped, timeout=5)
+        return list(slugs)
+
+    def scrape_show_page(self, driver, slug):
+        scraped.append(slug)
+        showing = MovieShowing(available="", link=f"{driver.name}/{slug}", time="1900")
+        listing = MovieListing(
+            showings=[showing],
+            theater="alamo_drafthouse_sf",
+            map="",
+            area="mission",
+            theater_link="",
+        )
+        self.listings["2026-03-28"] = {
+            "Shared": {"poster": slug, "rating": "R", "listings": [listing]}
+        }
+
+    monkeypatch.setattr(AlamoScraper, "_get_all_sf_slugs", get_all_sf_slugs)
+    monkeypatch.setattr(AlamoScraper, "_scrape_show_page", scrape_show_page)
+
+    class FakeDriver:
+        def __init__(self, name):
+            self.name = name
+
+        def quit(self):
+            pass
+
+    monkeypatch.setattr(
+        driver_pool, "get_driver", lambda performance_log=False: FakeDriver("pooled")
+    )
+    pool = driver_pool.DriverPool(size=0)
+    pipelined = AlamoScraper(poster_dir=K_TMP_TEST_DIR)
+    pipelined.scrape_alamo_sf(FakeDriver("main"), pool, workers=3)
+
+    assert sorted(scraped) == slugs
+    shared = pipelined.listings["2026-03-28"]["Shared"]
+    assert shared["poster"] == "show-a"
+    assert [l.showings[0].link for l in shared["listings"]] == [
+        f"pooled/{slug}" for slug in slugs
+    ]
+
+
+def test_slug_cache():
+    """
+    Alamo slugs are cached per show date with a TTL, replaced on rescan and
+    pruned once their dates have passed.
+    """
+    path = K_TMP_TEST_DIR / "alamo_slugs.json"
+    if path.exists():
+        path.unlink()
+
+    cache = SlugCache(path, ttl_hours=1)
+    assert not cache.is_fresh("2026-03-28", now=0)
+    cache.record("2026-03-28", ["a", "b"], "2026-03-28", now=0)
+    cache.record("2026-03-29", ["b", "c"], "2026-03-28", now=0)
+    cache.save()
+
+    cache = SlugCache(path, ttl_hours=1)
+    assert cache.is_fresh("2026-03-28", now=3599)
+    assert not cache.is_fresh("2026-03-28", now=3600)
+    assert cache.slugs_on("2026-03-29") == ["b", "c"]
+    assert cache.slugs["b"] == {
+        "first_seen": "2026-03-28",
+        "last_seen": "2026-03-28",
+        "dates": ["2026-03-28", "2026-03-29"],
+    }
+
+    # a rescan replaces the date's slugs
+    cache.record("2026-03-29", ["c", "d"], "2026-03-29", now=7200)
+    assert cache.slugs_on("2026-03-29") == ["c", "d"]
+    assert cache.slugs["b"]["dates"] == ["2026-03-28"]
+    assert cache.slugs["c"]["first_seen"] == "2026-03-28"
+    assert cache.slugs["c"]["last_seen"] == "2026-03-29"
+
+    cache.prune("2026-03-29")
+    assert list(cache.slugs) == ["c", "d"]
+    assert list(cache.scans) == ["2026-03-29"]
+
+
+def test_alamo_landing_dates(monkeypatch, tmp_path):
+    """
+    Landing-page date buttons are dated from innerHTML: their textContent
+    runs the hidden and visible labels together ("Wed 4/1" + "4/1" reads
+    "Wed 4/14/1"), which would skip 4/1 as an already scanned 4/14.
+    """
+
+    class FakeElement:
+        def __init__(self, text="", html=""):
+            self.text, self.html = text, html
+
+        def get_attribute(self, name):
+            return {"textContent": self.text, "innerHTML": self.html}.get(name)
+
+        def find_elements(self, by, value):
+            return []
+
+    buttons = [
+        FakeElement("WednesdayWed 4/14/1", "<div>Wed 4/1</div><div>4/1</div>"),
+        FakeElement("TuesdayTue 4/144/14", "<div>Tue 4/14</div><div>4/14</div>"),
+    ]
+    clicked = []
+
+    class FakeDriver:
+        def get(self, url):
+            pass
+
+        def find_element(self, by, value):
+            return FakeElement()
+
+        def find_elements(self, by, value):
+            return buttons
+
+        def execute_script(self, script, element):
+            clicked.append(element)
+
+    monkeypatch.setattr("spiral_hwy.tools.alamo_scraper.mark_dom", lambda d: 0)
+    monkeypatch.setattr(
+        "spiral_hwy.tools.alamo_scraper.wait_until", lambda *args, **kwargs: True
+    )
+    cache = SlugCache(tmp_path / "alamo_slugs.json", ttl_hours=1)
+    cache.record("2026-04-14", ["cached-show"], "2026-04-01")
+    scraper = AlamoScraper(
+        today=datetime(2026, 4, 1), slug_cache=cache, poster_dir=tmp_path
+    )
+    assert [AlamoScraper._button_date(b) for b in buttons] == ["4/1", "4/14"]
+    assert scraper._get_all_sf_slugs(FakeDriver()) == ["cached-show"]
+    assert clicked == [buttons[0]]
+
+
+def test_page_cache():
+    """
+    Cached listings are reused only while the page fingerprint matches,
+    the entry is within its TTL, posters exist and no refresh is forced.
+    """
+    page = (
+        Path(__file__).parent / "websites" / "roxie" / "roxie_theater_show_times.html"
+    )
+    digest = _veezi_fingerprint(fetch_document(str(page)))
+    assert digest is not None
+    assert _veezi_fingerprint(fetch_document(str(page))) == digest
+    changed = page.read_text(encoding="utf-8").replace("7:00 PM", "7:30 PM", 1)
+    assert _veezi_fingerprint(parse_html(changed, page.as_uri())) != digest
+    assert _veezi_fingerprint(parse_html("<html></html>", "")) is None
+
+    cache_dir = K_TMP_TEST_DIR / "pages"
+    poster_dir = K_TMP_TEST_DIR / "posters"
+    if K_TMP_TEST_DIR.exists():
+        shutil.rmtree(K_TMP_TEST_DIR)
+    listings = {
+        "2026-03-28": {
+            "Anora": {
+                "poster": "cGFnZSBjYWNoZQ==",
+                "rating": "R",
+                "listings": [
+                    MovieListing(
+                        [MovieShowing("", "link", "1900")], "roxie", "map", "area", "l"
+                    )
+                ],
+            }
+        }
+    }
+    cache = PageCache("roxie", ttl_hours=1, poster_dir=poster_dir, directory=cache_dir)
+    cache.store("page", digest, listings, now=0)
+    cache.save(now=0)
+
+    cache = PageCache("roxie", ttl_hours=1, poster_dir=poster_dir, directory=cache_dir)
+    # the poster is missing, so the page has to be scraped again
+    assert cache.lookup("page", digest, now=10) is None
+    poster_dir.mkdir(parents=True)
+    (poster_dir / "cGFnZSBjYWNoZQ==.png").write_bytes(b"png")
+    assert pack_listings(cache.lookup("page", digest, now=10)) == pack_listings(
+        listings
+    )
+    assert cache.lookup("page", "other", now=10) is None
+    assert cache.lookup("page", digest, now=3600) is None
+    cache.force = True
+    assert cache.lookup("page", digest, now=10) is None
+
+    # expired entries are dropped on save
+    cache.save(now=3600)
+    assert read_json(cache_dir / "roxie.json") == {}
+    shutil.rmtree(K_TMP_TEST_DIR)
+
+
+def test_poster_queue():
+    """
+    Posters download in the background into the content-addressed store,
+    each path once; `drain` waits for them, saves the manifest and reports
+    failures.
+    """
+    if K_TMP_TEST_DIR.exists():
+        shutil.rmtree(K_TMP_TEST_DIR)
+    source = K_TMP_TEST_DIR / "source.png"
+    source.parent.mkdir(parents=True)
+    source.write_bytes(b"poster")
+    store_dir = K_TMP_TEST_DIR / "store"
+    poster_dir = K_TMP_TEST_DIR / "posters"
+
+    posters = PosterQueue(PosterStore(store_dir), workers=2, size=1)
+    for _ in range(3):
+        posters.submit(poster_dir / "a.png", source.as_uri())
+    posters.submit(poster_dir / "b.png", source.as_uri())
+    missing = poster_dir / "c.png"
+    posters.submit(missing, (K_TMP_TEST_DIR / "missing.png").as_uri())
+
+    failed = posters.drain()
+    assert [path for path, _url, _e in failed] == [missing]
+    assert not missing.exists()
+    assert posters.drain() == []
+
+    # identical images are stored once; file:// sources are hard-linked
+    digest = hashlib.sha256(b"poster").hexdigest()
+    manifest = read_json(store_dir / "manifest.json")
+    assert manifest["keys"] == {"a": digest, "b": digest}
+    assert list(manifest["objects"]) == [digest]
+    assert manifest["objects"][digest]["size"] == 6
+    assert manifest["objects"][digest]["source"] == source.as_uri()
+    inode = source.stat().st_ino
+    assert (store_dir / manifest["objects"][digest]["file"]).stat().st_ino == inode
+    assert (poster_dir / "a.png").stat().st_ino == inode
+    assert (poster_dir / "b.png").read_bytes() == b"poster"
+
+    # a new run resolves known keys from the manifest
+    shutil.rmtree(poster_dir)
+    store = PosterStore(store_dir)
+    assert store.link(poster_dir / "a.png")
+    assert (poster_dir / "a.png").read_bytes() == b"poster"
+    assert not store.link(poster_dir / "unknown.png")
+
+    # a path the store already published is not placed again
+    (poster_dir / "a.png").unlink()
+    assert store.link(poster_dir / "a.png")
+    assert not (poster_dir / "a.png").exists()
+    shutil.rmtree(K_TMP_TEST_DIR)
+
+
+def test_poster_revalidation():
+    """
+    Stored posters are revalidated with conditional GETs once their TTL has
+    passed; changed posters replace the published file, and non-image or
+    tiny responses are rejected so the key is fetched again.
+    """
+    if K_TMP_TEST_DIR.exists():
+        shutil.rmtree(K_TMP_TEST_DIR)
+    served = K_TMP_TEST_DIR / "served"
+    served.mkdir(parents=True)
+    (served / "poster.png").write_bytes(b"v1" * 1024)
+    (served / "error.html").write_text("<html>Service Unavailable</html>")
+    (served / "tiny.png").write_bytes(b"v1")
+    requests_seen = []
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(served), **kwargs)
+
+        def log_request(self, code="-", size="-"):
+            requests_seen.append((self.path, int(code)))
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    store_dir = K_TMP_TEST_DIR / "store"
+    poster = K_TMP_TEST_DIR / "posters" / "a.png"
+    try:
+        posters = PosterQueue(PosterStore(store_dir, ttl_hours=1), workers=2)
+        posters.submit(poster, f"{base}/poster.png")
+        posters.submit(poster.with_name("b.png"), f"{base}/error.html")
+        posters.submit(poster.with_name("c.png"), f"{base}/tiny.png")
+        failed = sorted(path.name for path, _url, _e in posters.drain())
+        assert failed == ["b.png", "c.png"]
+        assert poster.read_bytes() == b"v1" * 1024
+        assert not poster.with_name("b.png").exists()
+        store = PosterStore(store_dir, ttl_hours=1)
+        assert store.is_fresh("a", f"{base}/poster.png")
+        assert not store.is_fresh("a", f"{base}/other.png")
+        assert not store.is_fresh("b")
+
+        # fresh posters aren't requested again
+        requests_seen.clear()
+        posters = PosterQueue(store)
+        posters.submit(poster, f"{base}/poster.png")
+        posters.drain()
+        assert requests_seen == []
+
+        # past the TTL an unchanged poster costs a 304
+        later = time.time() + 2 * 3600
+        assert not store.is_fresh("a", now=later)
+        store.checks["a"]["checked"] -= 2 * 3600
+        posters.submit(poster, f"{base}/poster.png")
+        posters.drain()
+        assert requests_seen == [("/poster.png", 304)]
+        assert store.is_fresh("a")
+
+        # a changed poster is downloaded and replaces the published file
+        (served / "poster.png").write_bytes(b"v2" * 1024)
+        os.utime(served / "poster.png", (later, later))
+        store.checks["a"]["checked"] -= 2 * 3600
+        posters.submit(poster, f"{base}/poster.png")
+        posters.drain()
+        assert requests_seen[-1] == ("/poster.png", 200)
+        assert poster.read_bytes() == b"v2" * 1024
+        assert read_json(store_dir / "manifest.json")["keys"]["a"] == (
+            hashlib.sha256(b"v2" * 1024).hexdigest()
+        )
+    finally:
+        server.shutdown()
+    shutil.rmtree(K_TMP_TEST_DIR)
+
+
+def test_async_executor(tmp_path):
+    """
+    The async executor runs coroutine tasks on one event loop and blocking
+    tasks in threads; pages and every task's posters are fetched on the
+    loop over one aiohttp session.
+    """
+    served = tmp_path / "served"
+    served.mkdir()
+    (served / "page.html").write_text('<html><body><img src="a.png"></body></html>')
+    (served / "a.png").write_bytes(b"a" * 2048)
+    (served / "b.png").write_bytes(b"b" * 2048)
+    threads = set()
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(served), **kwargs)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    poster_dir = tmp_path / "posters"
+
+    def listings(title: str) -> dict:
+        showing = MovieShowing("", "link", "1930")
+        listing = MovieListing([showing], "theater", "", "", "")
+        movie = {"poster": title, "rating": "", "listings": [listing]}
+        return {"2026-04-01": {title: movie}}
+
+    async def page_task(url: str) -> dict:
+        threads.add(threading.current_thread())
+        document = await fetch_document_async(url)
+        poster = document.find_element(By.TAG_NAME, "img").get_attribute("src")
+        POSTER_QUEUE.submit(poster_dir / "a.png", poster)
+        return listings("a")
+
+    def blocking_task(url: str) -> dict:
+        threads.add(threading.current_thread())
+        POSTER_QUEUE.submit(poster_dir / "b.png", url)
+        return listings("b")
+
+    def failing_task() -> dict:
+        raise RuntimeError("no page")
+
+    tasks = [
+        ("page", "127.0.0.1", page_task, (f"{base}/page.html",)),
+        ("blocking", "127.0.0.1", blocking_task, (f"{base}/b.png",)),
+        ("failing", "other.example", failing_task, ()),
+    ]
+    stream = ListingStream()
+    try:
+        asyncio.run(_run_tasks_async(tasks, 2, stream))
+    finally:
+        server.shutdown()
+    stream.close()
+
+    assert [movie["title"] for movie in next(stream.days())["movies"]] == ["a", "b"]
+    assert threading.main_thread() in threads and len(threads) == 2
+    assert (poster_dir / "a.png").read_bytes() == b"a" * 2048
+    assert (poster_dir / "b.png").read_bytes() == b"b" * 2048
+    manifest = read_json(POSTER_STORE.manifest_path)
+    assert sorted(manifest["keys"]) == ["a", "b"]
+
+
+def test_poster_gc():
+    """
+    Posters the saved listings don't reference leave public/posters at
+    once, and the store, least recently used first, after the retention
+    window or while over the size cap; shared objects stay while referenced.
+    """
+    if K_TMP_TEST_DIR.exists():
+        shutil.rmtree(K_TMP_TEST_DIR)
+    sources = K_TMP_TEST_DIR / "sources"
+    sources.mkdir(parents=True)
+    poster_dir = K_TMP_TEST_DIR / "posters"
+    store = PosterStore(K_TMP_TEST_DIR / "store")
+    for key, content in (("a", b"a"), ("b", b"b"), ("c", b"b"), ("d", b"d")):
+        (sources / f"{content.decode()}.png").write_bytes(content * 1000)
+        store.put(
+            poster_dir / f"{key}.png", (sources / f"{content.decode()}.png").as_uri()
+        )
+        (poster_dir / f"{key}@2x.webp").write_bytes(b"variant")
+    digest_b = store.keys["b"]
+    variants_root = K_TMP_TEST_DIR / "variants"
+    variant = variants_root / "variant.webp"
+    variant.parent.mkdir()
+    variant.write_bytes(b"variant")
+    (variants_root / "manifest.json").write_text(
+        json.dumps({digest_b: {"spec": "", "files": {".webp": variant.name}}})
+    )
+    json_path = K_TMP_TEST_DIR / "movies.json"
+    json_path.write_text(
+        json.dumps(
+            [{"date": "2025-01-01", "movies": [{"poster": "a"}, {"poster": ""}]}]
+        )
+    )
+
+    def gc(**kwargs):
+        settings = {"retention_days": 30, "max_mb": 1}
+        settings.update(kwargs)
+        collect_posters(
+            json_path, poster_dir, **settings, store=store, variants_root=variants_root
+        )
+        return read_json(K_TMP_TEST_DIR / "store" / "manifest.json")
+
+    manifest = gc()
+    assert sorted(p.name for p in poster_dir.iterdir()) == ["a.png", "a@2x.webp"]
+    assert sorted(manifest["keys"]) == ["a", "b", "c", "d"]
+
+    # past the retention window; b's object is still c's
+    old = time.time() - 31 * 86400
+    store.used.update(b=old, d=old + 1)
+    manifest = gc()
+    assert sorted(manifest["keys"]) == ["a", "c"]
+    assert sorted(manifest["used"]) == ["a", "c"]
+    assert digest_b in manifest["objects"]
+    assert len(list((K_TMP_TEST_DIR / "store" / "objects").rglob("*.png"))) == 2
+    assert variant.exists()
+
+    # over the cap; referenced posters stay regardless
+    manifest = gc(max_mb=0)
+    assert list(manifest["keys"]) == ["a"]
+    assert list(manifest["objects"]) == [store.keys["a"]]
+    assert not variant.exists()
+    assert read_json(variants_root / "manifest.json") == {}
+    assert PosterStore(K_TMP_TEST_DIR / "store").keys == {"a": store.keys["a"]}
+    shutil.rmtree(K_TMP_TEST_DIR)
+
+
+def test_poster_variants():
+    """
+    Posters are resized to WebP at 1x and 2x once per digest, published next
+    to the PNG and listed as <picture> sources with their size, colour and
+    placeholder; narrow images aren't upscaled.
+    """
+    Image = pytest.importorskip("PIL.Image")
+    if K_TMP_TEST_DIR.exists():
+        shutil.rmtree(K_TMP_TEST_DIR)
+    poster_dir = K_TMP_TEST_DIR / "posters"
+    poster_dir.mkdir(parents=True)
+    Image.new("RGB", (600, 900), "red").save(poster_dir / "a.png", "JPEG")
+    shutil.copy(poster_dir / "a.png", poster_dir / "b.png")
+    Image.new("P", (200, 300)).save(poster_dir / "c.png", "PNG")
+    root = K_TMP_TEST_DIR / "variants"
+
+    data = PosterVariants(root=root).build(poster_dir)
+    assert sorted(data) == ["a", "b", "c"]
+    assert data["a"]["sources"] == [
+        {"type": "image/webp", "srcset": "posters/a.webp 1x, posters/a@2x.webp 2x"}
+    ]
+    assert (data["a"]["width"], data["a"]["height"]) == (600, 900)
+    red, green_blue = data["a"]["color"][1:3], data["a"]["color"][3:]
+    assert int(red, 16) > 240 and green_blue == "0000"
+    assert data["a"]["placeholder"].startswith("data:image/webp;base64,")
+    assert (data["c"]["width"], data["c"]["color"]) == (200, "#000000")
+    with Image.open(poster_dir / "a.webp") as im:
+        assert (im.format, im.size) == ("WEBP", (120, 180))
+    with Image.open(poster_dir / "b@2x.webp") as im:
+        assert im.size == (240, 360)
+    with Image.open(poster_dir / "c@2x.webp") as im:
+        assert im.size == (200, 300)
+    # identical posters share their variants
+    manifest = read_json(root / "manifest.json")
+    assert len(manifest) == 2
+    a = (poster_dir / "a.webp").stat().st_ino
+    assert (poster_dir / "b.webp").stat().st_ino == a
+
+    # nothing is encoded again until a poster or the settings change
+    mtime = (poster_dir / "a.webp").stat().st_mtime_ns
+    assert PosterVariants(root=root).build(poster_dir) == data
+    assert (poster_dir / "a.webp").stat().st_mtime_ns == mtime
+    Image.new("RGB", (300, 450), "blue").save(poster_dir / "a.png", "PNG")
+    PosterVariants(root=root).build(poster_dir)
+    assert (poster_dir / "a.webp").stat().st_ino != a
+    assert len(read_json(root / "manifest.json")) == 3
+    data = PosterVariants(width=60, root=root).build(poster_dir)
+    with Image.open(poster_dir / "b.webp") as im:
+        assert im.size == (60, 90)
+
+    # a variant gone from the store is encoded again when the next run
+    # publishes it
+    digest = hashlib.sha256((poster_dir / "b.png").read_bytes()).hexdigest()
+    variant = root / digest[:2] / f"{digest}@2x.webp"
+    variant.unlink()
+    (poster_dir / "b@2x.webp").unlink()
+    POSTER_STORE.set_root(POSTER_STORE.root)
+    assert PosterVariants(width=60, root=root).build(poster_dir) == data
+    assert variant.exists()
+    with Image.open(poster_dir / "b@2x.webp") as im:
+        assert im.size == (120, 180)
+    shutil.rmtree(K_TMP_TEST_DIR)
+
+
 def test_3d_title():
     """
     Test that 3D movie titles are properly cleaned:
@@ -212,6 +1356,11 @@ def test_alamo():
             ("7:00pm", False),  # regular
         ]
 
+        # _read_date_tabs: every tab clicked and read in one async script;
+        # the fixture never re-renders, so each tab waits out the timeout
+        tabs = AlamoScraper._read_date_tabs(driver, timeout=0.1)
+        assert tabs == [(d, showtimes) for d in date_strs]
+
         # _get_show_title
         title = AlamoScraper._get_show_title(driver)
         assert title == "Project Hail Mary"
@@ -239,6 +1388,144 @@ def test_alamo():
         driver.quit()
 
 
+def test_alamo_payloads():
+    """
+    Build Alamo showings from captured schedule JSON: SF cinema and this
+    show only, bookable sessions only, dated by business date.
+    """
+    fixtures = Path(__file__).parent / "websites" / "alamo_sf"
+    payload = read_json(fixtures / "schedule.json")
+    url = "https://drafthouse.com/sf/show/project-hail-mary"
+
+    class FakeDriver:
+        def get_log(self, log_type):
+            assert log_type == "performance"
+            events = [
+                ("Network.requestWillBeSent", "1", "/s/mother/x", "application/json"),
+                ("Network.responseReceived", "2", "/s/mother/x", "application/json"),
+                ("Network.responseReceived", "3", "/s/mother/x.png", "image/png"),
+                ("Network.responseReceived", "4", "/api/other", "application/json"),
+            ]
+            return [
+                {
+                    "message": json.dumps(
+                        {
+                            "message": {
+                                "method": method,
+                                "params": {
+                                    "requestId": request_id,
+                                    "response": {"url": path, "mimeType": mime},
+                                },
+                            }
+                        }
+                    )
+                }
+                for method, request_id, path, mime in events
+            ]
+
+        def execute_cdp_cmd(self, cmd, args):
+            assert cmd == "Network.getResponseBody" and args == {"requestId": "2"}
+            return {"body": json.dumps(payload), "base64Encoded": False}
+
+    payloads = AlamoScraper._captured_payloads(FakeDriver())
+    assert payloads == [payload]
+
+    # the page may fetch the same schedule twice
+    by_date = AlamoScraper._showings_from_payloads(
+        payloads * 2, "project-hail-mary", url
+    )
+    assert {
+        date: [(s.available, s.link, s.time) for s in showings]
+        for date, showings in by_date.items()
+    } == {
+        "2026-03-28": [("SOLD OUT", url, "1200"), ("", url, "2130")],
+        "2026-03-29": [("", url, "1900"), ("", url, "0015")],
+    }
+    assert AlamoScraper._showings_from_payloads([{"data": None}], "x", url) == {}
+
+
+def test_alamo_payloads_without_showings(monkeypatch, tmp_path):
+    """
+    Payloads without showings are not cached, so the date tabs are read on
+    every run until showings appear; payloads with showings are cached.
+    """
+    payloads = [{"data": None}]
+    by_date = {}
+    monkeypatch.setattr(
+        AlamoScraper, "_captured_payloads", staticmethod(lambda driver: payloads)
+    )
+    monkeypatch.setattr(
+        AlamoScraper,
+        "_showings_from_payloads",
+        staticmethod(lambda payloads, slug, url: dict(by_date)),
+    )
+    cache = PageCache("alamo", directory=tmp_path)
+    args = (None, "show", "Show", "U2hvdw==", "R", "link")
+
+    for _ in range(2):
+        scraper = AlamoScraper(page_cache=cache)
+        assert not scraper._network_listings(*args)
+        assert scraper.listings == {} and cache.entries == {}
+
+    by_date["2026-03-28"] = [MovieShowing("", "link", "1900")]
+    scraper = AlamoScraper(page_cache=cache)
+    assert scraper._network_listings(*args)
+    assert list(cache.entries) == ["show"]
+    by_date.clear()  # served from the cache now
+    scraper = AlamoScraper(page_cache=cache)
+    assert scraper._network_listings(*args)
+    assert list(scraper.listings["2026-03-28"]) == ["Show"]
+
+
+def test_alamo_network():
+    """
+    Capture the schedule XHR of a show page served by a local stand-in for
+    drafthouse.com and read it back through Chrome's performance log.
+    """
+    fixtures = Path(__file__).parent / "websites" / "alamo_sf"
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(fixtures), **kwargs)
+
+        def do_GET(self):
+            if not self.path.startswith("/s/mother/"):
+                return super().do_GET()
+            body = (fixtures / "schedule.json").read_bytes()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    driver = get_driver(performance_log=True)
+    try:
+        host, port = server.server_address
+        AlamoScraper._captured_responses(driver)
+        driver.get(f"http://{host}:{port}/show_page_network.html")
+        wait_until(
+            driver, lambda d: d.find_elements(By.CLASS_NAME, "adc-slider-item"), 10
+        )
+
+        payloads = AlamoScraper._captured_payloads(driver)
+        assert payloads == [read_json(fixtures / "schedule.json")]
+        by_date = AlamoScraper._showings_from_payloads(
+            payloads, "project-hail-mary", "link"
+        )
+        assert [s.time for s in by_date["2026-03-28"]] == ["1200", "2130"]
+
+        # the log was drained: nothing is read twice
+        assert AlamoScraper._captured_payloads(driver) == []
+    finally:
+        driver.quit()
+        server.shutdown()
+
+
 def test_landmark():
     """
     Test Landmark scraper: date parsing, time parsing, theater selection,
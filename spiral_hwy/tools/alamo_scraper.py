@@ -7,28 +7,132 @@ Architecture:
 2. Extract currently-playing show slugs from cards without an open-date badge.
 3. Visit each /sf/show/{slug} page, select SF location, iterate date tabs,
    collect showtimes, and build MovieShowing/MovieListing objects.
+
+With a driver pool, step 3 is pipelined with step 2: slugs are queued as
+soon as they are discovered and show pages are scraped on several drivers.
+
+In `network` capture mode step 3 reads showtimes from the schedule JSON the
+show page downloads (via Chrome's performance log) instead of clicking every
+date tab, and falls back to the tabs when no payload was captured.
 """
 
 import base64
+import datetime
+import json
+import queue
 import re
-import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
 
-import pytz
-import requests
+from date_tools import pacific_today, parse_12h_time, parse_month_day
+from driver_pool import DriverPool
+from page_cache import PageCache, fingerprint
+from poster_store import POSTER_QUEUE, POSTER_STORE
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from web_scraper import MovieListing, MovieShowing, WebScraper, atomic_write_bytes
+from slug_cache import SlugCache
+from waits import QUIET_MS, dom_changed, dom_quiescent, mark_dom, wait_until
+from web_scraper import MovieListing, MovieShowing, WebScraper, merge_listings
 
 ALAMO_SF_URL = "https://drafthouse.com/sf"
 ALAMO_SF_THEATER = "alamo_drafthouse_sf"
 ALAMO_SF_THEATER_LINK = "https://drafthouse.com/sf/theater/new-mission"
 ALAMO_SF_AREA = "mission"
 ALAMO_SF_MAP = "https://maps.google.com/?q=2550+Mission+St,+San+Francisco,+CA+94110"
+ALAMO_SF_CINEMA_SLUG = "new-mission"
+
+# XHRs carrying show schedules, captured in network mode
+ALAMO_API_PATTERN = re.compile(r"/s/mother/")
+
+# Bookable session statuses → sold out; other statuses are skipped like
+# disabled slider items
+SESSION_SOLD_OUT = {"ONSALE": False, "SOLDOUT": True}
+
+# Clicks through every date tab inside the page, waiting after each click
+# until the showtimes re-render (the tab is replaced or the DOM mutates,
+# then stays quiet for `quietMs`) or `timeoutMs` passes. Calls back with
+# [[m/d, [[time, sold_out], ...]], ...], read the same way as
+# _get_date_buttons and _get_showtimes.
+DATE_TABS_SCRIPT_TIMEOUT = 120
+DATE_TABS_JS = r"""
+var quietMs = arguments[0], timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+
+function dateButtons() {
+    var sliders = document.getElementsByClassName('adc-show-time-slider');
+    for (var s = 0; s < sliders.length; s++) {
+        var btns = sliders[s].getElementsByClassName('adc-slider-item');
+        if (btns.length && /\d+\/\d+/.test(btns[0].innerHTML)) {
+            return Array.prototype.slice.call(btns);
+        }
+    }
+    return [];
+}
+
+function dateOf(btn) {
+    var dates = btn.innerHTML.match(/\d{1,2}\/\d{1,2}/g);
+    return dates ? dates[dates.length - 1] : '';
+}
+
+function showtimes() {
+    var wrapped = document.querySelector('.adc-show-time-slider__items--wrapped');
+    if (!wrapped) return [];
+    var times = [];
+    var items = wrapped.getElementsByClassName('adc-slider-item');
+    for (var i = 0; i < items.length; i++) {
+        var classes = items[i].getAttribute('class') || '';
+        if (classes.indexOf('adc-slider-item--disabled') >= 0) continue;
+        var text = (items[i].textContent || '').trim();
+        if (/^\d+:\d+[ap]m/i.test(text)) {
+            times.push([text, classes.indexOf('adc-slider-item--strike-through') >= 0]);
+        }
+    }
+    return times;
+}
+
+var state = {count: 0, last: performance.now()};
+var observer = new MutationObserver(function (records) {
+    state.count += records.length;
+    state.last = performance.now();
+});
+observer.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+
+var total = dateButtons().length, index = 0, results = [];
+
+function next() {
+    var btns = dateButtons();
+    if (index >= total || index >= btns.length) {
+        observer.disconnect();
+        done(results);
+        return;
+    }
+    var btn = btns[index++], date = dateOf(btn);
+    if (!date) {
+        next();
+        return;
+    }
+    var since = state.count, start = performance.now();
+    btn.click();
+    (function poll() {
+        var now = performance.now();
+        var rerendered = state.count > since || !btn.isConnected;
+        if ((rerendered && now - state.last >= quietMs) || now - start >= timeoutMs) {
+            results.push([date, showtimes()]);
+            next();
+        } else {
+            setTimeout(poll, 50);
+        }
+    })();
+}
+
+next();
+"""
 
 
 def _extract_text(html: str) -> str:
@@ -40,53 +144,140 @@ class AlamoScraper(WebScraper):
     """
     Extends WebScraper to add Alamo Drafthouse SF scraping.
     Writes into the same self.listings dict so save_json works unchanged.
+    `capture` selects how show pages are read: `browser` clicks every date
+    tab, `network` reads the page's schedule JSON. With a `slug_cache`,
+    recently scanned dates are not clicked during slug discovery; with a
+    `page_cache`, show pages whose schedule payloads are unchanged reuse
+    their cached listings (network capture only: in browser mode the
+    unclicked tabs' showtimes are not on the page to fingerprint).
     """
 
-    def scrape_alamo_sf(self, driver: WebDriver) -> None:
+    def __init__(
+        self,
+        *args,
+        capture: str = "browser",
+        slug_cache: SlugCache | None = None,
+        page_cache: PageCache | None = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.capture = capture
+        self.slug_cache = slug_cache
+        self.page_cache = page_cache
+
+    def scrape_alamo_sf(
+        self, driver: WebDriver, pool: DriverPool | None = None, workers: int = 1
+    ) -> None:
         """
         Main entry point. Call after scraping Veezi theaters so all data
         ends up in self.listings before save_json is called.
+
+        With a `pool` and `workers` > 1, show pages are scraped on `workers`
+        drivers borrowed from the pool while `driver` is still discovering
+        slugs.
+        """
+        if pool is not None and workers > 1:
+            self._scrape_pipelined(driver, pool, workers)
+        else:
+            slugs = self._get_all_sf_slugs(driver)
+            print(f"Alamo SF: found {len(slugs)} show(s)")
+
+            for slug in slugs:
+                print(f"  Scraping: {slug}")
+                try:
+                    self._scrape_show_page(driver, slug)
+                except Exception as e:
+                    print(f"    Failed: {e}")
+
+        if self.page_cache is not None:
+            self.page_cache.save()
+
+    def _scrape_pipelined(
+        self, driver: WebDriver, pool: DriverPool, workers: int
+    ) -> None:
         """
-        slugs = self._get_all_sf_slugs(driver)
+        Producer/consumer scrape: `driver` feeds newly discovered slugs into
+        a queue drained by `workers` show-page scrapers, each on its own
+        pooled driver. Per-slug listings are merged in discovery order, so
+        the result matches a sequential scrape.
+        """
+        pending: queue.Queue[str | None] = queue.Queue()
+        results: dict[str, dict] = {}
+
+        def consume() -> None:
+            with pool.driver(performance_log=self.capture == "network") as show_driver:
+                while (slug := pending.get()) is not None:
+                    results[slug] = self._scrape_slug(show_driver, slug)
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="alamo-show"
+        ) as ex:
+            consumers = [ex.submit(consume) for _ in range(workers)]
+            try:
+                slugs = self._get_all_sf_slugs(driver, on_slug=pending.put)
+            finally:
+                for _ in consumers:
+                    pending.put(None)
         print(f"Alamo SF: found {len(slugs)} show(s)")
 
+        for consumer in consumers:
+            consumer.result()
         for slug in slugs:
-            print(f"  Scraping: {slug}")
-            try:
-                self._scrape_show_page(driver, slug)
-            except Exception as e:
-                print(f"    Failed: {e}")
+            merge_listings(self.listings, results.get(slug, {}))
+
+    def _scrape_slug(self, driver: WebDriver, slug: str) -> dict:
+        """
+        Scrape one show page into a fresh listings dict.
+        """
+        print(f"  Scraping: {slug}")
+        scraper = AlamoScraper(
+            today=self.today,
+            year=self.year,
+            poster_dir=self.poster_dir,
+            capture=self.capture,
+            page_cache=self.page_cache,
+        )
+        try:
+            scraper._scrape_show_page(driver, slug)
+        except Exception as e:
+            print(f"    Failed: {e}")
+        return scraper.listings
 
     # ------------------------------------------------------------------
     # Step 1 — discover all SF slugs by iterating every available date
     # ------------------------------------------------------------------
 
-    def _get_all_sf_slugs(self, driver: WebDriver) -> list[str]:
+    def _get_all_sf_slugs(
+        self, driver: WebDriver, on_slug: Callable[[str], None] | None = None
+    ) -> list[str]:
         """
         Load the SF landing page, apply the 'San Francisco' WHERE filter,
         then click every available date to collect all unique show slugs.
-        Returns a deduplicated list in discovery order.
+        Returns a deduplicated list in discovery order; `on_slug` is called
+        with each slug as it is first seen.
+
+        Dates the slug cache scanned within its TTL are not clicked; their
+        cached slugs are used instead.
         """
         driver.get(ALAMO_SF_URL)
         WebDriverWait(driver, 30).until(
             EC.presence_of_element_located((By.CLASS_NAME, "show-me-slider-item"))
         )
-        time.sleep(2)
+        wait_until(driver, dom_quiescent(), timeout=2)
 
         # Apply SF location filter
+        mark = mark_dom(driver)
         for item in driver.find_elements(By.CLASS_NAME, "show-me-slider-item"):
             if (item.get_attribute("textContent") or "").strip() == "San Francisco":
                 driver.execute_script("arguments[0].click();", item)
                 break
-        time.sleep(1.5)
+        wait_until(driver, dom_changed(mark), timeout=1.5)
 
         # Collect all WHEN date buttons (contain m/d pattern)
-        date_buttons = [
-            item
-            for item in driver.find_elements(By.CLASS_NAME, "show-me-slider-item")
-            if re.search(r"\d+/\d+", item.get_attribute("textContent") or "")
-        ]
-        print(f"  Alamo SF: scanning {len(date_buttons)} dates...")
+        date_buttons = []
+        for item in driver.find_elements(By.CLASS_NAME, "show-me-slider-item"):
+            if date_str := self._button_date(item):
+                date_buttons.append((date_str, item))
 
         seen: dict[str, None] = {}  # ordered set via dict
         try:
@@ -94,16 +285,46 @@ class AlamoScraper(WebScraper):
         except NoSuchElementException:
             return []
 
-        for btn in date_buttons:
-            driver.execute_script("arguments[0].click();", btn)
-            time.sleep(1.2)
-            for card in section.find_elements(By.CLASS_NAME, "adc-show-card"):
-                slug = self._card_slug(card)
-                if slug:
+        def add(slugs: list[str]) -> None:
+            for slug in slugs:
+                if slug not in seen:
                     seen[slug] = None
+                    if on_slug is not None:
+                        on_slug(slug)
+
+        cache = self.slug_cache
+        today = self._pacific_today()
+        today_str = today.strftime("%Y-%m-%d")
+        scanned = 0
+        for date_str, btn in date_buttons:
+            date = self._parse_alamo_date(date_str, today)
+            if cache is not None and date and cache.is_fresh(date):
+                add(cache.slugs_on(date))
+                continue
 
+            mark = mark_dom(driver)
+            driver.execute_script("arguments[0].click();", btn)
+            wait_until(driver, dom_changed(mark), timeout=1.2)
+            slugs = [
+                slug
+                for card in section.find_elements(By.CLASS_NAME, "adc-show-card")
+                if (slug := self._card_slug(card))
+            ]
+            add(slugs)
+            scanned += 1
+            if cache is not None and date:
+                cache.record(date, slugs, today_str)
+
+        print(f"  Alamo SF: scanned {scanned} of {len(date_buttons)} dates")
+        if cache is not None:
+            cache.prune(today_str)
+            cache.save()
         return list(seen.keys())
 
+    def _pacific_today(self) -> datetime.date:
+        """Today in Pacific time, or the fixed `today` given to the scraper."""
+        return pacific_today(self.today)
+
     @staticmethod
     def _card_slug(card) -> str:
         """Extract slug from the card's img src URL."""
@@ -124,6 +345,8 @@ class AlamoScraper(WebScraper):
     def _scrape_show_page(self, driver: WebDriver, slug: str) -> None:
         """Visit /sf/show/{slug} and collect showtimes per date for the SF location."""
         show_url = f"https://drafthouse.com/sf/show/{slug}"
+        if self.capture == "network":
+            self._captured_responses(driver)  # drop earlier pages' traffic
         driver.get(show_url)
 
         try:
@@ -143,42 +366,30 @@ class AlamoScraper(WebScraper):
             except TimeoutException:
                 return
 
-        time.sleep(1.5)
+        wait_until(driver, dom_quiescent(), timeout=1.5)
 
         title = self._get_show_title(driver) or slug.replace("-", " ").title()
         poster_key = self._download_poster(driver, title)
         rating = self._get_rating(driver)
-        self._select_sf_location(driver)
-        time.sleep(0.5)
-
-        pacific_tz = pytz.timezone("US/Pacific")
-        today = (
-            datetime.now(pacific_tz)
-            if self.today is None
-            else pacific_tz.localize(self.today)
-        )
 
-        # Determine how many date tabs exist once, then re-fetch buttons each
-        # iteration to avoid stale element references after Angular re-renders.
-        n_dates = len(self._get_date_buttons(driver))
-
-        for i in range(n_dates):
-            # Re-find buttons on every iteration — Angular re-renders the slider
-            # after each click, making previously stored references stale.
-            date_buttons = self._get_date_buttons(driver)
-            if i >= len(date_buttons):
-                break
-            date_str, btn = date_buttons[i]
+        if self.capture == "network":
+            if self._network_listings(
+                driver, slug, title, poster_key, rating, show_url
+            ):
+                return
+            print("    No schedule payload captured, reading date tabs")
 
-            date = self._parse_alamo_date(date_str, today)
-            if not date:
-                continue
+        mark = mark_dom(driver)
+        if self._select_sf_location(driver):
+            wait_until(driver, dom_changed(mark), timeout=0.5)
 
-            driver.execute_script("arguments[0].click();", btn)
-            time.sleep(1.2)
+        today = self._pacific_today()
 
-            showtime_pairs = self._get_showtimes(driver)
-            if not showtime_pairs:
+        # All tabs are clicked and read in one round trip; the page re-finds
+        # the buttons after each click, as Angular re-renders the slider.
+        for date_str, showtime_pairs in self._read_date_tabs(driver):
+            date = self._parse_alamo_date(date_str, today)
+            if not date or not showtime_pairs:
                 continue
 
             showings = []
@@ -193,24 +404,177 @@ class AlamoScraper(WebScraper):
             if not showings:
                 continue
 
-            listing = MovieListing(
-                showings=showings,
-                theater=ALAMO_SF_THEATER,
-                map=ALAMO_SF_MAP,
-                area=ALAMO_SF_AREA,
-                theater_link=ALAMO_SF_THEATER_LINK,
+            self._add_listing(date, title, poster_key, rating, showings)
+
+    @staticmethod
+    def _read_date_tabs(
+        driver: WebDriver, quiet_ms: float = QUIET_MS, timeout: float = 1.2
+    ) -> list[tuple[str, list[tuple[str, bool]]]]:
+        """
+        Click every date tab inside the page and return
+        [(date_str, [(time_str, is_sold_out), ...])] for each tab, waiting
+        up to `timeout` seconds per tab for the showtimes to re-render.
+        """
+        driver.set_script_timeout(DATE_TABS_SCRIPT_TIMEOUT)
+        return [
+            (date_str, [(t, bool(sold_out)) for t, sold_out in times])
+            for date_str, times in driver.execute_async_script(
+                DATE_TABS_JS, quiet_ms, timeout * 1000
             )
+        ]
 
-            date_dict = self.listings.get(date, {})
-            title_dict = date_dict.get(title, {})
-            if not title_dict:
-                title_dict = {"poster": poster_key, "rating": rating}
+    def _network_listings(
+        self,
+        driver: WebDriver,
+        slug: str,
+        title: str,
+        poster_key: str,
+        rating: str,
+        show_url: str,
+    ) -> bool:
+        """
+        Add the show's listings from its captured schedule payloads, or from
+        the page cache while the payloads are unchanged. False if there are
+        no showings in them, so the caller reads the date tabs instead.
+        """
+        payloads = self._captured_payloads(driver)
+        cache = self.page_cache
+        digest = None
+        if cache is not None and payloads:
+            digest = fingerprint(title, rating, json.dumps(payloads, sort_keys=True))
+            # entries are never empty, but older runs may have stored some
+            cached = cache.lookup(slug, digest)
+            if cached:
+                merge_listings(self.listings, cached)
+                return True
+
+        by_date = self._showings_from_payloads(payloads, slug, show_url)
+        if not by_date:
+            # nothing is cached, or the next run would skip the date tabs too
+            return False
+        page: dict = {}
+        for date, showings in by_date.items():
+            self._add_listing(date, title, poster_key, rating, showings, page)
+        merge_listings(self.listings, page)
+        if digest is not None:
+            cache.store(slug, digest, page)
+        return True
+
+    def _add_listing(
+        self,
+        date: str,
+        title: str,
+        poster_key: str,
+        rating: str,
+        showings: list[MovieShowing],
+        listings: dict | None = None,
+    ) -> None:
+        """
+        Record the SF showings of one show on one date, in `listings`
+        (default self.listings).
+        """
+        listing = MovieListing(
+            showings=showings,
+            theater=ALAMO_SF_THEATER,
+            map=ALAMO_SF_MAP,
+            area=ALAMO_SF_AREA,
+            theater_link=ALAMO_SF_THEATER_LINK,
+        )
+
+        listings = self.listings if listings is None else listings
+        date_dict = listings.get(date, {})
+        title_dict = date_dict.get(title, {})
+        if not title_dict:
+            title_dict = {"poster": poster_key, "rating": rating}
 
-            listings_list = title_dict.get("listings", [])
-            listings_list.append(listing)
-            title_dict["listings"] = listings_list
-            date_dict[title] = title_dict
-            self.listings[date] = date_dict
+        listings_list = title_dict.get("listings", [])
+        listings_list.append(listing)
+        title_dict["listings"] = listings_list
+        date_dict[title] = title_dict
+        listings[date] = date_dict
+
+    # ------------------------------------------------------------------
+    # Network capture — schedule JSON from Chrome's performance log
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _captured_responses(driver: WebDriver) -> list[tuple[str, str]]:
+        """
+        Drain the performance log, returning (requestId, url) of JSON
+        responses from the schedule API.
+        """
+        responses = []
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            if message.get("method") != "Network.responseReceived":
+                continue
+            response = message["params"]["response"]
+            if "json" in response.get("mimeType", "") and ALAMO_API_PATTERN.search(
+                response.get("url", "")
+            ):
+                responses.append((message["params"]["requestId"], response["url"]))
+        return responses
+
+    @classmethod
+    def _captured_payloads(cls, driver: WebDriver) -> list:
+        """Decode the bodies of schedule responses seen since the last drain."""
+        payloads = []
+        for request_id, url in cls._captured_responses(driver):
+            try:
+                body = driver.execute_cdp_cmd(
+                    "Network.getResponseBody", {"requestId": request_id}
+                )
+                text = body["body"]
+                if body.get("base64Encoded"):
+                    text = base64.b64decode(text)
+                payloads.append(json.loads(text))
+            except Exception as e:
+                print(f"    Could not read {url}: {e}")
+        return payloads
+
+    @staticmethod
+    def _showings_from_payloads(
+        payloads: list, slug: str, show_url: str
+    ) -> dict[str, list[MovieShowing]]:
+        """
+        Build {YYYY-MM-DD: [MovieShowing]} for `slug` at the SF cinema from
+        schedule payloads ({"data": {"sessions": [...], "cinemas": [...]}}).
+        Sessions are dated by business date, as the date tabs are.
+        """
+        sessions: dict[str, dict] = {}
+        cinemas: dict[str, str] = {}
+        for payload in payloads:
+            data = payload.get("data") if isinstance(payload, dict) else None
+            if not isinstance(data, dict):
+                continue
+            for cinema in data.get("cinemas") or []:
+                cinemas[cinema.get("id")] = cinema.get("slug")
+            for session in data.get("sessions") or []:
+                sessions[session.get("sessionId") or id(session)] = session
+
+        by_date: dict[str, list[MovieShowing]] = {}
+        for session in sorted(
+            sessions.values(), key=lambda s: s.get("showTimeClt", "")
+        ):
+            if session.get("presentationSlug", slug) != slug:
+                continue
+            if cinemas and cinemas.get(session.get("cinemaId")) != ALAMO_SF_CINEMA_SLUG:
+                continue
+            sold_out = SESSION_SOLD_OUT.get(session.get("status"))
+            m = re.match(
+                r"(\d{4}-\d{2}-\d{2})T(\d{2}):(\d{2})", session.get("showTimeClt") or ""
+            )
+            if sold_out is None or not m:
+                continue
+            date = (session.get("businessDateClt") or m.group(1))[:10]
+            by_date.setdefault(date, []).append(
+                MovieShowing(
+                    available="SOLD OUT" if sold_out else "",
+                    link=show_url,
+                    time=m.group(2) + m.group(3),
+                )
+            )
+        return by_date
 
     # ------------------------------------------------------------------
     # Helpers
@@ -218,24 +582,20 @@ class AlamoScraper(WebScraper):
 
     def _download_poster(self, driver: WebDriver, title: str) -> str:
         """
-        Download the show poster image if it doesn't exist yet.
+        Queue the show poster image for download unless a fresh copy is
+        stored.
         Returns the base64-encoded poster key used as the filename.
         """
         poster_key = base64.urlsafe_b64encode(title.lower().encode()).decode("utf-8")
         save_path = self.poster_dir / f"{poster_key}.png"
-        save_path.parent.mkdir(exist_ok=True, parents=True)
 
-        if not save_path.exists():
+        if not (POSTER_STORE.link(save_path) and POSTER_STORE.is_fresh(poster_key)):
             # Grab the first non-lazy-loaded img with a drafthouse.com src
             imgs = driver.find_elements(By.TAG_NAME, "img")
             for img in imgs:
                 src = img.get_attribute("src") or ""
                 if "img-assets.drafthouse.com" in src:
-                    try:
-                        data = requests.get(src, timeout=10).content
-                        atomic_write_bytes(save_path, data)
-                    except Exception:
-                        pass
+                    POSTER_QUEUE.submit(save_path, src)
                     break
 
         return poster_key
@@ -271,8 +631,11 @@ class AlamoScraper(WebScraper):
             return ""
 
     @staticmethod
-    def _select_sf_location(driver: WebDriver) -> None:
-        """Click the 'San Francisco' location button if it isn't already active."""
+    def _select_sf_location(driver: WebDriver) -> bool:
+        """
+        Click the 'San Francisco' location button if it isn't already active.
+        Returns whether a click was made.
+        """
         try:
             sliders = driver.find_elements(By.CLASS_NAME, "adc-show-time-slider")
             for slider in sliders:
@@ -285,12 +648,24 @@ class AlamoScraper(WebScraper):
                         and "adc-slider-item--active" not in classes
                     ):
                         driver.execute_script("arguments[0].click();", item)
-                        return
+                        return True
         except Exception:
             pass
+        return False
 
     @staticmethod
-    def _get_date_buttons(driver: WebDriver) -> list[tuple[str, object]]:
+    def _button_date(button) -> str:
+        """
+        Clean "m/d" string of a date button (e.g. "4/1"), or "" if it has
+        none. Read from innerHTML: textContent joins the hidden and visible
+        child divs, so "Wed 4/1" + "4/1" would read as "4/14/1".
+        """
+        inner = button.get_attribute("innerHTML") or ""
+        date_matches = re.findall(r"(\d{1,2}/\d{1,2})", inner)
+        return date_matches[-1] if date_matches else ""
+
+    @classmethod
+    def _get_date_buttons(cls, driver: WebDriver) -> list[tuple[str, object]]:
         """
         Find the date-selector slider and return [(date_str, button_element)].
         date_str is a clean "m/d" string (e.g. "4/1") extracted from innerHTML
@@ -306,15 +681,7 @@ class AlamoScraper(WebScraper):
             sample_html = btns[0].get_attribute("innerHTML") or ""
             if not re.search(r"\d+/\d+", sample_html):
                 continue
-            result = []
-            for btn in btns:
-                # Use innerHTML — HTML tags keep each div's text separate,
-                # preventing "Wed 4/1" + "4/1" from merging into "4/14/1".
-                inner = btn.get_attribute("innerHTML") or ""
-                date_matches = re.findall(r"(\d{1,2}/\d{1,2})", inner)
-                date_str = date_matches[-1] if date_matches else ""
-                result.append((date_str, btn))
-            return result
+            return [(cls._button_date(btn), btn) for btn in btns]
         return []
 
     @staticmethod
@@ -343,31 +710,14 @@ class AlamoScraper(WebScraper):
         return times
 
     @staticmethod
-    def _parse_alamo_date(date_str: str, today: datetime) -> str | None:
+    def _parse_alamo_date(date_str: str, today: datetime.date) -> str | None:
         """
         Parse a clean "m/d" date string (e.g. "4/1", "3/28") into YYYY-MM-DD.
         The date_str comes pre-cleaned from _get_date_buttons via innerHTML parsing.
         """
-        m = re.match(r"(\d{1,2})/(\d{1,2})$", date_str.strip())
-        if not m:
-            return None
-        month, day = int(m.group(1)), int(m.group(2))
-        year = today.year
-        try:
-            candidate = datetime(year, month, day, tzinfo=today.tzinfo)
-        except ValueError:
-            return None
-        if candidate < today - timedelta(days=1):
-            year += 1
-        return f"{year}-{month:02d}-{day:02d}"
+        return parse_month_day(date_str, pacific_today(today))
 
     @staticmethod
     def _parse_12h_time(time_str: str) -> str | None:
         """Convert '9:30pm' → '2130', '12:00pm' → '1200'."""
-        time_str = time_str.strip().lower()
-        for fmt in ("%I:%M%p", "%I%p"):
-            try:
-                return datetime.strptime(time_str, fmt).strftime("%H%M")
-            except ValueError:
-                continue
-        return None
+        return parse_12h_time(time_str)
@@ -0,0 +1,201 @@
+"""
+Date and time parsing shared by the scrapers.
+
+Pages repeat the same few hundred date labels and showtimes on every
+visit, so each parser is memoized with `lru_cache` on its arguments: the
+text, its format where there is one, and the day it is read on. That day
+is today in Pacific time, read from the clock once per run by
+`pacific_today`. The formats the sites use are parsed by hand; other
+`strptime` formats fall back to `strptime`.
+
+Dates come back as "YYYY-MM-DD" and times as 24-hour "HHMM". A date
+without a year is in the current year, unless that puts it more than a
+day in the past, in which case it is next year's.
+"""
+
+import calendar
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+import pytz
+
+PACIFIC = pytz.timezone("US/Pacific")
+
+CACHE_SIZE = 4096
+
+ONE_DAY = timedelta(days=1)
+
+# lowercase full and abbreviated names, as %A/%a and %B/%b accept them
+WEEKDAYS = {
+    name.lower(): i
+    for names in (calendar.day_name, calendar.day_abbr)
+    for i, name in enumerate(names)
+}
+MONTHS = {
+    name.lower(): i
+    for names in (calendar.month_name, calendar.month_abbr)
+    for i, name in enumerate(names)
+    if name
+}
+
+# 12-hour formats `parse_time` reads with `parse_12h_time`
+CLOCK_FORMATS = {"%I:%M %p", "%I:%M%p", "%I %p", "%I%p"}
+
+_CLOCK = re.compile(r"(\d{1,2})(?::(\d{1,2}))?\s*([ap])m", re.IGNORECASE)
+# "Monday 9, December": Veezi's date headings, read as "%A %d, %B %Y"
+_HEADING = re.compile(r"([a-z]+)\s+(\d{1,2}),\s*([a-z]+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1)
+def _clock_today() -> date:
+    return datetime.now(PACIFIC).date()
+
+
+def pacific_today(today: datetime | date | None = None) -> date:
+    """
+    The day listings are read on: the date of a fixed `today`, or else
+    today in Pacific time, read from the clock once per run.
+    """
+    if today is None:
+        return _clock_today()
+    return today.date() if isinstance(today, datetime) else today
+
+
+def _in_year(month: int, day: int, today: date, year: int | None = None) -> str | None:
+    """
+    `month`/`day` in `year` (default today's), or in the year after if that
+    is more than a day before `today`. None if there is no such date.
+    """
+    year = today.year if year is None else year
+    try:
+        if date(year, month, day) < today - ONE_DAY:
+            year += 1
+            date(year, month, day)
+    except ValueError:
+        return None
+    return f"{year}-{month:02d}-{day:02d}"
+
+
+def _next_month(year: int, month: int) -> tuple[int, int]:
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _next_on(day: int, weekday: int, today: date, within: int = 90) -> date | None:
+    """
+    The first date from `today` on, and less than `within` days after it,
+    that is the `day`th of its month and falls on `weekday`. Only the
+    `day`th of each month can match, so this steps a month at a time.
+    """
+    year, month = today.year, today.month
+    if day < today.day:
+        year, month = _next_month(year, month)
+    for _ in range(within // 28 + 1):
+        try:
+            candidate = date(year, month, day)
+        except ValueError:
+            candidate = None  # no such day this month
+        if candidate is not None:
+            if (candidate - today).days >= within:
+                return None
+            if candidate.weekday() == weekday:
+                return candidate
+        year, month = _next_month(year, month)
+    return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_heading_date(
+    text: str, fmt: str, today: date, year: int | None = None
+) -> str:
+    """
+    Date of a heading without its year, such as "Monday 9, December" with
+    `fmt` "%A %d, %B %Y", the format of the text once a year is appended.
+    `year` overrides the current year. Raises ValueError if `text` does not
+    match `fmt`, as `strptime` does.
+    """
+    base = today.year if year is None else year
+    if fmt == "%A %d, %B %Y":
+        m = _HEADING.fullmatch(text.strip())
+        if m is None or m[1].lower() not in WEEKDAYS or m[3].lower() not in MONTHS:
+            raise ValueError(f"{text!r} does not match format {fmt!r}")
+        month, day = MONTHS[m[3].lower()], int(m[2])
+    else:
+        parsed = datetime.strptime(f"{text} {base}", fmt)
+        month, day = parsed.month, parsed.day
+    result = _in_year(month, day, today, base)
+    if result is None:
+        raise ValueError(f"day is out of range for month in {text!r}")
+    return result
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_12h_time(text: str) -> str | None:
+    """
+    Time of a 12-hour clock reading such as "9:30pm", "9:30 PM" or "9pm",
+    or None if `text` is not one.
+    """
+    m = _CLOCK.fullmatch(text.strip())
+    if m is None:
+        return None
+    hour, minute = int(m[1]), int(m[2] or 0)
+    if not 1 <= hour <= 12 or minute > 59:
+        return None
+    hour = hour % 12 + (12 if m[3].lower() == "p" else 0)
+    return f"{hour:02d}{minute:02d}"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_time(text: str, fmt: str) -> str:
+    """
+    Time of a showtime such as "7:00 PM" in `fmt`. Raises ValueError if
+    `text` does not match `fmt`, as `strptime` does.
+    """
+    if fmt not in CLOCK_FORMATS:
+        return datetime.strptime(text, fmt).strftime("%H%M")
+    result = parse_12h_time(text)
+    if result is None:
+        raise ValueError(f"{text!r} does not match format {fmt!r}")
+    return result
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_month_day(text: str, today: date) -> str | None:
+    """
+    Date of a clean "m/d" label such as "4/1", or None.
+    """
+    m = re.match(r"(\d{1,2})/(\d{1,2})$", text.strip())
+    if m is None:
+        return None
+    return _in_year(int(m[1]), int(m[2]), today)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_date_label(text: str, today: date) -> str | None:
+    """
+    Date of a date picker label, or None: "Today", "Tomorrow", "m/d" with
+    or without a day name ("Wed 4/2"), a month and day with or without a
+    day name ("Thu Apr 3"), or a day name and a bare day of the month
+    ("Sat 4", "Sat4"), which is the first such day within 90 days.
+    """
+    text = text.strip().lower()
+
+    if text == "today":
+        return today.isoformat()
+    if text == "tomorrow":
+        return (today + ONE_DAY).isoformat()
+
+    m = re.search(r"(\d{1,2})/(\d{1,2})", text)
+    if m:
+        return _in_year(int(m[1]), int(m[2]), today)
+
+    m = re.search(r"([a-z]{3})\s+(\d{1,2})", text)
+    if m and m[1] in MONTHS:
+        return _in_year(MONTHS[m[1]], int(m[2]), today)
+
+    m = re.match(r"([a-z]{3})\s*(\d{1,2})$", text)
+    if m and m[1] in WEEKDAYS:
+        found = _next_on(int(m[2]), WEEKDAYS[m[1]], today)
+        return found.isoformat() if found else None
+
+    return None
@@ -0,0 +1,188 @@
+"""
+Pooled HTTP session and atomic file writes.
+
+All HTTP goes through one `requests.Session`, so connections to a host are
+kept alive and reused, with retries on transient failures and a default
+timeout. Code running on an event loop (the `async` executor) uses
+`http_get_async` instead, over one aiohttp session per loop with the same
+retries and timeouts. aiohttp is optional: without it only the blocking
+session is available.
+"""
+
+import asyncio
+import contextlib
+import fcntl
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Iterator, Mapping
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+ASYNC_HTTP = aiohttp is not None
+
+# seconds to connect, seconds to read
+DEFAULT_TIMEOUT = (5, 20)
+
+RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET", "HEAD"),
+)
+
+
+@contextlib.contextmanager
+def atomic_writer(path: Path) -> Iterator[BinaryIO]:
+    """
+    Binary file for output written in pieces: a same-directory temp file
+    that replaces `path` only when the block exits without error.
+    """
+    path.parent.mkdir(exist_ok=True, parents=True)
+    fd, tmp = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent)
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+@contextlib.contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on the file at `path` (created if missing)
+    across processes, for read-modify-write cycles on a shared file.
+    """
+    path.parent.mkdir(exist_ok=True, parents=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write bytes to `path` via a same-directory temp file + os.replace, so
+    concurrent writers can't observe a half-written file. Posters are
+    content-addressable, so two writers producing the same bytes is harmless.
+    """
+    with atomic_writer(path) as f:
+        f.write(data)
+
+
+@lru_cache(maxsize=None)
+def session() -> requests.Session:
+    """
+    The process-wide session: keep-alive connection pools with retries.
+    """
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=RETRY)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+
+def http_get(url: str, timeout=DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+    """
+    GET through the shared session, raising on HTTP errors.
+    """
+    response = session().get(url, timeout=timeout, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+@dataclass(frozen=True)
+class AsyncResponse:
+    """
+    The parts of a `requests.Response` callers read, from a body aiohttp
+    has read in full.
+    """
+
+    url: str
+    status_code: int
+    headers: Mapping[str, str]  # case-insensitive, as in requests
+    content: bytes
+    encoding: str
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+
+# the open aiohttp session of the running `async_session` block
+_async_session = None
+
+
+@contextlib.asynccontextmanager
+async def async_session() -> AsyncIterator[None]:
+    """
+    Open the event loop's session for the duration of the block: keep-alive
+    connections, as many per host as `session()` pools.
+    """
+    global _async_session
+    if aiohttp is None:
+        raise RuntimeError("async HTTP needs aiohttp")
+    connector = aiohttp.TCPConnector(limit_per_host=16)
+    async with aiohttp.ClientSession(connector=connector) as s:
+        _async_session = s
+        try:
+            yield
+        finally:
+            _async_session = None
+
+
+def _client_timeout(timeout) -> "aiohttp.ClientTimeout":
+    """
+    A requests-style timeout, seconds or (connect, read), for aiohttp.
+    """
+    if isinstance(timeout, tuple):
+        return aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+    return aiohttp.ClientTimeout(total=timeout)
+
+
+async def http_get_async(
+    url: str, timeout=DEFAULT_TIMEOUT, headers: dict | None = None
+) -> AsyncResponse:
+    """
+    GET through the loop's session inside `async_session`, retrying as
+    `RETRY` does and raising on HTTP errors.
+    """
+    if _async_session is None:
+        raise RuntimeError("http_get_async outside async_session")
+    for attempt in range(RETRY.total + 1):
+        last = attempt == RETRY.total
+        try:
+            async with _async_session.get(
+                url, headers=headers, timeout=_client_timeout(timeout)
+            ) as r:
+                if r.status not in RETRY.status_forcelist or last:
+                    r.raise_for_status()
+                    return AsyncResponse(
+                        url=str(r.url),
+                        status_code=r.status,
+                        headers=r.headers.copy(),
+                        content=await r.read(),
+                        encoding=r.get_encoding(),
+                    )
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if last:
+                raise
+        await asyncio.sleep(RETRY.backoff_factor * 2**attempt)
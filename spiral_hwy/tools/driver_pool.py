@@ -0,0 +1,198 @@
+"""
+Warm, reusable headless Chrome drivers.
+
+Resolving chromedriver and starting Chrome dominate the cost of short
+scrape tasks, so the driver binary is resolved once per process and
+browsers are lent out from a pool instead of being started per task.
+"""
+
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+from scheduling import throttle
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.webdriver import WebDriver
+from webdriver_manager.chrome import ChromeDriverManager
+
+DRIVER_PATH_CACHE = (
+    Path(__file__).parent.parent.parent / ".cache" / "spiral_hwy" / "chromedriver"
+)
+
+
+@lru_cache(maxsize=None)
+def resolve_driver_path() -> str | None:
+    """
+    Resolve the chromedriver binary once per process.
+    Offline, fall back to the last resolved path, then chromedriver on PATH.
+    None lets Selenium Manager locate a driver itself.
+    """
+    try:
+        path = ChromeDriverManager().install()
+    except Exception as e:
+        print(f"chromedriver lookup failed, using fallback: {e}")
+        if DRIVER_PATH_CACHE.exists():
+            cached = DRIVER_PATH_CACHE.read_text(encoding="utf-8").strip()
+            if Path(cached).exists():
+                return cached
+        return shutil.which("chromedriver")
+
+    DRIVER_PATH_CACHE.parent.mkdir(exist_ok=True, parents=True)
+    DRIVER_PATH_CACHE.write_text(path, encoding="utf-8")
+    return path
+
+
+def get_driver(performance_log: bool = False) -> WebDriver:
+    """
+    Get Selenium web driver. With `performance_log`, Chrome records network
+    events for scrapers that read the page's XHR responses.
+    """
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")  # Run in headless mode (no GUI)
+    chrome_options.add_argument("--disable-notifications")  # Disable notifications
+    if performance_log:
+        # network events only
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        chrome_options.add_experimental_option(
+            "perfLoggingPrefs", {"enableNetwork": True, "enablePage": False}
+        )
+
+    driver = webdriver.Chrome(
+        service=Service(resolve_driver_path()), options=chrome_options
+    )
+
+    return driver
+
+
+class PooledDriver:
+    """
+    Proxy around a pooled WebDriver that counts page loads, so the pool can
+    recycle browsers that have grown large, and paces them per host.
+    """
+
+    def __init__(self, driver: WebDriver, performance_log: bool = False):
+        self.driver = driver
+        self.performance_log = performance_log
+        self.pages = 0
+
+    def get(self, url: str) -> None:
+        throttle(url)
+        self.pages += 1
+        self.driver.get(url)
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+
+class DriverPool:
+    """
+    Lend warm browsers to scrape tasks.
+
+    `size` browsers are kept idle between tasks; extra concurrent demand
+    launches more, which are quit on return. A browser is reset between
+    tasks (cookies cleared, about:blank) and quit once it has loaded
+    `max_pages` pages. Browsers with Chrome's performance log on are kept
+    apart and only lent to callers that ask for it; warming launches
+    browsers without it.
+    """
+
+    def __init__(self, size: int = 1, max_pages: int = 50):
+        self.size = size
+        self.max_pages = max_pages
+        # idle browsers by whether their performance log is on
+        self._idle: dict[bool, queue.Queue[PooledDriver]] = {
+            False: queue.Queue(),
+            True: queue.Queue(),
+        }
+        self._lock = threading.Lock()
+        self._launching = 0
+        self._closed = False
+        self._launcher = ThreadPoolExecutor(thread_name_prefix="driver-pool")
+
+    def configure(self, size: int, max_pages: int) -> None:
+        """
+        Apply the composed config and start warming `size` browsers.
+        """
+        self.size = size
+        self.max_pages = max_pages
+        self.prewarm(size)
+
+    def prewarm(self, n: int) -> None:
+        """
+        Launch browsers in the background until `n` are idle or starting.
+        """
+        with self._lock:
+            missing = n - self._idle[False].qsize() - self._launching
+            self._launching += max(missing, 0)
+        for _ in range(missing):
+            self._launcher.submit(self._launch_idle)
+
+    def _launch_idle(self) -> None:
+        try:
+            self._idle[False].put(PooledDriver(get_driver()))
+        except Exception as e:
+            print(f"driver prewarm failed: {e}")
+        finally:
+            with self._lock:
+                self._launching -= 1
+
+    def _acquire(self, performance_log: bool) -> PooledDriver:
+        idle = self._idle[performance_log]
+        while True:
+            try:
+                return idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if performance_log or not self._launching:
+                    break
+            # a warm browser is on its way; starting another is no faster
+            time.sleep(0.05)
+        return PooledDriver(get_driver(performance_log), performance_log)
+
+    def _release(self, driver: PooledDriver) -> None:
+        idle = self._idle[driver.performance_log]
+        if self._closed or driver.pages >= self.max_pages or idle.qsize() >= self.size:
+            driver.quit()
+            return
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.driver.get("about:blank")
+            if driver.performance_log:
+                driver.get_log("performance")  # don't hand on this task's traffic
+        except Exception:
+            driver.quit()
+            return
+        idle.put(driver)
+
+    @contextmanager
+    def driver(self, performance_log: bool = False):
+        """
+        Borrow a browser for the duration of a `with` block, with Chrome's
+        performance log on if `performance_log`.
+        """
+        d = self._acquire(performance_log)
+        try:
+            yield d
+        finally:
+            self._release(d)
+
+    def close(self) -> None:
+        """
+        Quit every idle browser, including ones still launching.
+        """
+        self._closed = True
+        self._launcher.shutdown(wait=True)
+        for idle in self._idle.values():
+            while True:
+                try:
+                    idle.get_nowait().quit()
+                except queue.Empty:
+                    break
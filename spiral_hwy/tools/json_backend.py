@@ -0,0 +1,50 @@
+"""
+JSON encoding of the site's data files, with orjson when it is installed.
+
+orjson encodes in native code straight to bytes, but only indents by two
+spaces and never escapes non-ASCII. The stdlib fallback is set up to write
+the same bytes: UTF-8 rather than \\u escapes, and either 2-space indents
+or no whitespace at all. Listing records are encoded through their
+`as_dict` by both.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "json" if orjson is None else "orjson"
+
+
+def _default(o) -> dict:
+    return o.as_dict()
+
+
+def dumps(obj, indent: bool = False, backend: str = BACKEND) -> bytes:
+    """
+    `obj` as UTF-8 JSON, indented by two spaces if `indent`, otherwise
+    without whitespace. Both backends give the same bytes.
+    """
+    if backend == "orjson":
+        option = orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    if indent:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, default=_default)
+    else:
+        text = json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), default=_default
+        )
+    return text.encode("utf-8")
+
+
+def loads(data: bytes | str):
+    """
+    Parsed JSON `data`.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -9,19 +9,20 @@ Architecture:
 """
 
 import base64
+import datetime
 import re
-import time
-from datetime import datetime, timedelta
 
-import pytz
-import requests
 from alamo_scraper import AlamoScraper
+from date_tools import pacific_today, parse_12h_time, parse_date_label
+from page_cache import fingerprint
+from poster_store import POSTER_QUEUE
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from web_scraper import MovieListing, MovieShowing, atomic_write_bytes
+from waits import dom_changed, dom_quiescent, mark_dom, wait_until
+from web_scraper import MovieListing, MovieShowing, merge_listings
 
 LANDMARK_SHOWTIMES_URL = "https://www.landmarktheatres.com/showtimes/"
 LANDMARK_THEATER_ID = "X00U8"
@@ -32,6 +33,11 @@ LANDMARK_THEATER_LINK = (
 LANDMARK_AREA = "civic_center"
 LANDMARK_MAP = "https://maps.app.goo.gl/kqZu2DAkUSAYxtrP9"
 
+# Showtimes content fingerprinted per date for the page cache
+LANDMARK_CONTENT_JS = (
+    "return (document.querySelector('main') || document.body).innerHTML;"
+)
+
 
 class LandmarkScraper(AlamoScraper):
     """
@@ -67,16 +73,11 @@ class LandmarkScraper(AlamoScraper):
                 print("  Landmark: timed out waiting for theater selector")
                 return
 
-        time.sleep(2)
+        wait_until(driver, dom_quiescent(), timeout=2)
         self._select_theater(driver)
-        time.sleep(3)
+        wait_until(driver, dom_quiescent(500), timeout=3)
 
-        pacific_tz = pytz.timezone("US/Pacific")
-        today = (
-            datetime.now(pacific_tz)
-            if self.today is None
-            else pacific_tz.localize(self.today)
-        )
+        today = pacific_today(self.today)
 
         # Iterate through date buttons, scraping movies for each date
         date_buttons = self._get_date_buttons(driver)
@@ -92,14 +93,27 @@ class LandmarkScraper(AlamoScraper):
             if not date:
                 continue
 
+            mark = mark_dom(driver)
             driver.execute_script("arguments[0].click();", btn)
-            time.sleep(2)
+            wait_until(driver, dom_changed(mark), timeout=2)
+
+            cache = self.page_cache
+            if cache is not None:
+                digest = fingerprint(driver.execute_script(LANDMARK_CONTENT_JS))
+                cached = cache.lookup(date, digest)
+                if cached is not None:
+                    merge_listings(self.listings, cached)
+                    continue
 
             movies = self._get_movies(driver)
-            if not movies:
-                continue
+            if movies:
+                self._store_movies(date, movies)
+            if cache is not None:
+                page = {date: self.listings[date]} if date in self.listings else {}
+                cache.store(date, digest, page)
 
-            self._store_movies(date, movies)
+        if self.page_cache is not None:
+            self.page_cache.save()
 
     def _store_movies(self, date: str, movies: list) -> None:
         """Store extracted movies into self.listings for a given date."""
@@ -158,11 +172,11 @@ class LandmarkScraper(AlamoScraper):
                 if "at:" in text:
                     break
 
-        if trigger:
-            driver.execute_script("arguments[0].click();", trigger)
-            time.sleep(1.5)
-        else:
+        if not trigger:
             return
+        mark = mark_dom(driver)
+        driver.execute_script("arguments[0].click();", trigger)
+        wait_until(driver, dom_changed(mark), timeout=1.5)
 
         # Click "Opera Plaza" in the opened dropdown
         try:
@@ -177,8 +191,9 @@ class LandmarkScraper(AlamoScraper):
         elems = driver.find_elements(By.XPATH, "//*[contains(text(), 'Opera Plaza')]")
         for elem in elems:
             try:
+                mark = mark_dom(driver)
                 driver.execute_script("arguments[0].click();", elem)
-                time.sleep(2)
+                wait_until(driver, dom_changed(mark), timeout=2)
                 return
             except Exception:
                 continue
@@ -337,112 +352,29 @@ class LandmarkScraper(AlamoScraper):
 
     def _download_poster_from_src(self, poster_src: str, title: str) -> str:
         """
-        Download the poster image if it doesn't exist yet.
+        Queue the poster image for download unless a fresh copy is stored.
         Returns the base64-encoded poster key.
         """
         poster_key = base64.urlsafe_b64encode(title.lower().encode()).decode("utf-8")
         save_path = self.poster_dir / f"{poster_key}.png"
-        save_path.parent.mkdir(exist_ok=True, parents=True)
 
-        if not save_path.exists() and poster_src:
-            try:
-                data = requests.get(poster_src, timeout=10).content
-                atomic_write_bytes(save_path, data)
-            except Exception:
-                pass
+        if poster_src:
+            POSTER_QUEUE.submit(save_path, poster_src)
 
         return poster_key
 
     @staticmethod
-    def _parse_date(date_text: str, today: datetime) -> str | None:
+    def _parse_date(date_text: str, today: datetime.date) -> str | None:
         """
         Parse a date button label into YYYY-MM-DD.
         Handles formats like "Today", "Tomorrow", "Wed 4/2", "Thu Apr 3", "4/2".
         """
-        text = date_text.strip().lower()
-
-        if text == "today":
-            return today.strftime("%Y-%m-%d")
-
-        if text == "tomorrow":
-            return (today + timedelta(days=1)).strftime("%Y-%m-%d")
-
-        # Try "m/d" or "dayname m/d" pattern
-        m = re.search(r"(\d{1,2})/(\d{1,2})", text)
-        if m:
-            month, day = int(m.group(1)), int(m.group(2))
-            year = today.year
-            try:
-                candidate = datetime(year, month, day, tzinfo=today.tzinfo)
-            except ValueError:
-                return None
-            if candidate < today - timedelta(days=1):
-                year += 1
-            return f"{year}-{month:02d}-{day:02d}"
-
-        # Try "dayname Mon DD" pattern (e.g., "Wed Apr 2")
-        month_names = {
-            "jan": 1,
-            "feb": 2,
-            "mar": 3,
-            "apr": 4,
-            "may": 5,
-            "jun": 6,
-            "jul": 7,
-            "aug": 8,
-            "sep": 9,
-            "oct": 10,
-            "nov": 11,
-            "dec": 12,
-        }
-        m = re.search(r"([a-z]{3})\s+(\d{1,2})", text)
-        if m:
-            mon_str, day_str = m.group(1), m.group(2)
-            month = month_names.get(mon_str[:3])
-            if month:
-                day = int(day_str)
-                year = today.year
-                try:
-                    candidate = datetime(year, month, day, tzinfo=today.tzinfo)
-                except ValueError:
-                    return None
-                if candidate < today - timedelta(days=1):
-                    year += 1
-                return f"{year}-{month:02d}-{day:02d}"
-
-        # Try "DayAbbrev DD" pattern (e.g., "Sat 4", "Sat4", "Wed 9") — bare day number
-        day_abbrevs = {"mon", "tue", "wed", "thu", "fri", "sat", "sun"}
-        day_abbrev_to_weekday = {
-            "mon": 0,
-            "tue": 1,
-            "wed": 2,
-            "thu": 3,
-            "fri": 4,
-            "sat": 5,
-            "sun": 6,
-        }
-        m = re.match(r"([a-z]{3})\s*(\d{1,2})$", text)
-        if m and m.group(1) in day_abbrevs:
-            day = int(m.group(2))
-            expected_weekday = day_abbrev_to_weekday[m.group(1)]
-            # Find the nearest future date matching both day-of-month and weekday
-            for offset in range(0, 90):
-                candidate = today + timedelta(days=offset)
-                if candidate.day == day and candidate.weekday() == expected_weekday:
-                    return candidate.strftime("%Y-%m-%d")
-
-        return None
+        return parse_date_label(date_text, pacific_today(today))
 
     @staticmethod
     def _parse_12h_time(time_str: str) -> str | None:
         """Convert '9:30pm' or '9:30 PM' → '2130'."""
-        time_str = re.sub(r"\s+", "", time_str.strip().lower())
-        for fmt in ("%I:%M%p", "%I%p"):
-            try:
-                return datetime.strptime(time_str, fmt).strftime("%H%M")
-            except ValueError:
-                continue
-        return None
+        return parse_12h_time(time_str)
 
 
 # ------------------------------------------------------------------
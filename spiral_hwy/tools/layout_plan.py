@@ -0,0 +1,137 @@
+"""
+Layout compiler.
+
+Turns a Hydra layout (e.g. `veezi.dates_list`) into plain, immutable node
+objects once per run: locators are resolved to Selenium `By` values, meta
+flags become booleans and every action, asset getter and special converter
+is bound to the scraper method that implements it. The scraper then walks
+the plan without touching OmegaConf.
+"""
+
+import inspect
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable
+
+from omegaconf import DictConfig, ListConfig
+from selenium.webdriver.common.by import By
+
+ATTRIBUTE_ID = {
+    "id": By.ID,
+    "class_name": By.CLASS_NAME,
+    "css_selector": By.CSS_SELECTOR,
+    "tag_name": By.TAG_NAME,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Special:
+    """
+    Post-processing step for an asset value, e.g. date/time conversion.
+    `convert` is called as convert(scraper, value, special).
+    """
+
+    method: str
+    convert: Callable
+    format: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class Action:
+    """
+    Compiled layout action. `run` is called as run(scraper, element, action).
+    """
+
+    action: str
+    run: Callable
+    name: str | None = None
+    method: str | None = None
+    field: str | None = None
+    getter: Callable | None = None
+    special: Special | None = None
+    children: tuple["Node", ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Node:
+    """
+    Compiled layout element: how to locate it and what to do with it.
+    """
+
+    by: str
+    field: str
+    multiple: bool
+    optional: bool
+    actions: tuple[Action, ...]
+
+
+def _call_static(fn: Callable, _scraper, *args):
+    return fn(*args)
+
+
+def _bind(scraper_cls: type, attr: str) -> Callable:
+    """
+    Resolve `attr` on the scraper class to a function taking the scraper
+    instance first, wrapping static methods so every action has one shape.
+    Plans stay picklable, so they can be shipped to worker processes.
+    """
+    fn = getattr(scraper_cls, attr)
+    if isinstance(inspect.getattr_static(scraper_cls, attr), staticmethod):
+        return partial(_call_static, fn)
+    return fn
+
+
+def _compile_action(config: DictConfig, scraper_cls: type) -> Action:
+    name = config.action
+    if name not in scraper_cls.ACTIONS:
+        raise ValueError(f"Unknown layout action: {name}")
+
+    getter = None
+    if "method" in config:
+        getter = getattr(scraper_cls, scraper_cls.ASSET_GETTERS[config.method])
+
+    special = None
+    if "special" in config:
+        special = Special(
+            method=config.special.method,
+            convert=_bind(
+                scraper_cls, scraper_cls.ASSET_SPECIAL[config.special.method]
+            ),
+            format=config.special.get("format"),
+        )
+
+    children = ()
+    if "children" in config:
+        children = compile_layout(config.children, scraper_cls)
+
+    return Action(
+        action=name,
+        run=_bind(scraper_cls, scraper_cls.ACTIONS[name]),
+        name=config.get("name"),
+        method=config.get("method"),
+        field=config.get("field"),
+        getter=getter,
+        special=special,
+        children=children,
+    )
+
+
+def compile_layout(layout: ListConfig, scraper_cls: type) -> tuple[Node, ...]:
+    """
+    Compile a layout list into a tuple of Nodes bound to `scraper_cls`.
+    """
+    plan = []
+    for c in layout:
+        meta = set(c.get("meta", []))
+        plan.append(
+            Node(
+                by=ATTRIBUTE_ID[c.by],
+                field=c.field,
+                multiple="multiple" in meta,
+                optional="optional" in meta,
+                actions=tuple(
+                    _compile_action(a, scraper_cls) for a in c.get("actions", [])
+                ),
+            )
+        )
+    return tuple(plan)
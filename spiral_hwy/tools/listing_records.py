@@ -0,0 +1,141 @@
+"""
+Slotted listing records.
+
+A scrape holds a record per showing and per (movie, date, theater) listing.
+Showings keep their start time as integer minutes after midnight and
+availability as a flag; listings refer to their theater by id in the
+`THEATERS` table instead of each carrying the theater's strings. Records
+are built from, and serialize back to, the scraped strings, so the JSON
+written for the site keeps its shape:
+    showing: {"available": "SOLD OUT" | "", "link": ..., "time": "HHMM"}
+    listing: {"showings": [...], "theater": ..., "map": ..., "area": ...,
+              "theater_link": ...}
+"""
+
+import threading
+from dataclasses import dataclass
+
+SOLD_OUT = "SOLD OUT"
+
+
+@dataclass(frozen=True, slots=True)
+class Theater:
+    """
+    Theater details shared by all of its listings.
+    """
+
+    name: str
+    map: str
+    area: str
+    link: str
+
+
+class TheaterTable:
+    """
+    Interned theaters: each distinct `Theater` gets a small integer id.
+    Ids are only meaningful within a process.
+    """
+
+    def __init__(self):
+        self.theaters: list[Theater] = []
+        self._ids: dict[Theater, int] = {}
+        self._lock = threading.Lock()
+
+    def intern(self, theater: Theater) -> int:
+        theater_id = self._ids.get(theater)
+        if theater_id is None:
+            with self._lock:
+                theater_id = self._ids.setdefault(theater, len(self.theaters))
+                if theater_id == len(self.theaters):
+                    self.theaters.append(theater)
+        return theater_id
+
+    def __getitem__(self, theater_id: int) -> Theater:
+        return self.theaters[theater_id]
+
+
+# shared by every listing in this process
+THEATERS = TheaterTable()
+
+
+@dataclass(slots=True, init=False)
+class MovieShowing:
+    """
+    Showing event: start in minutes after midnight, sold-out flag and ticket
+    link. Built as `MovieShowing(available, link, time)` from the scraped
+    strings, with `time` as "HHMM"; any non-empty `available` means sold
+    out. `available` and `time` read them back.
+    """
+
+    minutes: int
+    sold_out: bool
+    link: str
+
+    def __init__(self, available: str = "", link: str = "", time: str = "0000"):
+        self.minutes = int(time[:2]) * 60 + int(time[2:])
+        self.sold_out = bool(available)
+        self.link = link
+
+    @property
+    def available(self) -> str:
+        return SOLD_OUT if self.sold_out else ""
+
+    @property
+    def time(self) -> str:
+        return f"{self.minutes // 60:02d}{self.minutes % 60:02d}"
+
+    def as_dict(self) -> dict:
+        return {"available": self.available, "link": self.link, "time": self.time}
+
+
+@dataclass(slots=True, init=False)
+class MovieListing:
+    """
+    Daily movie listing: showings at one theater, referenced by id in
+    `THEATERS`. Built as `MovieListing(showings, theater, map, area,
+    theater_link)`; the theater fields read back as attributes. Pickles
+    with its theater by value, since ids differ between processes.
+    """
+
+    showings: list[MovieShowing]
+    theater_id: int
+
+    def __init__(
+        self,
+        showings: list[MovieShowing],
+        theater: str,
+        map: str,
+        area: str,
+        theater_link: str,
+    ):
+        self.showings = showings
+        self.theater_id = THEATERS.intern(Theater(theater, map, area, theater_link))
+
+    @property
+    def theater(self) -> str:
+        return THEATERS[self.theater_id].name
+
+    @property
+    def map(self) -> str:
+        return THEATERS[self.theater_id].map
+
+    @property
+    def area(self) -> str:
+        return THEATERS[self.theater_id].area
+
+    @property
+    def theater_link(self) -> str:
+        return THEATERS[self.theater_id].link
+
+    def __reduce__(self):
+        t = THEATERS[self.theater_id]
+        return (MovieListing, (self.showings, t.name, t.map, t.area, t.link))
+
+    def as_dict(self) -> dict:
+        return {
+            "showings": self.showings,
+            "theater": self.theater,
+            "map": self.map,
+            "area": self.area,
+            "theater_link": self.theater_link,
+        }
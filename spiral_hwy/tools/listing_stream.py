@@ -0,0 +1,125 @@
+"""
+Streaming merge of scrape results.
+
+Each scrape task hands back its listings as
+    {date: {title: {"poster": ..., "rating": ..., "listings": [...]}}}
+Instead of deep-merging every result into one dict and sorting that once
+scraping is over, results are flattened into
+    (date, title, poster, rating, listing)
+records on a bounded queue as each task finishes. A consumer thread files
+every record into per-date state, keeping each movie's listings in order,
+so merging and sorting overlap with the tasks still running. Once all
+tasks are in, `days()` builds the sorted days the writers save.
+`WebScraper.save_json` orders a single scraper's listings the same way.
+"""
+
+import bisect
+import queue
+import threading
+from typing import Iterator
+
+from listing_records import MovieListing
+from sort_tools import sort_runs
+
+# closes the record queue
+_DONE = object()
+
+
+def listing_key(listing: MovieListing) -> tuple:
+    """
+    A movie's listings order by first showing time, then theater.
+    """
+    return (listing.showings[0].minutes, listing.theater)
+
+
+def movie_theater(movie: dict) -> str:
+    """
+    The theater of a movie's first listing, which a day's movies are
+    grouped into runs by: each theater's page lists them mostly in order.
+    """
+    return movie["listings"][0].theater
+
+
+def movie_key(movie: dict) -> tuple:
+    """
+    A day's movies order by their first listing's key, title between the two.
+    """
+    first = movie["listings"][0]
+    return (first.showings[0].minutes, movie["title"], first.theater)
+
+
+def iter_records(listings: dict) -> Iterator[tuple]:
+    """
+    (date, title, poster, rating, listing) records of one task's listings.
+    """
+    for date, movies in listings.items():
+        for title, data in movies.items():
+            poster, rating = data.get("poster", ""), data.get("rating", "")
+            for listing in data.get("listings", []):
+                yield date, title, poster, rating, listing
+
+
+class ListingStream:
+    """
+    Listings merged from scrape results on a consumer thread, by date:
+        {date: {title: {"poster": ..., "rating": ..., "listings": [...],
+                        "title": ...}}}
+    Each movie's listings are kept in `listing_key` order, equal keys in
+    arrival order; poster and rating come from a movie's first record.
+    `put` results while tasks run, then `close` before reading `days()`.
+    """
+
+    def __init__(self, queue_size: int = 1024):
+        self.dates: dict[str, dict[str, dict]] = {}
+        self._records = queue.Queue(maxsize=queue_size)
+        self._consumer = threading.Thread(
+            target=self._consume, name="listing-stream", daemon=True
+        )
+        self._consumer.start()
+
+    def put(self, listings: dict) -> None:
+        """
+        Queue the records of one task's listings.
+        """
+        for record in iter_records(listings):
+            self._records.put(record)
+
+    def close(self) -> None:
+        """
+        Wait until every queued record is filed.
+        """
+        self._records.put(_DONE)
+        self._consumer.join()
+
+    def _consume(self) -> None:
+        while (record := self._records.get()) is not _DONE:
+            try:
+                self._add(*record)
+            except Exception as e:
+                # keep consuming, or producers block on a full queue
+                print(f"dropped listing of {record[1]} on {record[0]}: {e}")
+
+    def _add(
+        self, date: str, title: str, poster: str, rating: str, listing: MovieListing
+    ) -> None:
+        movies = self.dates.setdefault(date, {})
+        movie = movies.get(title)
+        if movie is None:
+            movie = movies[title] = {
+                "poster": poster,
+                "rating": rating,
+                "listings": [],
+                "title": title,
+            }
+        bisect.insort(movie["listings"], listing, key=listing_key)
+
+    def days(self) -> Iterator[dict]:
+        """
+        The sorted days, each built as it is reached:
+            {"date": ..., "movies": [...]}
+        A day's movies are merged from per-theater runs; ISO dates order as
+        strings.
+        """
+        for date in sorted(self.dates):
+            movies = sort_runs(self.dates[date].values(), movie_key, movie_theater)
+            yield {"date": date, "movies": movies}
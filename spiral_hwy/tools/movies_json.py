@@ -0,0 +1,278 @@
+"""
+Shapes of the movies.json file read by the Eleventy build.
+
+`legacy` is the sorted listings as they are, indented by two spaces:
+    [{"date": ..., "movies": [{"poster": ..., "rating": ...,
+                               "listings": [{"showings": [...],
+                                             "theater": ..., "map": ...,
+                                             "area": ..., "theater_link": ...}],
+                               "title": ...}]}]
+
+`compact` keeps each theater and each ticket-link prefix once, writes rows
+as arrays and drops the whitespace:
+    {"version": 1,
+     "days": [[date, [[title, poster, rating,
+                       [[theater_id, [[minutes, sold_out, link_id, suffix],
+                                      ...]], ...]], ...]], ...],
+     "theaters": [[theater, map, area, theater_link], ...],
+     "links": [prefix, ...]}
+Times are minutes after midnight and `sold_out` is 0 or 1; a showing
+without a ticket link is just [minutes, sold_out]. `expand_movies` turns it
+back into the legacy shape. `write_movies` streams either shape a day at a
+time, which is why the tables come last.
+
+`write_shards` also writes each date as its own compact file (with the
+poster data its movies need) and a manifest, so the page can render the
+first days inline and fetch later ones as they are reached.
+
+Files are encoded by `json_backend` (orjson, if installed) and replace the
+previous ones atomically.
+"""
+
+import contextlib
+import hashlib
+from pathlib import Path
+from typing import Iterable
+
+from downloads import atomic_write_bytes, atomic_writer
+from json_backend import dumps, loads
+
+COMPACT_VERSION = 1
+
+
+def split_link(link: str) -> tuple[str, str]:
+    """
+    Split a ticket link after the last "/" of its path, so links to one
+    site's sessions share the prefix.
+    """
+    path = link.split("?", 1)[0]
+    cut = path.rfind("/") + 1
+    return link[:cut], link[cut:]
+
+
+class _Compactor:
+    """
+    Builds compact day rows, collecting the theater and link tables.
+    """
+
+    def __init__(self):
+        self.theaters: dict[tuple, int] = {}
+        self.links: dict[str, int] = {}
+
+    def theater_id(self, listing) -> int:
+        theater = (listing.theater, listing.map, listing.area, listing.theater_link)
+        return self.theaters.setdefault(theater, len(self.theaters))
+
+    def showing_row(self, showing) -> list:
+        if showing.link is None:
+            return [showing.minutes, int(showing.sold_out)]
+        prefix, suffix = split_link(showing.link)
+        link_id = self.links.setdefault(prefix, len(self.links))
+        return [showing.minutes, int(showing.sold_out), link_id, suffix]
+
+    def day_row(self, day: dict) -> list:
+        return [
+            day["date"],
+            [
+                [
+                    movie["title"],
+                    movie["poster"],
+                    movie["rating"],
+                    [
+                        [
+                            self.theater_id(listing),
+                            [self.showing_row(s) for s in listing.showings],
+                        ]
+                        for listing in movie["listings"]
+                    ],
+                ]
+                for movie in day["movies"]
+            ],
+        ]
+
+    def tables(self) -> dict:
+        return {
+            "theaters": [list(t) for t in self.theaters],
+            "links": list(self.links),
+        }
+
+
+def compact_movies(days: Iterable[dict]) -> dict:
+    """
+    The compact form of sorted listings.
+    """
+    compactor = _Compactor()
+    rows = [compactor.day_row(day) for day in days]
+    return {"version": COMPACT_VERSION, "days": rows, **compactor.tables()}
+
+
+def expand_movies(data: dict | list) -> list[dict]:
+    """
+    Legacy-shaped listings from movies.json data of either shape.
+    """
+    if isinstance(data, list):
+        return data
+    theaters, links = data["theaters"], data["links"]
+    return [
+        {
+            "date": date,
+            "movies": [
+                {
+                    "poster": poster,
+                    "rating": rating,
+                    "listings": [
+                        {
+                            "showings": [
+                                {
+                                    "available": "SOLD OUT" if sold_out else "",
+                                    "link": links[link[0]] + link[1] if link else None,
+                                    "time": f"{minutes // 60:02d}{minutes % 60:02d}",
+                                }
+                                for minutes, sold_out, *link in showings
+                            ],
+                            "theater": theaters[theater_id][0],
+                            "map": theaters[theater_id][1],
+                            "area": theaters[theater_id][2],
+                            "theater_link": theaters[theater_id][3],
+                        }
+                        for theater_id, showings in listings
+                    ],
+                    "title": title,
+                }
+                for title, poster, rating, listings in movies
+            ],
+        }
+        for date, movies in data["days"]
+    ]
+
+
+def read_movies(path: Path) -> list[dict]:
+    """
+    Legacy-shaped listings from the movies.json at `path`, of either shape.
+    """
+    return expand_movies(loads(path.read_bytes()))
+
+
+def write_shards(
+    days: Iterable[dict],
+    directory: Path,
+    manifest_path: Path,
+    inline_days: int,
+    posters: dict | None = None,
+    url_prefix: str = "listings",
+) -> dict:
+    """
+    Write each of the sorted `days` to `directory/<date>.json` in compact
+    form, plus `posters` entries for its movies under "posters", and remove
+    shards of dates no longer listed. Then write the manifest:
+        {"version": 1, "inline": inline_days, "dates": [date, ...],
+         "files": {date: "<url_prefix>/<date>.json?v=<digest>"},
+         "theaters": [theater, ...]}
+    Shard URLs carry a digest of their content, so browsers never reuse a
+    stale shard. Returns the manifest.
+    """
+    posters = posters or {}
+    files = {}
+    theaters = set()
+    for day in days:
+        shard = compact_movies([day])
+        shard["posters"] = {
+            movie["poster"]: posters[movie["poster"]]
+            for movie in day["movies"]
+            if movie["poster"] in posters
+        }
+        theaters.update(theater[0] for theater in shard["theaters"])
+        data = dumps(shard)
+        name = f"{day['date']}.json"
+        path = directory / name
+        if not path.exists() or path.read_bytes() != data:
+            atomic_write_bytes(path, data)
+        version = hashlib.sha256(data).hexdigest()[:12]
+        files[day["date"]] = f"{url_prefix}/{name}?v={version}"
+
+    for stale in directory.glob("*.json"):
+        if stale.stem not in files:
+            stale.unlink()
+
+    manifest = {
+        "version": COMPACT_VERSION,
+        "inline": inline_days,
+        "dates": list(files),
+        "files": files,
+        "theaters": sorted(theaters),
+    }
+    atomic_write_bytes(manifest_path, dumps(manifest))
+    return manifest
+
+
+class _LegacyWriter:
+    """
+    Streams days as the pretty-printed legacy list, byte for byte what
+    `dumps(days, indent=True)` returns.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.count = 0
+        f.write(b"[")
+
+    def day(self, day: dict) -> None:
+        data = dumps(day, indent=True)
+        # JSON strings escape newlines, so every newline is indentation
+        self.f.write(b",\n  " if self.count else b"\n  ")
+        self.f.write(data.replace(b"\n", b"\n  "))
+        self.count += 1
+
+    def close(self) -> None:
+        self.f.write(b"\n]" if self.count else b"]")
+
+
+class _CompactWriter:
+    """
+    Streams days in compact form. The theater and link tables are only
+    complete after the last day, so they follow "days" in the object.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.compactor = _Compactor()
+        self.count = 0
+        f.write(b'{"version":%d,"days":[' % COMPACT_VERSION)
+
+    def day(self, day: dict) -> None:
+        if self.count:
+            self.f.write(b",")
+        self.f.write(dumps(self.compactor.day_row(day)))
+        self.count += 1
+
+    def close(self) -> None:
+        self.f.write(b"]," + dumps(self.compactor.tables())[1:])
+
+
+WRITERS = {"legacy": _LegacyWriter, "compact": _CompactWriter}
+
+
+def write_movies(
+    days: Iterable[dict],
+    path: Path,
+    output: str = "legacy",
+    legacy_path: Path | None = None,
+) -> None:
+    """
+    Stream the sorted `days` to `path` in the `output` shape, writing each
+    day as it is reached, and in the same pass to `legacy_path` in the
+    legacy shape, if given.
+    """
+    targets = [(path, WRITERS[output])]
+    if legacy_path is not None:
+        targets.append((legacy_path, _LegacyWriter))
+    with contextlib.ExitStack() as stack:
+        writers = []
+        for target, writer in targets:
+            f = stack.enter_context(atomic_writer(target))
+            writers.append(writer(f))
+        for day in days:
+            for writer in writers:
+                writer.day(day)
+        for writer in writers:
+            writer.close()
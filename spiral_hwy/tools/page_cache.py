@@ -0,0 +1,107 @@
+"""
+Change-detection cache for scraped pages.
+
+Each theater keeps, per page (a Veezi showtimes page, an Alamo show page, a
+Landmark date), a fingerprint of the content its listings were extracted
+from and the listings themselves. While a page's fingerprint is unchanged
+and its entry is younger than the TTL, the cached listings are returned
+instead of walking the page again.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from downloads import atomic_write_bytes
+from poster_store import POSTER_STORE
+from web_scraper import pack_listings, unpack_listings
+
+PAGE_CACHE_DIR = Path(__file__).parent.parent.parent / ".cache" / "spiral_hwy" / "pages"
+
+
+def fingerprint(*parts: str) -> str:
+    """
+    SHA-256 over the given page fragments.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class PageCache:
+    """
+    Cached listings for one theater, persisted as JSON in `directory`:
+        {page: {"fingerprint": ..., "stored_at": ..., "listings": packed}}
+    with listings in `pack_listings` form. `force` ignores cached entries
+    (they are still refreshed). An entry whose posters are neither in the
+    poster store nor in `poster_dir` is a miss, so posters are fetched again.
+    """
+
+    def __init__(
+        self,
+        theater: str,
+        ttl_hours: float = 12,
+        force: bool = False,
+        poster_dir: Path | None = None,
+        directory: Path = PAGE_CACHE_DIR,
+    ):
+        self.path = directory / f"{theater}.json"
+        self.ttl = ttl_hours * 3600
+        self.force = force
+        self.poster_dir = poster_dir
+        self.entries: dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except ValueError as e:
+                print(f"ignoring unreadable page cache {self.path}: {e}")
+
+    def lookup(self, page: str, digest: str, now: float | None = None) -> dict | None:
+        """
+        Listings cached for `page` if its fingerprint is still `digest`.
+        """
+        entry = self.entries.get(page)
+        now = time.time() if now is None else now
+        if (
+            self.force
+            or entry is None
+            or entry["fingerprint"] != digest
+            or now - entry["stored_at"] >= self.ttl
+        ):
+            return None
+        listings = unpack_listings(entry["listings"])
+        if self.poster_dir is not None and not all(
+            self._poster_ready(self.poster_dir / f"{movie['poster']}.png")
+            for movies in listings.values()
+            for movie in movies.values()
+        ):
+            return None
+        return listings
+
+    @staticmethod
+    def _poster_ready(path: Path) -> bool:
+        return POSTER_STORE.link(path) or path.exists()
+
+    def store(
+        self, page: str, digest: str, listings: dict, now: float | None = None
+    ) -> None:
+        self.entries[page] = {
+            "fingerprint": digest,
+            "stored_at": time.time() if now is None else now,
+            "listings": pack_listings(listings),
+        }
+
+    def save(self, now: float | None = None) -> None:
+        """
+        Persist entries, dropping ones past the TTL.
+        """
+        now = time.time() if now is None else now
+        self.entries = {
+            page: entry
+            for page, entry in self.entries.items()
+            if now - entry["stored_at"] < self.ttl
+        }
+        atomic_write_bytes(self.path, json.dumps(self.entries).encode("utf-8"))
@@ -0,0 +1,63 @@
+"""
+Garbage collection of posters no listing references any more.
+
+Every poster ever scraped would otherwise stay in `public/posters`, deployed
+with the site, and in the poster store under `.cache`. Once `movies.json` is
+saved, files for keys it doesn't reference are removed from `public/posters`.
+The store keeps unreferenced posters for a retention window, within a size
+cap and least recently used first, so a film that returns soon is
+republished without downloading it again.
+"""
+
+from pathlib import Path
+
+from movies_json import read_movies
+from poster_store import POSTER_STORE, PosterStore, poster_key
+from poster_variants import VARIANTS_DIR, PosterVariants
+
+
+def referenced_posters(json_path: Path) -> set[str]:
+    """
+    Poster keys used by the listings saved at `json_path`.
+    """
+    days = read_movies(json_path)
+    return {
+        movie["poster"]
+        for day in days
+        for movie in day["movies"]
+        if movie.get("poster")
+    }
+
+
+def sweep_poster_dir(poster_dir: Path, referenced: set[str]) -> int:
+    """
+    Remove posters and their variants (`<key>.png`, `<key>@2x.webp`, ...)
+    for keys not in `referenced`. Returns the number of files removed.
+    """
+    removed = 0
+    for path in poster_dir.glob("[!.]*"):
+        if poster_key(path) not in referenced:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def collect_posters(
+    json_path: Path,
+    poster_dir: Path,
+    retention_days: float = 30,
+    max_mb: float = 200,
+    store: PosterStore = POSTER_STORE,
+    variants_root: Path = VARIANTS_DIR,
+) -> None:
+    """
+    Drop posters the listings at `json_path` no longer reference from
+    `poster_dir`, and evict them from `store` (and their variants) once
+    past the retention window or over the size cap.
+    """
+    referenced = referenced_posters(json_path)
+    removed = sweep_poster_dir(poster_dir, referenced) if poster_dir.exists() else 0
+    evicted = store.collect(referenced, retention_days, max_mb)
+    store.save()
+    PosterVariants(root=variants_root).forget(evicted)
+    print(f"poster gc: removed {removed} files, evicted {len(evicted)} posters")
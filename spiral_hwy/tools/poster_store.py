@@ -0,0 +1,525 @@
+"""
+Content-addressed poster store and background poster downloads.
+
+Poster bytes are stored once per SHA-256 digest under
+`.cache/spiral_hwy/posters/objects`, and a JSON manifest maps each poster key
+(`base64(title.lower())`) to its digest and each digest to its file, source
+URL, size and fetch time. Keys are resolved in memory; a known key is
+published by hard-linking its object to `<poster_dir>/<key>.png`, so titles
+sharing an image share one file and nothing is downloaded twice. Paths
+already published are remembered, so publishing them again costs nothing.
+
+Each key also records the ETag, Last-Modified and time of its last check.
+Once that is older than the TTL, the poster is revalidated with a
+conditional GET, which usually ends in a 304 with no body. Responses that
+aren't an image or are implausibly small are rejected, leaving the key to
+be fetched again on the next run.
+
+After listings are saved, `collect` marks the keys they reference as used
+and evicts the least recently used others: every key unused for longer than
+the retention window, then more until the objects fit the size cap.
+
+Scrapers enqueue (path, URL) pairs on `POSTER_QUEUE`, whose worker threads
+download new posters concurrently; the queue is drained before listings are
+saved. Attached to an event loop (the `async` executor), the queue instead
+downloads each poster as a coroutine on that loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from downloads import atomic_write_bytes, file_lock, http_get, http_get_async
+
+POSTER_STORE_DIR = (
+    Path(__file__).parent.parent.parent / ".cache" / "spiral_hwy" / "posters"
+)
+
+# error pages come back as text/html; some CDNs don't label images at all
+POSTER_CONTENT_TYPES = ("image/", "application/octet-stream", "binary/octet-stream")
+
+
+def _local_source(url: str) -> Path | None:
+    parsed = urlparse(url)
+    if parsed.scheme == "file":
+        return Path(url2pathname(parsed.path))
+    return None
+
+
+def poster_key(path: Path) -> str:
+    """
+    Poster key of a published file: `<key>.png`, `<key>@2x.webp`, ...
+    """
+    return path.name.split(".")[0].split("@")[0]
+
+
+def _check_poster(response, min_bytes: int) -> None:
+    """
+    Raise ValueError unless `response` looks like a poster image.
+    """
+    content_type = response.headers.get("Content-Type", "")
+    if not content_type.startswith(POSTER_CONTENT_TYPES):
+        raise ValueError(f"not an image: {content_type or 'no content type'}")
+    if len(response.content) < min_bytes:
+        raise ValueError(f"only {len(response.content)} bytes")
+
+
+class PosterStore:
+    """
+    Poster objects keyed by SHA-256, with a manifest persisted as JSON:
+        {"keys": {key: digest},
+         "objects": {digest: {"file": ..., "source": ..., "size": ...,
+                              "fetched": ...}},
+         "checks": {key: {"url": ..., "etag": ..., "last_modified": ...,
+                          "checked": ...}},
+         "used": {key: last_referenced}}
+    `file` is relative to the store root; `fetched`, `checked` and
+    `last_referenced` are Unix timestamps. A key checked within `ttl_hours`
+    is fresh; HTTP responses smaller than `min_bytes` are rejected. Every
+    process keeps its own store and merges into the manifest on `save`,
+    under a file lock.
+    """
+
+    def __init__(
+        self,
+        root: Path = POSTER_STORE_DIR,
+        ttl_hours: float = 168,
+        min_bytes: int = 1024,
+    ):
+        self.ttl = ttl_hours * 3600
+        self.min_bytes = min_bytes
+        self._lock = threading.Lock()
+        self.set_root(root)
+
+    def configure(self, ttl_hours: float, min_bytes: int) -> None:
+        """
+        Apply loaded config.
+        """
+        self.ttl = ttl_hours * 3600
+        self.min_bytes = min_bytes
+
+    def set_root(self, root: Path) -> None:
+        """
+        Use the store at `root`, loading its manifest. Unsaved changes to
+        the current one are dropped.
+        """
+        with self._lock:
+            self.root = root
+            self.manifest_path = root / "manifest.json"
+            manifest = self._read_manifest()
+            self.keys: dict[str, str] = manifest["keys"]
+            self.objects: dict[str, dict] = manifest["objects"]
+            self.checks: dict[str, dict] = manifest["checks"]
+            self.used: dict[str, float] = manifest["used"]
+            self._evicted: tuple[set[str], set[str]] = (set(), set())
+            self._published: dict[Path, tuple[Path, str]] = {}
+            self._dirs: set[Path] = set()
+            self._dirty = False
+
+    def _read_manifest(self) -> dict:
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            return {
+                "keys": manifest["keys"],
+                "objects": manifest["objects"],
+                "checks": manifest.get("checks", {}),
+                "used": manifest.get("used", {}),
+            }
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"ignoring unreadable poster manifest {self.manifest_path}: {e}")
+        return {"keys": {}, "objects": {}, "checks": {}, "used": {}}
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.png"
+
+    def _place(self, source: Path, path: Path) -> None:
+        """
+        Hard-link `source` to `path`, atomically replacing any file there
+        (a revalidated poster can change). Copies across file systems.
+        """
+        if path.parent not in self._dirs:
+            path.parent.mkdir(exist_ok=True, parents=True)
+            self._dirs.add(path.parent)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+        try:
+            os.link(source, tmp)
+            os.replace(tmp, path)
+        except OSError:
+            atomic_write_bytes(path, source.read_bytes())
+        finally:
+            # renaming onto another link to the same file leaves `tmp` behind
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+
+    def publish(self, source: Path, path: Path, version: str = "") -> None:
+        """
+        Hard-link `source`, a store object or a file derived from one, at
+        `path`, unless this store already published that `version` of it
+        there. `version` tells apart contents written to the same source
+        path, such as variants encoded with other settings.
+        """
+        if self._published.get(path) != (source, version):
+            self._place(source, path)
+            self._published[path] = (source, version)
+
+    def forget_published(self, paths: Iterable[Path]) -> None:
+        """
+        Publish `paths` again next time, e.g. once their source is rewritten.
+        """
+        for path in paths:
+            self._published.pop(path, None)
+
+    def _publish(self, path: Path, digest: str) -> None:
+        self.publish(self.object_path(digest), path)
+
+    def link(self, path: Path) -> bool:
+        """
+        Publish the stored poster for `path`'s key at `path`.
+        Returns False, without touching the disk, for an unknown key.
+        """
+        digest = self.keys.get(path.stem)
+        if digest is None:
+            return False
+        self._publish(path, digest)
+        return True
+
+    def is_fresh(
+        self, key: str, url: str | None = None, now: float | None = None
+    ) -> bool:
+        """
+        Whether `key` was checked within the TTL (against `url`, if given).
+        """
+        check = self.checks.get(key)
+        now = time.time() if now is None else now
+        return (
+            check is not None
+            and key in self.keys
+            and (url is None or check["url"] == url)
+            and now - check["checked"] < self.ttl
+        )
+
+    def _conditional_headers(self, key: str, url: str) -> dict:
+        with self._lock:
+            check = self.checks.get(key)
+            if check is None or check["url"] != url or key not in self.keys:
+                return {}
+            headers = {}
+            if check.get("etag"):
+                headers["If-None-Match"] = check["etag"]
+            if check.get("last_modified"):
+                headers["If-Modified-Since"] = check["last_modified"]
+            return headers
+
+    def put(self, path: Path, url: str) -> str:
+        """
+        Fetch `url` (conditionally, if `path`'s key was fetched from it
+        before), store it under its digest, map the key to it and publish it
+        at `path`. `file://` sources are hard-linked into the store rather
+        than rewritten. Returns the digest.
+        """
+        local = _local_source(url)
+        if local is not None:
+            return self._add(path, url, local.read_bytes(), local=local)
+        response = http_get(url, headers=self._conditional_headers(path.stem, url))
+        return self._add_response(path, url, response)
+
+    async def put_async(self, path: Path, url: str) -> str:
+        """
+        `put` for coroutines inside `downloads.async_session`: the HTTP
+        fetch runs on the loop.
+        """
+        if _local_source(url) is not None:
+            return self.put(path, url)
+        response = await http_get_async(
+            url, headers=self._conditional_headers(path.stem, url)
+        )
+        return self._add_response(path, url, response)
+
+    def _add_response(self, path: Path, url: str, response) -> str:
+        """
+        Store a poster response (requests' or `AsyncResponse`): a 304 only
+        renews the key's check, anything else must look like a poster.
+        """
+        key = path.stem
+        if response.status_code == 304:
+            with self._lock:
+                self.checks[key]["checked"] = time.time()
+                self._dirty = True
+            self.link(path)
+            return self.keys[key]
+        _check_poster(response, self.min_bytes)
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        return self._add(path, url, response.content, validators)
+
+    def _add(
+        self,
+        path: Path,
+        url: str,
+        data: bytes,
+        validators: dict | None = None,
+        local: Path | None = None,
+    ) -> str:
+        """
+        Store `data`, fetched from `url`, under its digest and publish it at
+        `path`. A `local` source file is hard-linked rather than rewritten.
+        """
+        key = path.stem
+        digest = hashlib.sha256(data).hexdigest()
+        obj = self.object_path(digest)
+
+        with self._lock:
+            known = digest in self.objects
+        if not known:
+            if local is not None:
+                self._place(local, obj)
+            else:
+                atomic_write_bytes(obj, data)
+
+        with self._lock:
+            self.objects.setdefault(
+                digest,
+                {
+                    "file": obj.relative_to(self.root).as_posix(),
+                    "source": url,
+                    "size": len(data),
+                    "fetched": time.time(),
+                },
+            )
+            self.keys[key] = digest
+            self.checks[key] = {
+                "url": url,
+                **(validators or {}),
+                "checked": time.time(),
+            }
+            self._dirty = True
+        self._publish(path, digest)
+        return digest
+
+    def collect(
+        self,
+        referenced: set[str],
+        retention_days: float,
+        max_mb: float,
+        now: float | None = None,
+    ) -> set[str]:
+        """
+        Mark `referenced` keys used, then evict unreferenced keys unused for
+        `retention_days` and, least recently used first, more of them until
+        the objects total at most `max_mb`. Objects no key maps to any more
+        are deleted. Returns the deleted digests.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            for key in self.keys:
+                # keys from before GC start aging now
+                if key in referenced or key not in self.used:
+                    self.used[key] = now
+            lru = sorted((self.used[k], k) for k in self.keys if k not in referenced)
+            refs: dict[str, int] = {}
+            for digest in self.keys.values():
+                refs[digest] = refs.get(digest, 0) + 1
+            size = sum(self.objects[d]["size"] for d in refs if d in self.objects)
+            cutoff = now - retention_days * 86400
+            evicted = set()
+            for used, key in lru:
+                if used >= cutoff and size <= max_mb * 1024 * 1024:
+                    break
+                evicted.add(key)
+                digest = self.keys[key]
+                refs[digest] -= 1
+                if refs[digest] == 0 and digest in self.objects:
+                    size -= self.objects[digest]["size"]
+
+            for key in evicted:
+                del self.keys[key]
+                self.checks.pop(key, None)
+                self.used.pop(key, None)
+            orphans = set(self.objects) - set(self.keys.values())
+            for digest in orphans:
+                try:
+                    (self.root / self.objects.pop(digest)["file"]).unlink()
+                except FileNotFoundError:
+                    pass
+            self._published = {
+                path: published
+                for path, published in self._published.items()
+                if poster_key(path) not in evicted
+            }
+            self._evicted[0].update(evicted)
+            self._evicted[1].update(orphans)
+            self._dirty = True
+        return orphans
+
+    def save(self) -> None:
+        """
+        Write the manifest, merged with entries other processes saved
+        since it was loaded. The merge holds a lock on the manifest, so
+        process workers saving at once don't drop each other's entries.
+        """
+        with self._lock, file_lock(self.root / "manifest.lock"):
+            if not self._dirty:
+                return
+            manifest = self._read_manifest()
+            manifest["keys"].update(self.keys)
+            manifest["objects"].update(self.objects)
+            manifest["checks"].update(self.checks)
+            manifest["used"].update(self.used)
+            keys, digests = self._evicted
+            for key in keys:
+                for section in ("keys", "checks", "used"):
+                    manifest[section].pop(key, None)
+            for digest in digests:
+                manifest["objects"].pop(digest, None)
+            self._evicted = (set(), set())
+            self.keys, self.objects = manifest["keys"], manifest["objects"]
+            self.checks, self.used = manifest["checks"], manifest["used"]
+            atomic_write_bytes(
+                self.manifest_path, json.dumps(manifest, indent=2).encode("utf-8")
+            )
+            self._dirty = False
+
+
+class PosterQueue:
+    """
+    Bounded queue of poster downloads into `store`, served by `workers`
+    daemon threads.
+
+    `submit` blocks only while `size` downloads are waiting, so extraction
+    keeps going while posters download. A path already queued is not queued
+    again. `drain` waits for every queued download to finish.
+
+    Between `attach(loop)` and `drain_async`, downloads run as coroutines
+    on `loop` instead, at most `workers` at once; `submit` may be called
+    from the loop or from any thread.
+    """
+
+    def __init__(self, store: PosterStore, workers: int = 8, size: int = 64):
+        self.store = store
+        self.workers = workers
+        self.size = size
+        self._queue: queue.Queue | None = None
+        self._pending: set[Path] = set()
+        self._failed: list[tuple[Path, str, Exception]] = []
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._futures: list = []
+
+    def configure(self, workers: int, size: int) -> None:
+        """
+        Apply loaded config; takes effect before the first download.
+        """
+        self.workers = workers
+        self.size = size
+
+    def _start(self) -> queue.Queue:
+        with self._lock:
+            if self._queue is None:
+                self._queue = queue.Queue(maxsize=self.size)
+                for i in range(self.workers):
+                    threading.Thread(
+                        target=self._work, name=f"poster-{i}", daemon=True
+                    ).start()
+            return self._queue
+
+    def submit(self, path: Path, url: str) -> None:
+        """
+        Publish the poster for `path`'s key if it is stored, and unless it
+        is still fresh, download or revalidate `url` in the background
+        unless it is already queued.
+        """
+        if self.store.link(path) and self.store.is_fresh(path.stem, url):
+            return
+        with self._lock:
+            if path in self._pending:
+                return
+            self._pending.add(path)
+            loop = self._loop
+            if loop is not None:
+                future = asyncio.run_coroutine_threadsafe(
+                    self._fetch_async(path, url), loop
+                )
+                self._futures.append(future)
+                return
+        self._start().put((path, url))
+
+    def _work(self) -> None:
+        while True:
+            path, url = self._queue.get()
+            try:
+                self.store.put(path, url)
+            except Exception as e:
+                with self._lock:
+                    self._failed.append((path, url, e))
+            finally:
+                with self._lock:
+                    self._pending.discard(path)
+                self._queue.task_done()
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Download on `loop`, inside its `downloads.async_session`, until
+        `drain_async`.
+        """
+        with self._lock:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.workers)
+
+    async def _fetch_async(self, path: Path, url: str) -> None:
+        async with self._slots:
+            try:
+                await self.store.put_async(path, url)
+            except Exception as e:
+                with self._lock:
+                    self._failed.append((path, url, e))
+            finally:
+                with self._lock:
+                    self._pending.discard(path)
+
+    async def drain_async(self) -> list[tuple[Path, str, Exception]]:
+        """
+        On the attached loop: wait for its downloads, detach from it and
+        `drain`.
+        """
+        while True:
+            with self._lock:
+                futures, self._futures = self._futures, []
+                if not futures:
+                    self._loop = None
+                    break
+            await asyncio.gather(*map(asyncio.wrap_future, futures))
+        return self.drain()
+
+    def drain(self) -> list[tuple[Path, str, Exception]]:
+        """
+        Wait for all queued downloads and save the store's manifest.
+        Returns (and logs) the failures since the last drain.
+        """
+        if self._queue is not None:
+            self._queue.join()
+        self.store.save()
+        with self._lock:
+            failed, self._failed = self._failed, []
+        for path, url, e in failed:
+            print(f"poster download failed {path.name} ({url}): {e}")
+        return failed
+
+
+# shared by every scraper in this process
+POSTER_STORE = PosterStore()
+POSTER_QUEUE = PosterQueue(POSTER_STORE)
@@ -0,0 +1,321 @@
+"""
+Resized WebP (and optionally AVIF) variants and metadata of the scraped
+posters.
+
+The site shows posters 120px wide, but `public/posters/<key>.png` holds
+whatever the theater served, often a full-size JPEG. After listings are
+saved, every poster is encoded at 1x and 2x display width, on a process
+pool since encoding is CPU-bound. Variants are stored once per source
+digest under `.cache/spiral_hwy/posters/variants` and hard-linked next to
+the PNG as `<key>.webp`, `<key>@2x.webp`, ... through the poster store's
+publishing, so only new or changed posters are ever encoded. The manifest
+is trusted without checking that each variant exists; one found missing
+when it is published is encoded again.
+
+The same pass records each poster's intrinsic size, dominant colour and a
+tiny inline placeholder image. `_data/posters.json` hands these and the
+variants that exist for each key to the template, which paints the
+placeholder while the poster loads. Pillow is optional: without it nothing
+is built, and the page keeps serving the PNGs.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from downloads import atomic_write_bytes
+from poster_store import POSTER_STORE, POSTER_STORE_DIR
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+VARIANTS_DIR = POSTER_STORE_DIR / "variants"
+
+# Pillow format names by file extension
+FORMATS = {"webp": "WEBP", "avif": "AVIF", "png": "PNG"}
+
+
+def pillow_formats(formats: list[str]) -> list[str]:
+    """
+    The subset of `formats` the installed Pillow can encode.
+    """
+    if Image is None:
+        return []
+    Image.init()
+    return [f for f in formats if FORMATS[f] in Image.SAVE]
+
+
+def variant_name(key: str, density: int, fmt: str) -> str:
+    """
+    Published file name of a variant: `<key>.webp`, `<key>@2x.webp`, ...
+    """
+    suffix = "" if density == 1 else f"@{density}x"
+    return f"{key}{suffix}.{fmt}"
+
+
+def _dominant_color(im) -> str:
+    """
+    The most common of the 8 colours `im` quantizes to, as #rrggbb.
+    """
+    small = im.convert("RGB").resize((64, 64), Image.BOX).quantize(colors=8)
+    _count, index = max(small.getcolors())
+    r, g, b = small.getpalette()[index * 3 : index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _placeholder(im, width: int, fmt: str) -> str:
+    """
+    `im` shrunk to `width` pixels wide, as a data URI.
+    """
+    height = max(1, round(im.height * width / im.width))
+    out = io.BytesIO()
+    im.resize((width, height), Image.BOX).save(out, FORMATS[fmt], quality=50)
+    return f"data:image/{fmt};base64,{base64.b64encode(out.getvalue()).decode()}"
+
+
+def _encode(
+    source: str,
+    targets: list[tuple[str, int, str]],
+    quality: int,
+    placeholder: tuple[int, str],
+) -> dict:
+    """
+    Write each (path, width, format) variant of the image at `source` and
+    return its metadata. Images narrower than a target width are not
+    upscaled. `placeholder` is the (width, format) of the inline
+    placeholder. Runs in a worker process.
+    """
+    with Image.open(source) as im:
+        im.load()
+        if im.mode not in ("RGB", "RGBA"):
+            alpha = "A" in im.getbands() or "transparency" in im.info
+            im = im.convert("RGBA" if alpha else "RGB")
+        for path, width, fmt in targets:
+            resized = im
+            if width < im.width:
+                height = max(1, round(im.height * width / im.width))
+                resized = im.resize((width, height), Image.LANCZOS)
+            out = io.BytesIO()
+            resized.save(out, FORMATS[fmt], quality=quality)
+            atomic_write_bytes(Path(path), out.getvalue())
+        return {
+            "width": im.width,
+            "height": im.height,
+            "color": _dominant_color(im),
+            "placeholder": _placeholder(im, *placeholder),
+        }
+
+
+class PosterVariants:
+    """
+    Encoded variants and metadata by source digest, with a manifest
+    persisted as JSON:
+        {digest: {"spec": ..., "files": {name_suffix: file},
+                  "width": ..., "height": ..., "color": "#rrggbb",
+                  "placeholder": "data:..."}}
+    `spec` records the settings a digest was encoded with; a digest whose
+    spec differs from the current one, or whose files have gone, is encoded
+    again. `file` is relative
+    to `root`; `width` and `height` are the source's.
+    """
+
+    def __init__(
+        self,
+        width: int = 120,
+        densities: list[int] | tuple[int, ...] = (1, 2),
+        formats: list[str] | tuple[str, ...] = ("webp",),
+        quality: int = 80,
+        placeholder_width: int = 12,
+        workers: int = 4,
+        root: Path = VARIANTS_DIR,
+    ):
+        self.width = width
+        self.densities = list(densities)
+        self.formats = pillow_formats(list(formats))
+        self.quality = quality
+        self.placeholder = (
+            placeholder_width,
+            "webp" if pillow_formats(["webp"]) else "png",
+        )
+        self.workers = workers
+        self.root = root
+        self.manifest_path = root / "manifest.json"
+        self.spec = (
+            f"w{width} d{self.densities} f{self.formats} q{quality}"
+            f" p{self.placeholder}"
+        )
+        self.entries: dict[str, dict] = {}
+        if self.manifest_path.exists():
+            try:
+                self.entries = json.loads(
+                    self.manifest_path.read_text(encoding="utf-8")
+                )
+            except ValueError as e:
+                print(f"ignoring unreadable variant manifest {self.manifest_path}: {e}")
+
+    def _object(self, digest: str, density: int, fmt: str) -> Path:
+        return self.root / digest[:2] / variant_name(digest, density, fmt)
+
+    def _ready(self, digest: str) -> bool:
+        entry = self.entries.get(digest)
+        return entry is not None and entry["spec"] == self.spec
+
+    @staticmethod
+    def _digest(poster: Path) -> str:
+        digest = POSTER_STORE.keys.get(poster.stem)
+        if digest is None:
+            digest = hashlib.sha256(poster.read_bytes()).hexdigest()
+        return digest
+
+    def build(self, poster_dir: Path) -> dict[str, dict]:
+        """
+        Encode the variants missing for the posters in `poster_dir`, publish
+        every poster's variants next to it and return the template data:
+            {key: {"width": ..., "height": ..., "color": ...,
+                   "placeholder": ...,
+                   "sources": [{"type": ..., "srcset": ...}, ...]}}
+        """
+        if Image is None:
+            print("poster variants skipped: Pillow not found")
+            return {}
+
+        digests = {p.stem: (p, self._digest(p)) for p in poster_dir.glob("*.png")}
+        failed = set()
+        # a second pass encodes variants found missing while publishing
+        for _ in range(2):
+            jobs = {}
+            for poster, digest in digests.values():
+                if digest in jobs or digest in failed or self._ready(digest):
+                    continue
+                jobs[digest] = (
+                    str(poster),
+                    [
+                        (str(self._object(digest, d, f)), self.width * d, f)
+                        for f in self.formats
+                        for d in self.densities
+                    ],
+                    self.quality,
+                    self.placeholder,
+                )
+            failed |= self._encode_all(jobs)
+            missing = self._publish_all(digests, failed, poster_dir)
+            if not missing:
+                break
+            # re-encoding replaces the files other keys were linked to
+            POSTER_STORE.forget_published(
+                poster_dir / f"{key}{suffix}"
+                for key, (_poster, digest) in digests.items()
+                if digest in missing
+                for suffix in self.entries[digest]["files"]
+            )
+            for digest in missing:
+                del self.entries[digest]
+
+        data = {}
+        for key, (poster, digest) in sorted(digests.items()):
+            if digest in failed or digest not in self.entries:
+                continue
+            entry = self.entries[digest]
+            data[key] = {
+                field: entry[field]
+                for field in ("width", "height", "color", "placeholder")
+            }
+            data[key]["sources"] = [
+                {
+                    "type": f"image/{f}",
+                    "srcset": ", ".join(
+                        f"posters/{variant_name(key, d, f)} {d}x"
+                        for d in self.densities
+                    ),
+                }
+                for f in self.formats
+            ]
+        return data
+
+    def _publish_all(
+        self, digests: dict[str, tuple[Path, str]], failed: set[str], poster_dir: Path
+    ) -> set[str]:
+        """
+        Publish the variants of every key in `digests` next to its poster.
+        Returns the digests whose variant files have gone from the store.
+        """
+        missing = set()
+        for key, (_poster, digest) in digests.items():
+            if digest in failed or digest in missing or digest not in self.entries:
+                continue
+            for suffix, file in self.entries[digest]["files"].items():
+                try:
+                    POSTER_STORE.publish(
+                        self.root / file, poster_dir / f"{key}{suffix}", self.spec
+                    )
+                except FileNotFoundError:
+                    missing.add(digest)
+                    break
+        return missing
+
+    def _encode_all(self, jobs: dict) -> set[str]:
+        """
+        Run `jobs` ({digest: _encode args}) on a process pool and record the
+        ones that succeed. Returns the digests that failed.
+        """
+        failed = set()
+        if not jobs:
+            return failed
+        print(f"encoding variants of {len(jobs)} posters")
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(jobs)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as ex:
+            futures = {ex.submit(_encode, *args): d for d, args in jobs.items()}
+            for future, digest in futures.items():
+                try:
+                    meta = future.result()
+                except Exception as e:
+                    print(f"poster variants failed {jobs[digest][0]}: {e}")
+                    failed.add(digest)
+                    continue
+                self.entries[digest] = {
+                    "spec": self.spec,
+                    "files": {
+                        variant_name("", d, f): self._object(digest, d, f)
+                        .relative_to(self.root)
+                        .as_posix()
+                        for f in self.formats
+                        for d in self.densities
+                    },
+                    **meta,
+                }
+        self._save()
+        return failed
+
+    def forget(self, digests: set[str]) -> None:
+        """
+        Delete the variants of `digests`, e.g. posters evicted from the store.
+        """
+        forgotten = [self.entries.pop(d) for d in digests if d in self.entries]
+        for entry in forgotten:
+            for file in entry["files"].values():
+                (self.root / file).unlink(missing_ok=True)
+        if forgotten:
+            self._save()
+
+    def _save(self) -> None:
+        atomic_write_bytes(
+            self.manifest_path, json.dumps(self.entries, indent=2).encode("utf-8")
+        )
+
+
+def build_poster_variants(poster_dir: Path, data_path: Path, **config) -> dict:
+    """
+    Build and publish variants for `poster_dir` and write the template data
+    to `data_path`. Returns the data.
+    """
+    data = PosterVariants(**config).build(poster_dir)
+    atomic_write_bytes(data_path, json.dumps(data, indent=2).encode("utf-8"))
+    return data
@@ -0,0 +1,189 @@
+"""
+Per-host politeness: concurrency caps and request rates.
+
+Tasks are dispatched so that no host has more than its `concurrency` tasks
+in flight, while tasks for independent hosts fill the remaining workers.
+Page loads (`fetch_document`, pooled `driver.get`) call `throttle`, which
+spaces requests to each host with a token bucket; coroutines await
+`throttle_async`, which shares the buckets but sleeps on the event loop.
+"""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass
+from typing import Callable
+from urllib.parse import urlparse
+
+
+@dataclass(frozen=True)
+class HostLimit:
+    """
+    Politeness settings for one host.
+    """
+
+    concurrency: int = 2
+    rate: float = 2.0  # requests per second
+    burst: int = 4
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, holding at most `burst`.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """
+        Take one token if there is one and return 0, else return the
+        seconds until there will be.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._stamp) * self.rate
+            )
+            self._stamp = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """
+        Take one token, sleeping until one is available.
+        """
+        while delay := self._take():
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """
+        Take one token, sleeping on the event loop until one is available.
+        """
+        while delay := self._take():
+            await asyncio.sleep(delay)
+
+
+class HostLimits:
+    """
+    Registry of per-host limits and their token buckets.
+    """
+
+    def __init__(self):
+        self.default = HostLimit()
+        self.limits: dict[str, HostLimit] = {}
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, config) -> None:
+        """
+        Load the `hosts` config section: a `default` limit and per-host `limits`.
+        Raises ValueError for a concurrency below 1, which would leave that
+        host's tasks waiting forever.
+        """
+        default = HostLimit(**config.get("default", {}))
+        limits = {
+            c["host"]: HostLimit(**{k: v for k, v in c.items() if k != "host"})
+            for c in config.get("limits", [])
+        }
+        for host, limit in [("default", default), *limits.items()]:
+            if limit.concurrency < 1:
+                raise ValueError(
+                    f"hosts: {host} concurrency must be at least 1, "
+                    f"got {limit.concurrency}"
+                )
+        self.default = default
+        self.limits = limits
+        with self._lock:
+            self._buckets.clear()
+
+    def get(self, host: str) -> HostLimit:
+        return self.limits.get(host, self.default)
+
+    def throttle(self, url: str) -> None:
+        """
+        Wait for a request slot on the URL's host. Local files are not throttled.
+        """
+        bucket = self._bucket(url)
+        if bucket is not None:
+            bucket.acquire()
+
+    async def throttle_async(self, url: str) -> None:
+        """
+        `throttle` for coroutines.
+        """
+        bucket = self._bucket(url)
+        if bucket is not None:
+            await bucket.acquire_async()
+
+    def _bucket(self, url: str) -> TokenBucket | None:
+        host = host_of(url)
+        if not host:
+            return None
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                limit = self.get(host)
+                bucket = self._buckets[host] = TokenBucket(limit.rate, limit.burst)
+        return bucket
+
+
+# shared by every fetch in this process
+HOST_LIMITS = HostLimits()
+
+
+def host_of(url: str) -> str:
+    """
+    Network location of a URL; empty for local paths and file:// URLs.
+    """
+    return urlparse(url).netloc.lower()
+
+
+def throttle(url: str) -> None:
+    HOST_LIMITS.throttle(url)
+
+
+async def throttle_async(url: str) -> None:
+    await HOST_LIMITS.throttle_async(url)
+
+
+def dispatch(
+    executor: Executor,
+    tasks: list,
+    workers: int,
+    submit: Callable[[Executor, Callable, tuple], Future],
+    on_done: Callable[[str, Future], None],
+) -> None:
+    """
+    Submit `(name, host, fn, args)` tasks with at most `workers` in flight
+    overall and each host's `concurrency` in flight per host, calling
+    `on_done(name, future)` as tasks finish.
+    """
+    pending = list(tasks)
+    running: dict[Future, tuple] = {}
+    in_flight: Counter = Counter()
+
+    while pending or running:
+        for task in list(pending):
+            if len(running) >= workers:
+                break
+            name, host, fn, args = task
+            if in_flight[host] >= HOST_LIMITS.get(host).concurrency:
+                continue
+            pending.remove(task)
+            running[submit(executor, fn, args)] = task
+            in_flight[host] += 1
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for fut in done:
+            name, host, _fn, _args = running.pop(fut)
+            in_flight[host] -= 1
+            on_done(name, fut)
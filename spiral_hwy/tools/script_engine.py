@@ -0,0 +1,151 @@
+"""
+Single-round-trip extraction for config-driven layouts.
+
+A compiled layout plan is converted to a JSON spec and walked inside the
+browser by one `execute_script` call, which returns every value the plan's
+actions will read. The plan is then replayed locally over the captured tree,
+so actions (`convert_date`, `create_showing`, `save_poster`, ...) run exactly
+as they do against live elements, without per-element WebDriver requests.
+"""
+
+from layout_plan import Node
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.chrome.webdriver import WebDriver
+
+WALK_LAYOUT_JS = r"""
+var spec = arguments[0];
+
+function locate(root, node) {
+    var sel = node.field;
+    if (node.by === 'id') sel = '#' + CSS.escape(node.field);
+    else if (node.by === 'class name') sel = '.' + CSS.escape(node.field.trim());
+    if (node.multiple) return Array.prototype.slice.call(root.querySelectorAll(sel));
+    var el = root.querySelector(sel);
+    return el ? [el] : null;
+}
+
+// Same results as WebElement.get_attribute for the names layouts use.
+function attribute(el, name) {
+    if (name === 'href' || name === 'src') {
+        return el.hasAttribute(name) ? el[name] : null;
+    }
+    if (name in el && typeof el[name] === 'string' && !el.hasAttribute(name)) {
+        return el[name];
+    }
+    return el.getAttribute(name);
+}
+
+function walk(root, nodes) {
+    return nodes.map(function (node) {
+        var elements = locate(root, node);
+        if (elements === null) return null;
+        return elements.map(function (el) {
+            var record = {attrs: {}, text: null, children: []};
+            node.actions.forEach(function (a) {
+                if (a.kind === 'click') el.click();
+                else if (a.kind === 'attr') record.attrs[a.name] = attribute(el, a.name);
+                else if (a.kind === 'text') record.text = el.innerText;
+                else if (a.kind === 'unpack') record.children.push(walk(el, a.children));
+            });
+            return record;
+        });
+    });
+}
+
+return walk(document, spec);
+"""
+
+
+class CapturedElement:
+    """
+    Element values captured in the browser, replayed through the
+    WebElement calls the layout interpreter makes.
+    """
+
+    def __init__(self, record: dict, children: dict):
+        self.attrs: dict = record.get("attrs", {})
+        self._text: str | None = record.get("text")
+        self.children = children
+
+    @property
+    def text(self) -> str:
+        return self._text or ""
+
+    def click(self) -> None:
+        """
+        No-op: clicks already ran in the browser, in layout order.
+        """
+
+    def get_attribute(self, name: str) -> str | None:
+        return self.attrs.get(name)
+
+    def find_element(self, by: str, value: str) -> "CapturedElement":
+        found = self.children.get((by, value))
+        if not found:
+            raise NoSuchElementException(f"Not captured: {by}={value!r}")
+        return found[0]
+
+    def find_elements(self, by: str, value: str) -> list["CapturedElement"]:
+        return self.children.get((by, value)) or []
+
+
+def layout_spec(plan: tuple[Node, ...]) -> list[dict]:
+    """
+    Describe what the browser must read (or click) for each plan node.
+    """
+    spec = []
+    for node in plan:
+        actions = []
+        for a in node.actions:
+            if a.action == "click":
+                actions.append({"kind": "click"})
+            elif a.action == "unpack":
+                actions.append({"kind": "unpack", "children": layout_spec(a.children)})
+            if a.method == "get_attribute":
+                actions.append({"kind": "attr", "name": a.field})
+            elif a.method == "text_member":
+                actions.append({"kind": "text"})
+            if a.action == "save_poster":
+                actions.append({"kind": "attr", "name": "src"})
+        spec.append(
+            {
+                "by": node.by,
+                "field": node.field,
+                "multiple": node.multiple,
+                "actions": actions,
+            }
+        )
+    return spec
+
+
+def _children(plan: tuple[Node, ...], results: list) -> dict:
+    """
+    Key each node's captured elements by its locator, as find_element(s) sees it.
+    """
+    children = {}
+    for node, found in zip(plan, results):
+        if found is None:
+            continue
+        unpacks = [a.children for a in node.actions if a.action == "unpack"]
+        elements = []
+        for record in found:
+            grandchildren = {}
+            for child_plan, child_results in zip(unpacks, record["children"]):
+                grandchildren.update(_children(child_plan, child_results))
+            elements.append(CapturedElement(record, grandchildren))
+        children[(node.by, node.field)] = elements
+    return children
+
+
+def replay_root(plan: tuple[Node, ...], results: list) -> CapturedElement:
+    """
+    Wrap raw `WALK_LAYOUT_JS` output as a root element for `WebScraper.scrape`.
+    """
+    return CapturedElement({}, _children(plan, results))
+
+
+def capture_layout(driver: WebDriver, plan: tuple[Node, ...]) -> CapturedElement:
+    """
+    Walk the whole layout in the browser with a single `execute_script`.
+    """
+    return replay_root(plan, driver.execute_script(WALK_LAYOUT_JS, layout_spec(plan)))
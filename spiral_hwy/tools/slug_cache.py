@@ -0,0 +1,88 @@
+"""
+Persistent cache of Alamo show slugs.
+
+Slug discovery clicks every WHEN date on the Alamo landing page, yet the
+shows playing on a date rarely change between runs. The cache records, for
+each slug, the run dates it was first and last seen on and the show dates
+it was listed under, plus when each show date was last scanned. Dates
+scanned within the TTL reuse their cached slugs instead of being clicked.
+"""
+
+import json
+import time
+from pathlib import Path
+
+from downloads import atomic_write_bytes
+
+SLUG_CACHE_PATH = (
+    Path(__file__).parent.parent.parent / ".cache" / "spiral_hwy" / "alamo_slugs.json"
+)
+
+
+class SlugCache:
+    """
+    Slugs by show date, persisted as JSON:
+        {"scans": {date: scanned_at},
+         "slugs": {slug: {"first_seen": date, "last_seen": date,
+                          "dates": [date, ...]}}}
+    Dates are YYYY-MM-DD; `scanned_at` is a Unix timestamp.
+    """
+
+    def __init__(self, path: Path = SLUG_CACHE_PATH, ttl_hours: float = 24):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.scans: dict[str, float] = {}
+        self.slugs: dict[str, dict] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                self.scans = data.get("scans", {})
+                self.slugs = data.get("slugs", {})
+            except (ValueError, AttributeError) as e:
+                print(f"ignoring unreadable slug cache {path}: {e}")
+
+    def is_fresh(self, date: str, now: float | None = None) -> bool:
+        """
+        Whether `date` was scanned within the TTL.
+        """
+        now = time.time() if now is None else now
+        return now - self.scans.get(date, float("-inf")) < self.ttl
+
+    def slugs_on(self, date: str) -> list[str]:
+        """
+        Cached slugs listed under `date`, in first-seen order.
+        """
+        return [slug for slug, entry in self.slugs.items() if date in entry["dates"]]
+
+    def record(
+        self, date: str, slugs: list[str], today: str, now: float | None = None
+    ) -> None:
+        """
+        Store the result of scanning `date` on run date `today`, replacing
+        what was cached for that date.
+        """
+        self.scans[date] = time.time() if now is None else now
+        for slug, entry in self.slugs.items():
+            if slug not in slugs and date in entry["dates"]:
+                entry["dates"].remove(date)
+        for slug in slugs:
+            entry = self.slugs.setdefault(
+                slug, {"first_seen": today, "last_seen": today, "dates": []}
+            )
+            entry["last_seen"] = today
+            if date not in entry["dates"]:
+                entry["dates"].append(date)
+                entry["dates"].sort()
+
+    def prune(self, today: str) -> None:
+        """
+        Forget show dates before `today` and slugs left without a date.
+        """
+        self.scans = {d: t for d, t in self.scans.items() if d >= today}
+        for entry in self.slugs.values():
+            entry["dates"] = [d for d in entry["dates"] if d >= today]
+        self.slugs = {s: e for s, e in self.slugs.items() if e["dates"]}
+
+    def save(self) -> None:
+        data = {"scans": self.scans, "slugs": self.slugs}
+        atomic_write_bytes(self.path, json.dumps(data, indent=2).encode("utf-8"))
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of listing sorts: `WebScraper._sort_showings_by_times`, which
+orders days as `ListingStream.days()` does, against the recursive quicksort
+it replaced.
+
+Listings are synthetic: `--days` dates of `--movies` films at `--theaters`
+theaters, either already in time order (quicksort's worst case, as scraped
+pages usually are) or shuffled.
+
+    python ./spiral_hwy/tools/sort_benchmark.py [--days 30] [--movies 200]
+"""
+
+import argparse
+import copy
+import random
+import sys
+import timeit
+
+from sort_tools import quicksort
+from web_scraper import MovieListing, MovieShowing, WebScraper
+
+
+def make_listings(days: int, movies: int, theaters: int, ordered: bool) -> dict:
+    """
+    {date: {title: {"poster", "rating", "listings"}}} as scrapers produce.
+    """
+    rng = random.Random(0)
+    listings = {}
+    for day in range(days):
+        titles = {}
+        for m in range(movies):
+            starts = sorted(rng.sample(range(1000, 2359, 5), theaters))
+            if not ordered:
+                rng.shuffle(starts)
+            titles[f"movie {m:04d}"] = {
+                "poster": "",
+                "rating": "",
+                "listings": [
+                    MovieListing(
+                        showings=[MovieShowing(available="", link="", time=str(t))],
+                        theater=f"theater_{th}",
+                        map="",
+                        area="",
+                        theater_link="",
+                    )
+                    for th, t in enumerate(starts)
+                ],
+            }
+        if ordered:
+            titles = dict(
+                sorted(
+                    titles.items(),
+                    key=lambda item: int(item[1]["listings"][0].showings[0].time),
+                )
+            )
+        listings[f"2025-{1 + day // 28:02d}-{1 + day % 28:02d}"] = titles
+    return listings
+
+
+def quicksort_listings(scraper: WebScraper) -> None:
+    """
+    The previous `_sort_showings_by_times`.
+    """
+
+    def get_showing_time(movie_listing: MovieListing) -> int:
+        return int(movie_listing.showings[0].time)
+
+    def get_listing_time(movie_showing: dict) -> int:
+        return int(get_showing_time(movie_showing["listings"][0]))
+
+    def get_date(day_dict: dict) -> int:
+        return int("".join(day_dict["date"].split("-")))
+
+    for movies in scraper.listings.values():
+        for movie_data in movies.values():
+            listings = movie_data["listings"]
+            quicksort(listings, 0, len(listings) - 1, get_showing_time)
+
+    for date, movies in scraper.listings.items():
+        movie_list = []
+        for title, movie_data in movies.items():
+            movie_data.update({"title": title})
+            movie_list.append(movie_data)
+        quicksort(movie_list, 0, len(movie_list) - 1, get_listing_time)
+        scraper.listings.update({date: movie_list})
+
+    date_list = [{"date": d, "movies": m} for d, m in scraper.listings.items()]
+    quicksort(date_list, 0, len(date_list) - 1, get_date)
+    scraper.listings = date_list
+
+
+def bench(listings: dict, sort, repeat: int) -> float:
+    """
+    Best time in milliseconds of `sort` over fresh copies of `listings`.
+    """
+    scrapers = []
+
+    def setup():
+        scraper = WebScraper()
+        scraper.listings = copy.deepcopy(listings)
+        scrapers.append(scraper)
+
+    return 1000 * min(
+        timeit.repeat(
+            lambda: sort(scrapers.pop()), setup=setup, number=1, repeat=repeat
+        )
+    )
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--movies", type=int, default=200)
+    parser.add_argument("--theaters", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    # already-ordered films recurse once per film in quicksort
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * args.movies))
+    print(
+        f"{args.days} days x {args.movies} movies x {args.theaters} theaters,"
+        f" best of {args.repeat}"
+    )
+    print(f"{'input':<10}{'quicksort':>12}{'stream':>12}{'speedup':>10}")
+    for ordered in (True, False):
+        listings = make_listings(args.days, args.movies, args.theaters, ordered)
+        old = bench(listings, quicksort_listings, args.repeat)
+        new = bench(listings, WebScraper._sort_showings_by_times, args.repeat)
+        label = "ordered" if ordered else "shuffled"
+        print(f"{label:<10}{old:>10.1f}ms{new:>10.1f}ms{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -2,6 +2,9 @@
 Sorting tools
 """
 
+import heapq
+from typing import Iterable
+
 
 def __partition(array: list, low: int, high: int, value_getter: callable):
     """
@@ -46,3 +49,30 @@ def quicksort(array: list, low: int, high: int, value_getter: callable):
         quicksort(array, low, pivot_index - 1, value_getter)
         # sort top half
         quicksort(array, pivot_index + 1, high, value_getter)
+
+
+def merge_runs(runs: Iterable[list], key: callable) -> list:
+    """
+    k-way merge of `runs`, e.g. per-theater lists, with `heapq.merge`.
+    Each run is sorted first, which costs one pass for a run already in
+    order, where the last-element-pivot quicksort above is quadratic. `key`
+    is computed once per item, and equal keys keep run order, then order
+    within their run, so the merge is stable.
+    """
+    decorated = [
+        sorted((key(item), r, i, item) for i, item in enumerate(run))
+        for r, run in enumerate(runs)
+    ]
+    return [item for *_, item in heapq.merge(*decorated)]
+
+
+def sort_runs(items: Iterable, key: callable, run_of: callable) -> list:
+    """
+    Sort `items` by splitting them into runs on `run_of(item)` (e.g. the
+    theater showing a movie first), in order of first appearance, and
+    merging the runs with `merge_runs`.
+    """
+    runs: dict = {}
+    for item in items:
+        runs.setdefault(run_of(item), []).append(item)
+    return merge_runs(runs.values(), key)
@@ -0,0 +1,397 @@
+"""
+Browser-free document model for server-rendered pages.
+
+Parses HTML with the standard library and exposes the part of the Selenium
+WebElement interface that `WebScraper` relies on (`find_element`,
+`find_elements`, `get_attribute`, `text`, `click`), so the config-driven
+layouts can run against a page fetched over plain HTTP without Chrome.
+"""
+
+import re
+from html import escape
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+from urllib.request import url2pathname
+
+from downloads import http_get, http_get_async
+from scheduling import throttle, throttle_async
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    NoSuchElementException,
+)
+from selenium.webdriver.common.by import By
+
+VOID_TAGS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "param",
+    "source",
+    "track",
+    "wbr",
+}
+
+RAW_TEXT_TAGS = {"script", "style"}
+
+QUOTE = '"'
+
+# start tag -> open tags it implicitly closes (subset of the HTML spec)
+IMPLIED_END_TAGS = {
+    "li": {"li"},
+    "dt": {"dt", "dd"},
+    "dd": {"dt", "dd"},
+    "option": {"option"},
+    "tr": {"tr", "td", "th"},
+    "td": {"td", "th"},
+    "th": {"td", "th"},
+}
+
+# properties Selenium resolves to absolute URLs in `get_attribute`
+URL_PROPERTIES = {"href", "src"}
+
+REQUEST_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    )
+}
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s*>\s*|\s+)
+    |(?P<tag>\*|[a-zA-Z][\w-]*)
+    |\#(?P<id>[\w-]+)
+    |\.(?P<cls>[\w-]+)
+    |\[\s*(?P<attr>[\w-]+)\s*
+        (?:(?P<op>[~^$*|]?=)\s*
+            (?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[\w-]+))\s*)?
+    \]
+    """,
+    re.VERBOSE,
+)
+
+
+class StaticElement:
+    """
+    Parsed HTML element that quacks like a Selenium WebElement.
+    """
+
+    def __init__(self, tag: str, attrs: dict, parent, base_url: str = ""):
+        self.tag_name = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.base_url = base_url
+        self.children: list = []
+        self.classes = set((attrs.get("class") or "").split())
+
+    def click(self) -> None:
+        """
+        No-op: all content of a static document is already in the DOM.
+        """
+
+    @property
+    def text(self) -> str:
+        """
+        Whitespace-normalized text content, approximating `WebElement.text`.
+        """
+        return " ".join(self._text_content().split())
+
+    def get_attribute(self, name: str) -> str | None:
+        """
+        Mirror `WebElement.get_attribute`: a few DOM properties, otherwise
+        the raw attribute value (or None when missing).
+        """
+        if name == "innerHTML":
+            return "".join(_serialize(c) for c in self.children)
+        if name == "outerHTML":
+            return _serialize(self)
+        if name in ("textContent", "innerText"):
+            return self._text_content()
+        value = self.attrs.get(name)
+        if value is not None and name in URL_PROPERTIES:
+            return urljoin(self.base_url, value.strip())
+        return value
+
+    def find_element(self, by: str, value: str) -> "StaticElement":
+        """
+        First matching descendant, or raise NoSuchElementException.
+        """
+        selector = _compile_locator(by, value)
+        for e in self._descendants():
+            if _matches(e, selector):
+                return e
+        raise NoSuchElementException(f"Unable to locate element: {by}={value!r}")
+
+    def find_elements(self, by: str, value: str) -> list["StaticElement"]:
+        """
+        All matching descendants in document order.
+        """
+        selector = _compile_locator(by, value)
+        return [e for e in self._descendants() if _matches(e, selector)]
+
+    def _descendants(self):
+        stack = [c for c in reversed(self.children) if isinstance(c, StaticElement)]
+        while stack:
+            e = stack.pop()
+            yield e
+            stack.extend(
+                c for c in reversed(e.children) if isinstance(c, StaticElement)
+            )
+
+    def _text_content(self) -> str:
+        parts = []
+        for c in self.children:
+            if isinstance(c, StaticElement):
+                if c.tag_name not in RAW_TEXT_TAGS:
+                    parts.append(c._text_content())
+            else:
+                parts.append(c)
+        return "".join(parts)
+
+
+class StaticDocument(StaticElement):
+    """
+    Document root. Stands in for the WebDriver as the scrape root.
+    """
+
+    def __init__(self, base_url: str = ""):
+        super().__init__("#document", {}, None, base_url)
+        self.current_url = base_url
+
+    @property
+    def page_source(self) -> str:
+        """
+        Serialized document, like `WebDriver.page_source`.
+        """
+        return self.get_attribute("innerHTML")
+
+
+class _TreeBuilder(HTMLParser):
+    """
+    Build a StaticElement tree, tolerating the usual unclosed tags.
+    """
+
+    def __init__(self, document: StaticDocument):
+        super().__init__(convert_charrefs=True)
+        self.document = document
+        self.stack: list[StaticElement] = [document]
+
+    def handle_starttag(self, tag, attrs):
+        closes = IMPLIED_END_TAGS.get(tag)
+        if closes and self.stack[-1].tag_name in closes:
+            self.stack.pop()
+
+        parent = self.stack[-1]
+        element = StaticElement(
+            tag,
+            {k: ("" if v is None else v) for k, v in attrs},
+            parent,
+            self.document.base_url,
+        )
+        parent.children.append(element)
+        if tag not in VOID_TAGS:
+            self.stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag_name == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+
+def _serialize(node) -> str:
+    """
+    Serialize a node the way browsers do for innerHTML/outerHTML.
+    """
+    if not isinstance(node, StaticElement):
+        return escape(node, quote=False).replace("\xa0", "&nbsp;")
+    attrs = "".join(
+        f' {k}="{v.replace("&", "&amp;").replace(QUOTE, "&quot;")}"'
+        for k, v in node.attrs.items()
+    )
+    if node.tag_name in VOID_TAGS:
+        return f"<{node.tag_name}{attrs}>"
+    if node.tag_name in RAW_TEXT_TAGS:
+        inner = "".join(node.children)
+    else:
+        inner = "".join(_serialize(c) for c in node.children)
+    return f"<{node.tag_name}{attrs}>{inner}</{node.tag_name}>"
+
+
+def _compile_locator(by: str, value: str) -> list[list[tuple]]:
+    """
+    Turn a Selenium locator into selector groups of (combinator, compound).
+    Supports tags, #id, .class, [attr op value], descendant and child
+    combinators, and comma-separated groups.
+    """
+    if by == By.ID:
+        return [[(" ", [("id", value)])]]
+    if by == By.CLASS_NAME:
+        return [[(" ", [("cls", value.strip())])]]
+    if by == By.TAG_NAME:
+        return [[(" ", [("tag", value.lower())])]]
+    if by != By.CSS_SELECTOR:
+        raise InvalidSelectorException(f"Unsupported locator strategy: {by}")
+
+    groups = []
+    for group in value.split(","):
+        group = group.strip()
+        steps, compound, combinator, pos = [], [], " ", 0
+        while pos < len(group):
+            m = _TOKEN_RE.match(group, pos)
+            if not m or m.end() == pos:
+                raise InvalidSelectorException(f"Unsupported selector: {value!r}")
+            pos = m.end()
+            if m.group("ws") is not None:
+                if compound:
+                    steps.append((combinator, compound))
+                    compound = []
+                combinator = ">" if ">" in m.group("ws") else " "
+            elif m.group("tag"):
+                if m.group("tag") != "*":
+                    compound.append(("tag", m.group("tag").lower()))
+            elif m.group("id"):
+                compound.append(("id", m.group("id")))
+            elif m.group("cls"):
+                compound.append(("cls", m.group("cls")))
+            else:
+                operand = next(
+                    (
+                        m.group(g)
+                        for g in ("dq", "sq", "bare")
+                        if m.group(g) is not None
+                    ),
+                    None,
+                )
+                compound.append(("attr", (m.group("attr"), m.group("op"), operand)))
+        if not compound:
+            raise InvalidSelectorException(f"Unsupported selector: {value!r}")
+        steps.append((combinator, compound))
+        groups.append(steps)
+    return groups
+
+
+def _matches_compound(e: StaticElement, compound: list[tuple]) -> bool:
+    for kind, arg in compound:
+        if kind == "tag":
+            if e.tag_name != arg:
+                return False
+        elif kind == "id":
+            if e.attrs.get("id") != arg:
+                return False
+        elif kind == "cls":
+            if arg not in e.classes:
+                return False
+        else:
+            name, op, operand = arg
+            actual = e.attrs.get(name)
+            if actual is None:
+                return False
+            if op is None:
+                continue
+            if op == "=" and actual != operand:
+                return False
+            if op == "~=" and operand not in actual.split():
+                return False
+            if op == "^=" and not actual.startswith(operand):
+                return False
+            if op == "$=" and not actual.endswith(operand):
+                return False
+            if op == "*=" and operand not in actual:
+                return False
+            if (
+                op == "|="
+                and actual != operand
+                and not actual.startswith(f"{operand}-")
+            ):
+                return False
+    return True
+
+
+def _matches_steps(e: StaticElement, steps: list[tuple], i: int) -> bool:
+    """
+    Right-to-left match of selector steps[:i+1] ending at element `e`.
+    Ancestors outside the search root count, as in querySelectorAll.
+    """
+    combinator, compound = steps[i]
+    if not _matches_compound(e, compound):
+        return False
+    if i == 0:
+        return True
+    ancestor = e.parent
+    while isinstance(ancestor, StaticElement) and ancestor.tag_name != "#document":
+        if _matches_steps(ancestor, steps, i - 1):
+            return True
+        if combinator == ">":
+            return False
+        ancestor = ancestor.parent
+    return False
+
+
+def _matches(e: StaticElement, groups: list[list[tuple]]) -> bool:
+    return any(_matches_steps(e, steps, len(steps) - 1) for steps in groups)
+
+
+def parse_html(html: str, base_url: str = "") -> StaticDocument:
+    """
+    Parse an HTML string into a StaticDocument.
+    """
+    document = StaticDocument(base_url)
+    builder = _TreeBuilder(document)
+    builder.feed(html)
+    builder.close()
+    return document
+
+
+def _local_path(url: str) -> Path | None:
+    """
+    The file a `file://` URL or local path names; None for other URLs.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme in ("", "file"):
+        return Path(url2pathname(parsed.path) if parsed.scheme else url).resolve()
+    return None
+
+
+def fetch_document(url: str, timeout: float = 30) -> StaticDocument:
+    """
+    Load a page without a browser: `file://` URLs and local paths are read
+    from disk, anything else is fetched over HTTP.
+    """
+    path = _local_path(url)
+    if path is not None:
+        return parse_html(path.read_text(encoding="utf-8"), path.as_uri())
+
+    throttle(url)
+    response = http_get(url, headers=REQUEST_HEADERS, timeout=timeout)
+    return parse_html(response.text, response.url)
+
+
+async def fetch_document_async(url: str, timeout: float = 30) -> StaticDocument:
+    """
+    `fetch_document` for coroutines inside `downloads.async_session`: the
+    HTTP fetch, and the wait for its host's rate limit, run on the loop.
+    """
+    path = _local_path(url)
+    if path is not None:
+        return parse_html(path.read_text(encoding="utf-8"), path.as_uri())
+
+    await throttle_async(url)
+    response = await http_get_async(url, headers=REQUEST_HEADERS, timeout=timeout)
+    return parse_html(response.text, response.url)
@@ -0,0 +1,87 @@
+"""
+Condition-based waits.
+
+Each wait returns as soon as its predicate holds and gives up quietly after
+`timeout` seconds, so fixed sleeps can be replaced by a wait whose timeout
+is the old sleep: never slower, usually much faster.
+
+Predicates follow the `expected_conditions` shape: called with the driver,
+truthy when satisfied.
+"""
+
+from typing import Callable
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+POLL_SEC = 0.05
+
+# DOM counts as settled once no mutation was seen for this long
+QUIET_MS = 200
+
+# Installs (once per document) a MutationObserver that counts mutations and
+# timestamps the latest one. Returns [mutation count, ms since last mutation].
+DOM_STATE_JS = r"""
+var state = window.__spiralHwyDom;
+if (!state) {
+    state = window.__spiralHwyDom = {count: 0, last: performance.now()};
+    new MutationObserver(function (records) {
+        state.count += records.length;
+        state.last = performance.now();
+    }).observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+}
+return [state.count, performance.now() - state.last];
+"""
+
+
+def wait_until(driver: WebDriver, predicate: Callable, timeout: float) -> bool:
+    """
+    Poll `predicate` until it holds or `timeout` seconds pass.
+    Returns whether the condition was met.
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_SEC).until(predicate)
+        return True
+    except TimeoutException:
+        return False
+
+
+def dom_state(driver: WebDriver) -> tuple[int, float]:
+    """
+    (mutation count, ms since the last mutation) for the current document.
+    """
+    count, idle_ms = driver.execute_script(DOM_STATE_JS)
+    return int(count), float(idle_ms)
+
+
+def mark_dom(driver: WebDriver) -> int:
+    """
+    Current mutation count; pass to `dom_changed` before triggering a change.
+    """
+    return dom_state(driver)[0]
+
+
+def dom_quiescent(quiet_ms: float = QUIET_MS) -> Callable:
+    """
+    No DOM mutation for `quiet_ms` milliseconds.
+    """
+
+    def predicate(driver: WebDriver) -> bool:
+        return dom_state(driver)[1] >= quiet_ms
+
+    return predicate
+
+
+def dom_changed(since: int, quiet_ms: float = QUIET_MS) -> Callable:
+    """
+    The DOM mutated after `mark_dom` returned `since`, then settled.
+    """
+
+    def predicate(driver: WebDriver) -> bool:
+        count, idle_ms = dom_state(driver)
+        return count > since and idle_ms >= quiet_ms
+
+    return predicate
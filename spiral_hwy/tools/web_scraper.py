@@ -3,104 +3,44 @@
 Web scraper to get data from movie listing website.
 """
 
+import asyncio
 import base64
-import json
-import os
+import multiprocessing
 import re
-import tempfile
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
 import hydra
-import pytz
-import requests
-from omegaconf import DictConfig
-from pytz import timezone
-from selenium import webdriver
+from date_tools import pacific_today, parse_heading_date, parse_time
+from downloads import ASYNC_HTTP, async_session
+from driver_pool import DriverPool, get_driver
+from layout_plan import ATTRIBUTE_ID, Action, Node, Special, compile_layout
+from listing_records import MovieListing, MovieShowing
+from listing_stream import ListingStream
+from movies_json import write_movies, write_shards
+from omegaconf import DictConfig, ListConfig, OmegaConf
+from poster_gc import collect_posters
+from poster_store import POSTER_QUEUE, POSTER_STORE
+from poster_variants import build_poster_variants
+from scheduling import HOST_LIMITS, dispatch, host_of
+from script_engine import capture_layout
 from selenium.common.exceptions import NoSuchElementException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from sort_tools import quicksort
-from webdriver_manager.chrome import ChromeDriverManager
+from static_html import fetch_document, fetch_document_async
+from waits import dom_quiescent, wait_until
 
-ATTRIBUTE_ID = {
-    "id": By.ID,
-    "class_name": By.CLASS_NAME,
-    "css_selector": By.CSS_SELECTOR,
-    "tag_name": By.TAG_NAME,
-}
+# Veezi's by-date sessions section, fingerprinted for the page cache
+VEEZI_SESSIONS_ID = "sessionsByDateConent"
 
-
-@dataclass
-class MovieShowing:
-    """
-    Showing event.
-    """
-
-    available: bool
-    link: str
-    time: str
-
-
-@dataclass
-class MovieListing:
-    """
-    Daily movie listing: location, showings, etc.
-    """
-
-    showings: List[MovieShowing]
-    theater: str
-    map: str
-    area: str
-    theater_link: str
-
-
-def catch_optional(func):
-    """
-    Allow web element to not exist if optional flag.
-    """
-
-    def wrapper(*args, **kwargs):
-        if "optional" in kwargs:
-            try:
-                return func(*args, **kwargs)
-            except NoSuchElementException:
-                return None
-        else:
-            return func(*args, **kwargs)
-
-    return wrapper
-
-
-def atomic_write_bytes(path: Path, data: bytes) -> None:
-    """
-    Write bytes to `path` via a same-directory temp file + os.replace, so
-    concurrent writers can't observe a half-written file. Posters are
-    content-addressable, so two writers producing the same bytes is harmless.
-    """
-    path.parent.mkdir(exist_ok=True, parents=True)
-    fd, tmp = tempfile.mkstemp(
-        prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent)
-    )
-    try:
-        with os.fdopen(fd, "wb") as f:
-            f.write(data)
-        os.replace(tmp, path)
-    except Exception:
-        try:
-            os.unlink(tmp)
-        except FileNotFoundError:
-            pass
-        raise
+# shared by all browser tasks in this process
+DRIVER_POOL = DriverPool()
 
 
 def merge_listings(dst: dict, src: dict) -> None:
@@ -122,6 +62,60 @@ def merge_listings(dst: dict, src: dict) -> None:
                 )
 
 
+def pack_listings(listings: dict) -> dict:
+    """
+    Reduce a listings dict to builtins for cheap transfer between processes:
+        {date: {title: (poster, rating, [(theater, map, area, theater_link,
+                                          [(available, link, time), ...])])}}
+    """
+    return {
+        date: {
+            title: (
+                data.get("poster", ""),
+                data.get("rating", ""),
+                [
+                    (
+                        listing.theater,
+                        listing.map,
+                        listing.area,
+                        listing.theater_link,
+                        [(s.available, s.link, s.time) for s in listing.showings],
+                    )
+                    for listing in data.get("listings", [])
+                ],
+            )
+            for title, data in movies.items()
+        }
+        for date, movies in listings.items()
+    }
+
+
+def unpack_listings(packed: dict) -> dict:
+    """
+    Rebuild a listings dict from `pack_listings` output.
+    """
+    return {
+        date: {
+            title: {
+                "poster": poster,
+                "rating": rating,
+                "listings": [
+                    MovieListing(
+                        [MovieShowing(*s) for s in showings],
+                        theater,
+                        map_link,
+                        area,
+                        theater_link,
+                    )
+                    for theater, map_link, area, theater_link, showings in listings
+                ],
+            }
+            for title, (poster, rating, listings) in movies.items()
+        }
+        for date, movies in packed.items()
+    }
+
+
 def go_to_website(driver: WebDriver, website: str, first_element: DictConfig) -> None:
     """
     Go to website with Selenium web driver.
@@ -135,22 +129,7 @@ def go_to_website(driver: WebDriver, website: str, first_element: DictConfig) ->
     )
     element = driver.find_element(ATTRIBUTE_ID[first_element.by], first_element.field)
     driver.execute_script("arguments[0].scrollIntoView(true);", element)
-    time.sleep(0.5)
-
-
-def get_driver() -> WebDriver:
-    """
-    Get Selenium web driver.
-    """
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run in headless mode (no GUI)
-    chrome_options.add_argument("--disable-notifications")  # Disable notifications
-
-    driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()), options=chrome_options
-    )
-
-    return driver
+    wait_until(driver, dom_quiescent(), timeout=0.5)
 
 
 class WebScraper:
@@ -158,6 +137,24 @@ class WebScraper:
     Class to scrape movie showing info from website.
     """
 
+    # layout vocabulary -> method names, bound once by `compile_layout`
+    ACTIONS = {
+        "create_listing": "_create_listing",
+        "create_showing": "_create_showing",
+        "save_poster": "_save_poster",
+        "click": "_element_click",
+        "unpack": "_unpack",
+        "get_asset": "_get_asset",
+    }
+    ASSET_GETTERS = {
+        "get_attribute": "_get_element_attribute",
+        "text_member": "_get_element_text",
+    }
+    ASSET_SPECIAL = {
+        "convert_date": "_convert_date",
+        "convert_time": "_convert_time",
+    }
+
     def __init__(
         self,
         today: datetime | None = None,
@@ -185,34 +182,15 @@ class WebScraper:
         self.showings: List[MovieShowing]
         self.listings: Dict[str, List[MovieListing]] = dict()
 
-        self.asset_getters = {
-            "get_attribute": self._get_element_attribute,
-            "text_member": self._get_element_text,
-        }
-
-        self.asset_special = {
-            "convert_date": self._convert_date,
-            "convert_time": self._convert_time,
-        }
-
-        self.actions = {
-            "create_listing": self._create_listing,
-            "create_showing": self._create_showing,
-            "save_poster": self._save_poster,
-            "click": self._element_click,
-            "unpack": self._unpack,
-            "get_asset": self._get_asset,
-        }
-
     @staticmethod
-    def _element_click(element: WebElement, _config: DictConfig) -> None:
+    def _element_click(element: WebElement, _action: Action) -> None:
         """
         Click web element.
         """
         element.click()
 
     @staticmethod
-    def _get_element_attribute(element: WebElement, asset: DictConfig) -> str:
+    def _get_element_attribute(element: WebElement, asset: Action) -> str:
         """
         Get attribute of web element.
         Strip off any whitespace.
@@ -223,54 +201,27 @@ class WebScraper:
         return output
 
     @staticmethod
-    def _get_element_text(item: WebElement, _asset: DictConfig) -> str:
+    def _get_element_text(item: WebElement, _asset: Action) -> str:
         """
         Get text only from web element.
         """
         return item.text.strip()
 
-    def _convert_date(self, date: str, config: DictConfig) -> str:
+    def _convert_date(self, date: str, config: Special) -> str:
         """
-        Convert date text to a standardized format.
+        Convert date text to a standardized format (YYYY-MM-DD).
         """
-        # Define Pacific Time timezone
-        pacific_tz = pytz.timezone("US/Pacific")
-
-        # Get today's date in Pacific Time
-        today = (
-            datetime.now(pacific_tz)
-            if self.today is None
-            else pacific_tz.localize(self.today)
+        return parse_heading_date(
+            date, config.format, pacific_today(self.today), self.year
         )
 
-        yesterday = today - timedelta(days=1)
-
-        # First try current year
-        current_year = today.year if self.year is None else self.year
-        date_str_with_year = f"{date} {current_year}"
-
-        # Parse the date in the local timezone (Pacific Time)
-        date_obj = datetime.strptime(date_str_with_year, config.format)
-
-        # Localize the parsed date to Pacific Time
-        date_obj = pacific_tz.localize(date_obj)
-
-        # If the date is before yesterday in Pacific Time, add a year
-        if date_obj < yesterday:
-            date_obj = datetime.strptime(f"{date} {current_year + 1}", "%A %d, %B %Y")
-            date_obj = pacific_tz.localize(date_obj)
-
-        # Return the date in the standardized format (YYYY-MM-DD)
-        return date_obj.strftime("%Y-%m-%d")
-
-    def _convert_time(self, time: str, config: DictConfig) -> str:
+    def _convert_time(self, time: str, config: Special) -> str:
         """
         Convert time to standardized format.
         """
-        date_obj = datetime.strptime(time, config.format)
-        return date_obj.strftime("%H%M")
+        return parse_time(time, config.format)
 
-    def _create_listing(self, _element: WebElement, _config: DictConfig) -> None:
+    def _create_listing(self, _element: WebElement, _action: Action) -> None:
         """
         Create movie listing. This includes location and showing times.
         """
@@ -316,7 +267,7 @@ class WebScraper:
         self.showings.clear()
         self.assets["title"] = ""
 
-    def _create_showing(self, _element: WebElement, _config: DictConfig) -> None:
+    def _create_showing(self, _element: WebElement, _action: Action) -> None:
         """
         Create showing object containing time and link to tickets.
         """
@@ -334,230 +285,450 @@ class WebScraper:
         self.assets["link"] = ""
         self.assets["time"] = ""
 
-    def _execute_actions(self, element: WebElement, config: DictConfig) -> None:
-        """
-        Execute actions on a web element / its config item.
-        """
-        for c in config:
-            self.actions[c.action](element, c)
-
-    def _get_asset(self, element: WebElement, config: DictConfig) -> None:
+    def _get_asset(self, element: WebElement, action: Action) -> None:
         """
         Get asset from web element and store in class object.
         """
-        self.assets[config.name] = self.asset_getters[config.method](element, config)
-
-        if "special" in config:
-            self.assets[config.name] = self.asset_special[config.special.method](
-                self.assets[config.name], config.special
-            )
+        value = action.getter(element, action)
+        if action.special is not None:
+            value = action.special.convert(self, value, action.special)
+        self.assets[action.name] = value
 
-    def _save_poster(self, element: WebElement, config: DictConfig) -> None:
+    def _save_poster(self, element: WebElement, action: Action) -> None:
         """
         Save poster image.
         """
-        self._get_asset(element, config)
+        self._get_asset(element, action)
 
-        self.assets[config.name] = base64.urlsafe_b64encode(
-            self.assets[config.name].lower().encode()
+        self.assets[action.name] = base64.urlsafe_b64encode(
+            self.assets[action.name].lower().encode()
         ).decode("utf-8")
 
         poster_src = element.get_attribute("src")
-        save_path = self.poster_dir / f"{self.assets[config.name]}.png"
-
-        if not save_path.exists():
-            file_str = "file://"
-            if poster_src.startswith(file_str):
-                local_path = poster_src[len(file_str) :]  # Strip off "file://"
-                with open(local_path, "rb") as img_file:
-                    img_data = img_file.read()
-            else:
-                img_data = requests.get(poster_src).content
-
-            atomic_write_bytes(save_path, img_data)
+        save_path = self.poster_dir / f"{self.assets[action.name]}.png"
+        POSTER_QUEUE.submit(save_path, poster_src)
 
     def _sort_showings_by_times(self) -> None:
         """
-        Sort listings and movies.
-        Listings for each movie are sorted first.
-        Then each movie is sorted for the day.
+        Sort listings into days, in the order `ListingStream.days()` gives
+        the scheduled runs: each movie's listings by first showing time and
+        then theater, each day's movies by first showing time, title and
+        then theater, and then the days.
         """
+        stream = ListingStream()
+        stream.put(self.listings)
+        stream.close()
+        self.listings = list(stream.days())
 
-        def get_showing_time(movie_listing: MovieListing) -> int:
-            """
-            Callback to extract first showing time.
-            """
-            return int(movie_listing.showings[0].time)
-
-        def get_listing_time(movie_showing: dict) -> int:
-            """
-            Callback to extract first showing time from first listing.
-            """
-            return int(get_showing_time(movie_showing["listings"][0]))
-
-        def get_date(day_dict: dict) -> int:
-            """
-            Callback to extract date.
-            """
-            return int("".join(day_dict["date"].split("-")))
-
-        # sort showings
-        for date, movies in self.listings.items():
-            for movie_data in movies.values():
-                quicksort(
-                    movie_data["listings"],
-                    0,
-                    len(movie_data["listings"]) - 1,
-                    get_showing_time,
-                )
-
-        # sort movies
-        for date, movies in self.listings.items():
-            movie_list = []
-            for title, movie_data in movies.items():
-                movie_data.update({"title": title})
-                movie_list.append(movie_data)
-            quicksort(movie_list, 0, len(movie_list) - 1, get_listing_time)
-            self.listings.update({date: movie_list})
-
-        # sort dates
-        date_list = []
-        for date, movies in self.listings.items():
-            d = {}
-            d.update({"date": date})
-            d.update({"movies": movies})
-            date_list.append(d)
-        quicksort(date_list, 0, len(date_list) - 1, get_date)
-        self.listings = date_list
-
-    def _unpack(self, element: WebElement, config: DictConfig) -> None:
+    def _unpack(self, element: WebElement, action: Action) -> None:
         """
         Small wrapper function for a config element that wants to get its child elements.
         """
-        self._unpack_list(element, config.children)
+        self._run_plan(element, action.children)
 
-    @catch_optional
-    def _unpack_element(
-        self, root: WebDriver | WebElement, attribute_id, config: DictConfig, **kwargs
-    ) -> None:
-        """
-        Unpack element type. There may be multiple elements of that type to get from the page.
+    def _run_plan(self, root: WebDriver | WebElement, plan: tuple[Node, ...]) -> None:
         """
-        elements = []
-        if "multiple" in config.get("meta", []):
-            elements.extend(root.find_elements(attribute_id, config.field))
-        else:
-            elements.append(root.find_element(attribute_id, config.field))
-
-        if "actions" in config:
-            for e in elements:
-                self._execute_actions(e, config.actions)
-
-    @catch_optional
-    def _unpack_list(self, root: WebDriver | WebElement, config: DictConfig) -> None:
+        Walk compiled layout nodes: locate each node's element(s) under `root`
+        and execute its actions on them. A missing element skips only its own
+        node, so absent optional (or partially rendered) items don't abort
+        the surrounding film or date.
         """
-        Unpack config list.
-        """
-        for c in config:
-            is_optional = "optional" in c.get("meta", [])
-            self._unpack_element(root, ATTRIBUTE_ID[c.by], c, optional=is_optional)
+        for node in plan:
+            try:
+                if node.multiple:
+                    elements = root.find_elements(node.by, node.field)
+                else:
+                    elements = (root.find_element(node.by, node.field),)
+                for e in elements:
+                    for action in node.actions:
+                        action.run(self, e, action)
+            except NoSuchElementException:
+                continue
 
-    def save_json(self, path: Path) -> None:
+    def save_json(
+        self, path: Path, output: str = "legacy", legacy_path: Path | None = None
+    ) -> None:
         """
-        Save JSON file.
+        Save JSON file, once queued poster downloads have finished.
+        `output` is the `legacy` or `compact` shape (see movies_json); the
+        legacy shape is also exported to `legacy_path`, if given.
         """
+        POSTER_QUEUE.drain()
         self._sort_showings_by_times()
-        path.parent.mkdir(exist_ok=True, parents=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.listings, f, indent=4, default=lambda o: o.__dict__)
+        write_movies(self.listings, path, output, legacy_path)
 
     def scrape(
-        self, root: WebDriver | WebElement, config: DictConfig, website: str
+        self,
+        root: WebDriver | WebElement,
+        config: ListConfig | tuple[Node, ...],
+        website: str,
     ) -> None:
         """
         Primary function to call to scrape website.
+        `config` is a layout list or a plan already built by `compile_layout`.
         """
+        plan = (
+            config if isinstance(config, tuple) else compile_layout(config, type(self))
+        )
         self.assets["theater"] = website.theater
         self.assets["map"] = website.map
         self.assets["area"] = website.area
         self.assets["theater_link"] = website.link
         self.showings = list()
-        self._unpack_list(root, config)
+        self._run_plan(root, plan)
 
 
-def _scrape_landmark_task() -> dict:
-    from landmark_scraper import LandmarkScraper
+def _page_cache(theater: str, page_cache: dict):
+    from page_cache import PageCache
 
-    driver = get_driver()
-    try:
-        s = LandmarkScraper()
+    return PageCache(
+        theater,
+        ttl_hours=page_cache["ttl_hours"],
+        force=page_cache["force"],
+        poster_dir=WebScraper().poster_dir,
+    )
+
+
+def _scrape_landmark_task(page_cache: dict) -> dict:
+    from landmark_scraper import LANDMARK_THEATER, LandmarkScraper
+
+    with DRIVER_POOL.driver() as driver:
+        s = LandmarkScraper(page_cache=_page_cache(LANDMARK_THEATER, page_cache))
         s.scrape_landmark(driver)
         return s.listings
-    finally:
-        driver.quit()
 
 
-def _scrape_alamo_task() -> dict:
-    from alamo_scraper import AlamoScraper
-
-    driver = get_driver()
-    try:
-        s = AlamoScraper()
-        s.scrape_alamo_sf(driver)
+def _scrape_alamo_task(
+    page_cache: dict,
+    show_workers: int = 1,
+    capture: str = "browser",
+    slug_ttl_hours: float = 0,
+) -> dict:
+    from alamo_scraper import ALAMO_SF_THEATER, AlamoScraper
+    from slug_cache import SlugCache
+
+    with DRIVER_POOL.driver(performance_log=capture == "network") as driver:
+        s = AlamoScraper(
+            capture=capture,
+            slug_cache=SlugCache(ttl_hours=slug_ttl_hours),
+            page_cache=_page_cache(ALAMO_SF_THEATER, page_cache),
+        )
+        s.scrape_alamo_sf(driver, DRIVER_POOL, show_workers)
         return s.listings
-    finally:
-        driver.quit()
 
 
-def _scrape_veezi_task(website, layout: DictConfig, first_element: DictConfig) -> dict:
-    driver = get_driver()
+def _veezi_fingerprint(root) -> str | None:
+    """
+    Fingerprint of a Veezi page's by-date sessions, or None if it has none.
+    """
+    from page_cache import fingerprint
+
     try:
-        s = WebScraper()
+        section = root.find_element(By.ID, VEEZI_SESSIONS_ID)
+    except NoSuchElementException:
+        return None
+    return fingerprint(section.get_attribute("outerHTML") or "")
+
+
+def _scrape_veezi_root(
+    website, plan: tuple[Node, ...], page_cache: dict | None, root, walk_root=None
+) -> dict:
+    """
+    Listings of a loaded Veezi page, from the page cache while the page is
+    unchanged. `walk_root()`, if given, is what the layout walks instead.
+    """
+    cache = None if page_cache is None else _page_cache(website.theater, page_cache)
+    # fingerprint before the layout's clicks change the page
+    digest = _veezi_fingerprint(root) if cache is not None else None
+    if digest is not None:
+        cached = cache.lookup(website.showings, digest)
+        if cached is not None:
+            print(f"  {website.theater}: unchanged, using cached listings")
+            return cached
+
+    s = WebScraper()
+    s.scrape(root if walk_root is None else walk_root(), plan, website)
+    if digest is not None:
+        cache.store(website.showings, digest, s.listings)
+        cache.save()
+    return s.listings
+
+
+def _scrape_veezi_task(
+    website,
+    plan: tuple[Node, ...],
+    first_element: DictConfig,
+    engine: str = "browser",
+    page_cache: dict | None = None,
+) -> dict:
+    if engine == "static":
+        try:
+            document = fetch_document(website.showings)
+            return _scrape_veezi_root(website, plan, page_cache, document)
+        except Exception as e:
+            print(f"  static scrape failed for {website.theater}, using browser: {e}")
+
+    with DRIVER_POOL.driver() as driver:
         go_to_website(driver, website.showings, first_element)
-        s.scrape(driver, layout, website)
-        return s.listings
-    finally:
-        driver.quit()
+        if engine == "script":
+            return _scrape_veezi_root(
+                website, plan, page_cache, driver, lambda: capture_layout(driver, plan)
+            )
+        return _scrape_veezi_root(website, plan, page_cache, driver)
+
+
+async def _scrape_veezi_task_async(
+    website,
+    plan: tuple[Node, ...],
+    first_element: DictConfig,
+    engine: str = "browser",
+    page_cache: dict | None = None,
+) -> dict:
+    """
+    `_scrape_veezi_task` for the event loop: the static engine fetches the
+    page on the loop and walks it in a thread; browser engines, and the
+    fallback from a failed static scrape, run wholly in a thread.
+    """
+    if engine == "static":
+        try:
+            document = await fetch_document_async(website.showings)
+            return await asyncio.to_thread(
+                _scrape_veezi_root, website, plan, page_cache, document
+            )
+        except Exception as e:
+            print(f"  static scrape failed for {website.theater}, using browser: {e}")
+        engine = "browser"
+    return await asyncio.to_thread(
+        _scrape_veezi_task, website, plan, first_element, engine, page_cache
+    )
 
 
 @hydra.main(version_base=None, config_path="../configs", config_name="main")
 def main(config: DictConfig):
     layout: DictConfig = config.veezi.dates_list
     first_element = layout[0]
+    plan = compile_layout(layout, WebScraper)
     workers = int(getattr(config, "workers", 1) or 1)
-
+    engine = getattr(config, "engine", "browser")
+    executor = getattr(config, "executor", "thread")
+    if executor not in ("thread", "process", "async"):
+        raise ValueError(f"unknown executor {executor!r}: use thread, process or async")
+    if executor == "async" and not ASYNC_HTTP:
+        print("async executor needs aiohttp, using threads")
+        executor = "thread"
+    run_async = executor == "async" and workers > 1
+    max_pages = config.driver_pool.max_pages
+    if executor != "process":
+        # warms the pool from the composed config; process workers launch
+        # their own browsers
+        DRIVER_POOL.configure(config.driver_pool.size, max_pages)
+
+    hosts = OmegaConf.to_container(config.hosts)
+    HOST_LIMITS.configure(hosts)
+    posters = OmegaConf.to_container(config.posters)
+    POSTER_QUEUE.configure(posters["workers"], posters["queue_size"])
+    POSTER_STORE.configure(posters["ttl_hours"], posters["min_bytes"])
+    page_cache = {"ttl_hours": config.page_cache.ttl_hours, "force": config.force}
+
+    from alamo_scraper import ALAMO_SF_URL
+    from landmark_scraper import LANDMARK_SHOWTIMES_URL
+
+    # (name, host, fn, args); tasks for one host share its concurrency cap
     tasks = [
-        ("landmark_opera_plaza", _scrape_landmark_task, ()),
-        ("alamo_drafthouse_sf", _scrape_alamo_task, ()),
+        (
+            "landmark_opera_plaza",
+            host_of(LANDMARK_SHOWTIMES_URL),
+            _scrape_landmark_task,
+            (page_cache,),
+        ),
+        (
+            "alamo_drafthouse_sf",
+            host_of(ALAMO_SF_URL),
+            _scrape_alamo_task,
+            (
+                page_cache,
+                config.alamo.show_workers,
+                config.alamo.capture,
+                config.alamo.slug_ttl_hours,
+            ),
+        ),
     ]
     for w in config.veezi.websites:
-        tasks.append((w.theater, _scrape_veezi_task, (w, layout, first_element)))
+        tasks.append(
+            (
+                w.theater,
+                host_of(w.showings),
+                _scrape_veezi_task_async if run_async else _scrape_veezi_task,
+                (w, plan, first_element, engine, page_cache),
+            )
+        )
 
-    master = WebScraper()
+    # results are merged and sorted as tasks finish
+    stream = ListingStream()
 
-    if workers <= 1:
-        for name, fn, args in tasks:
-            print("-" * 10, f"scrape {name}", "-" * 10)
+    try:
+        if workers <= 1:
+            _run_tasks(tasks, stream)
+        elif executor == "process":
+            _run_tasks_in_processes(tasks, workers, stream, max_pages, hosts, posters)
+        elif executor == "async":
+            asyncio.run(_run_tasks_async(tasks, workers, stream))
+        else:
+            _run_tasks_in_threads(tasks, workers, stream)
+    finally:
+        DRIVER_POOL.close()
+        stream.close()
+
+    poster_dir = WebScraper().poster_dir
+    json_path = Path(__file__).parent.parent / "_data" / "movies.json"
+    legacy_export = config.output.legacy_export
+    # posters must be on disk before listings refer to them
+    POSTER_QUEUE.drain()
+    days = list(stream.days())
+    write_movies(
+        days,
+        json_path,
+        config.output.format,
+        poster_dir.parent / legacy_export if legacy_export else None,
+    )
+    collect_posters(json_path, poster_dir, **posters["gc"])
+    poster_data = build_poster_variants(
+        poster_dir, json_path.parent / "posters.json", **posters["variants"]
+    )
+    write_shards(
+        days,
+        Path(__file__).parent.parent / "listings",
+        json_path.parent / "shards.json",
+        config.output.inline_days,
+        poster_data,
+    )
+
+
+def _report(name: str, merge) -> None:
+    """
+    Log a task outcome; `merge()` merges its result or raises.
+    """
+    try:
+        merge()
+        print("-" * 10, f"scraped {name}", "-" * 10)
+    except Exception as e:
+        print("-" * 10, f"scrape failed {name}", "-" * 10)
+        print(f"Exception:\n{e}")
+
+
+def _run_tasks(tasks: list, stream: ListingStream) -> None:
+    """
+    Run scrape tasks one after another.
+    """
+    for name, _host, fn, args in tasks:
+        print("-" * 10, f"scrape {name}", "-" * 10)
+        _report(name, lambda: stream.put(fn(*args)))
+
+
+def _run_tasks_in_threads(tasks: list, workers: int, stream: ListingStream) -> None:
+    """
+    Run scrape tasks on a thread pool sharing this process's drivers.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        dispatch(
+            ex,
+            tasks,
+            workers,
+            lambda ex, fn, args: ex.submit(fn, *args),
+            lambda name, fut: _report(name, lambda: stream.put(fut.result())),
+        )
+
+
+def _init_process_worker(max_pages: int, hosts: dict, posters: dict) -> None:
+    # one task at a time per process: keep no idle browser between tasks
+    DRIVER_POOL.size = 0
+    DRIVER_POOL.max_pages = max_pages
+    HOST_LIMITS.configure(hosts)
+    POSTER_QUEUE.configure(posters["workers"], posters["queue_size"])
+    POSTER_STORE.configure(posters["ttl_hours"], posters["min_bytes"])
+
+
+def _run_packed(fn, args: tuple) -> dict:
+    listings = fn(*args)
+    # posters must be on disk before the parent saves listings
+    POSTER_QUEUE.drain()
+    return pack_listings(listings)
+
+
+def _run_tasks_in_processes(
+    tasks: list,
+    workers: int,
+    stream: ListingStream,
+    max_pages: int,
+    hosts: dict,
+    posters: dict,
+) -> None:
+    """
+    Run each scrape task in its own interpreter with its own driver, so
+    Python-side parsing doesn't share one GIL. Workers are spawned (not
+    forked) so they never inherit this process's browser sessions.
+    Request rates are enforced per worker process.
+    """
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_process_worker,
+        initargs=(max_pages, hosts, posters),
+    ) as ex:
+        dispatch(
+            ex,
+            tasks,
+            workers,
+            lambda ex, fn, args: ex.submit(_run_packed, fn, args),
+            lambda name, fut: _report(
+                name,
+                lambda: stream.put(unpack_listings(fut.result())),
+            ),
+        )
+
+
+async def _run_tasks_async(tasks: list, workers: int, stream: ListingStream) -> None:
+    """
+    Run scrape tasks from one event loop, at most `workers` in flight and
+    each host's `concurrency` per host. Coroutine tasks fetch pages over
+    one aiohttp session, and every task's posters download as coroutines
+    on the loop; blocking tasks (the browser ones) run in threads.
+    """
+    limit = asyncio.Semaphore(workers)
+    host_limits = {
+        host: asyncio.Semaphore(HOST_LIMITS.get(host).concurrency)
+        for _name, host, _fn, _args in tasks
+    }
+
+    async def run(name, host, fn, args):
+        async with host_limits[host], limit:
             try:
-                merge_listings(master.listings, fn(*args))
+                if asyncio.iscoroutinefunction(fn):
+                    return name, await fn(*args), None
+                return name, await asyncio.to_thread(fn, *args), None
             except Exception as e:
-                print("-" * 10, f"scrape failed {name}", "-" * 10)
-                print(f"Exception:\n{e}")
-    else:
-        with ThreadPoolExecutor(max_workers=workers) as ex:
-            future_name = {ex.submit(fn, *args): name for name, fn, args in tasks}
-            for fut in as_completed(future_name):
-                name = future_name[fut]
-                try:
-                    merge_listings(master.listings, fut.result())
-                    print("-" * 10, f"scraped {name}", "-" * 10)
-                except Exception as e:
-                    print("-" * 10, f"scrape failed {name}", "-" * 10)
-                    print(f"Exception:\n{e}")
+                return name, None, e
 
-    json_path = Path(__file__).parent.parent / "_data" / "movies.json"
-    master.save_json(json_path)
+    async with async_session():
+        POSTER_QUEUE.attach(asyncio.get_running_loop())
+        try:
+            for coro in asyncio.as_completed([run(*task) for task in tasks]):
+                name, listings, error = await coro
+
+                def merge():
+                    if error is not None:
+                        raise error
+                    stream.put(listings)
+
+                _report(name, merge)
+        finally:
+            # posters must be fetched while the session is open
+            await POSTER_QUEUE.drain_async()
 
 
 if __name__ == "__main__":
+    # `--force` re-extracts every page, ignoring the page cache
+    if "--force" in sys.argv:
+        sys.argv.remove("--force")
+        sys.argv.append("force=true")
     main()